@@ -2,6 +2,9 @@
 # -*- coding: utf-8 -*-
 """
 Paste for Windows - 启动脚本
+
+用法: python run.py [--headless]
+    --headless  无界面守护模式，只捕获并保存剪贴板历史
 """
 
 import sys
@@ -12,5 +15,13 @@ project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
 if __name__ == "__main__":
-    from src.main import main
+    # 启动耗时从这里开始计时（界面模式下由 src.main 记录各阶段）
+    from src.utils.startup_trace import startup_trace
+    startup_trace.mark("process_start")
+
+    if "--headless" in sys.argv[1:]:
+        sys.argv.remove("--headless")
+        from src.daemon import main
+    else:
+        from src.main import main
     main() 
\ No newline at end of file
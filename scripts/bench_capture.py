@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+端到端捕获基准测试
+用内存剪贴板后端和合成负载驱动 ClipboardManager，不需要 Windows 桌面，
+报告 写入剪贴板 → 保存到数据库 的 p50/p99 延迟、每秒捕获数和内存增长；
+加 --record-trace 时同时录制匿名化轨迹，可用 scripts/replay_trace.py 回放
+
+用法: QT_QPA_PLATFORM=offscreen python scripts/bench_capture.py [--count 2000] [--rate 500] ...
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from PyQt6.QtCore import QCoreApplication
+
+from src.core.clipboard_backend import InMemoryClipboardBackend
+from src.core.clipboard_manager import ClipboardManager
+from src.data.database import DatabaseManager
+from src.utils.load_generator import LoadGenerator, Workload
+
+# 全部写入完成后，等待流水线处理剩余捕获的最长时间（秒）
+DRAIN_TIMEOUT = 30.0
+# 流水线空闲这么久（秒）且没有新捕获时视为处理完毕
+SETTLE_SECONDS = 0.3
+# 逐条等待捕获时，每次写入等待监听线程取走的最长时间（秒）
+CAPTURE_TIMEOUT = 5.0
+
+
+def percentile(values: list, fraction: float) -> float:
+    """最近秩百分位数（values 已排序）"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(fraction * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+def current_rss() -> int:
+    """当前进程常驻内存（字节），无法获取时返回 0"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        # Linux 上 ru_maxrss 单位为 KB（峰值，仅作近似）
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except ImportError:
+        return 0
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="端到端捕获基准测试")
+    parser.add_argument("--count", type=int, default=2000, help="写入次数")
+    parser.add_argument("--min-size", type=int, default=16, help="最小内容大小（字符）")
+    parser.add_argument("--max-size", type=int, default=4096, help="最大内容大小（字符）")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.2, help="重复内容比例")
+    parser.add_argument("--rate", type=float, default=500.0, help="突发内每秒写入次数，0 表示不限速")
+    parser.add_argument("--burst-size", type=int, default=100, help="每次突发的写入次数")
+    parser.add_argument("--burst-pause", type=float, default=0.2, help="突发之间的间隔（秒）")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--record-trace", metavar="PATH", help="同时把捕获录制为轨迹文件")
+    parser.add_argument("--scramble-content", action="store_true", help="轨迹中保存打乱后的内容")
+    add_harness_args(parser)
+    return parser.parse_args()
+
+
+def add_harness_args(parser: argparse.ArgumentParser):
+    """测试环境参数（与回放脚本共用）"""
+    parser.add_argument("--poll-min-ms", type=int, default=1, help="最短检查间隔（毫秒）")
+    parser.add_argument("--poll-max-ms", type=int, default=50, help="最长检查间隔（毫秒）")
+    parser.add_argument("--memory-budget-mb", type=int, default=0, help="常驻内容内存预算，0 表示不限制")
+    parser.add_argument("--tracemalloc", action="store_true", help="同时统计 Python 堆增长（会变慢）")
+    parser.add_argument("--verbose", action="store_true", help="显示每次捕获的日志输出")
+
+
+def main():
+    args = parse_args()
+    workload = Workload(
+        count=args.count, min_size=args.min_size, max_size=args.max_size,
+        duplicate_ratio=args.duplicate_ratio, rate=args.rate,
+        burst_size=args.burst_size, burst_pause=args.burst_pause, seed=args.seed
+    )
+    generator = LoadGenerator(workload)
+    description = (f"负载: {workload.count} 次写入，大小 {workload.min_size}~{workload.max_size} 字符，"
+                   f"重复 {workload.duplicate_ratio:.0%}，突发 {workload.burst_size} 次 @ {workload.rate:g}/秒")
+
+    # 每次捕获都有打印输出，默认丢弃，避免终端输出影响测量
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with quiet:
+        results = run_benchmark(args, generator.run, max(1000, workload.count))
+    print_report(description, *results)
+
+
+def run_benchmark(args, drive, max_items: int, wait_captured: bool = False):
+    """运行负载并收集结果
+
+    drive(backend, on_write, wait_captured=...) 在写入线程中把负载写入剪贴板后端；
+    wait_captured 为 True 时每次写入后等待监听线程把它提交给流水线，每次写入恰好对应一次捕获，
+    否则传入 None，两次检查之间的连续写入会合并（与真实剪贴板相同）；
+    args.record_trace 存在时同时录制轨迹
+    """
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    work_dir = tempfile.mkdtemp(prefix="bench_capture_")
+    database_manager = DatabaseManager(os.path.join(work_dir, "bench.db"))
+
+    backend = InMemoryClipboardBackend()
+    manager = ClipboardManager(backend=backend)
+    manager.configure_capture_log(False, 0, 0, 0)
+    manager.set_database_manager(database_manager)
+    manager.set_memory_budget(args.memory_budget_mb * 1024 * 1024)
+    manager.set_max_items(max_items)
+    manager.set_check_interval(args.poll_min_ms, args.poll_max_ms)
+
+    # 写入时间按剪贴板序号记录，保存完成时计算延迟
+    written_at = {}
+    latencies = []
+    lock = threading.Lock()
+
+    def on_write(sequence: int, content: str, timestamp: float):
+        with lock:
+            written_at[sequence] = timestamp
+
+    def on_persisted(record):
+        now = time.monotonic()
+        with lock:
+            started = written_at.get(record.sequence)
+            if started is not None:
+                latencies.append(now - started)
+
+    def wait_for_capture(written: int) -> bool:
+        """等待前 written 次写入都已提交给流水线，超时返回 False"""
+        deadline = time.monotonic() + CAPTURE_TIMEOUT
+        while manager.get_pipeline_stats()['submitted'] < written:
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.0002)
+        return True
+
+    manager.add_pipeline_observer("persist", on_persisted)
+    if getattr(args, 'record_trace', None):
+        manager.start_trace_recording(Path(args.record_trace), args.scramble_content)
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    heap_before = tracemalloc.get_traced_memory()[0] if args.tracemalloc else 0
+    rss_before = current_rss()
+
+    manager.start()
+    time.sleep(0.1)  # 等待监听线程记录初始序号
+
+    writer = threading.Thread(
+        target=drive, args=(backend, on_write),
+        kwargs={'wait_captured': wait_for_capture if wait_captured else None}, daemon=True
+    )
+    started = time.monotonic()
+    writer.start()
+
+    # 主线程运行事件循环，使流水线的通知阶段能在“界面线程”应用捕获
+    deadline = None
+    last_completed, last_progress = -1, time.monotonic()
+    while True:
+        QCoreApplication.processEvents()
+        stats = manager.get_pipeline_stats()
+        now = time.monotonic()
+        if stats['completed'] != last_completed:
+            last_completed, last_progress = stats['completed'], now
+        if not writer.is_alive():
+            if deadline is None:
+                deadline = now + DRAIN_TIMEOUT
+            settled = stats['completed'] >= stats['submitted'] and now - last_progress > SETTLE_SECONDS
+            if settled or now > deadline:
+                break
+        time.sleep(0.001)
+    elapsed = last_progress - started
+    manager.flush_changes()
+
+    memory = {'rss': current_rss() - rss_before}
+    if args.tracemalloc:
+        memory['heap'] = tracemalloc.get_traced_memory()[0] - heap_before
+    stats = manager.get_pipeline_stats()
+    poll_stats = manager.get_poll_stats()
+    item_count = len(manager.get_all_items())
+
+    manager.shutdown()
+    database_manager.close()
+    app.quit()
+
+    latencies.sort()
+    return len(written_at), latencies, elapsed, item_count, memory, stats, poll_stats
+
+
+def print_report(description: str, written: int, latencies: list, elapsed: float, item_count: int,
+                 memory: dict, stats: dict, poll_stats: dict):
+    """输出报告"""
+    persisted = len(latencies)
+    print(description)
+    print("-" * 60)
+    print(f"写入剪贴板     {written:>10}")
+    print(f"检测到的捕获   {stats['submitted']:>10}（合并的连续写入 {written - stats['submitted']}）")
+    print(f"保存到数据库   {persisted:>10}")
+    print(f"历史项目数     {item_count:>10}")
+    print(f"耗时           {elapsed:>10.2f} 秒")
+    print(f"吞吐量         {persisted / elapsed if elapsed else 0:>10.1f} 次/秒")
+    print("-" * 60)
+    print("写入 → 保存延迟:")
+    print(f"  p50 {percentile(latencies, 0.50) * 1000:>8.2f} ms")
+    print(f"  p99 {percentile(latencies, 0.99) * 1000:>8.2f} ms")
+    print(f"  max {(latencies[-1] if latencies else 0) * 1000:>8.2f} ms")
+    print(f"写入 → 应用到内存（平均）: {stats['avg_latency_ms']:.2f} ms")
+    print("-" * 60)
+    print(f"常驻内存增长: {memory['rss'] / 1024 / 1024:.1f} MB")
+    if 'heap' in memory:
+        print(f"Python 堆增长: {memory['heap'] / 1024 / 1024:.1f} MB")
+    print(f"空闲唤醒: {poll_stats['idle_wakeups']}，平均检测延迟 {poll_stats['avg_latency_ms']:.2f} ms")
+    print("-" * 60)
+    print(f"{'阶段':<10}{'处理':>8}{'丢弃':>6}{'排队ms':>10}{'处理ms':>10}{'最大ms':>10}")
+    for name, stage in stats['stages'].items():
+        print(f"{name:<10}{stage['processed']:>8}{stage['dropped']:>6}"
+              f"{stage['avg_wait_ms']:>10.2f}{stage['avg_service_ms']:>10.3f}{stage['max_service_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+内容分类基准测试
+在一组常见剪贴板片段上对比旧的关键字扫描与 ContentClassifier 的吞吐量
+
+用法: python scripts/bench_classifier.py [轮数]
+"""
+
+import hashlib
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.classifier import ContentClassifier
+
+DEFAULT_ROUNDS = 200
+
+CORPUS = [
+    "https://github.com/sxin0/Paste-for-Windows/issues?q=is%3Aopen",
+    "C:\\Users\\Administrator\\Documents\\report_2024.docx",
+    "\\\\fileserver\\share\\design\\logo.png",
+    "/var/log/nginx/access.log",
+    "~/projects/paste/src/main.py",
+    "def main():\n    print('Hello, World!')\n    return 0",
+    "import os\nfrom pathlib import Path\n\nclass Config:\n    pass",
+    "const total = items.reduce((sum, x) => sum + x.price, 0);",
+    "public static void main(String[] args) {\n    System.out.println(\"hi\");\n}",
+    '{"id": 42, "name": "paste", "tags": ["clipboard", "windows"], "active": true}',
+    '[{"x": 1}, {"x": 2}]',
+    "zhang.san@example.com",
+    "#1E90FF",
+    "#fff",
+    "550e8400-e29b-41d4-a716-446655440000",
+    "1,234,567.89",
+    "-0.5e-3",
+    "98.6%",
+    "会议记录：明天下午2点开会，讨论项目进展和下一步计划。",
+    "Thanks, see you tomorrow!",
+    "收件人地址：北京市海淀区中关村大街1号",
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor.",
+    # 大段内容：日志和长文本，旧实现需要扫描全文
+    "2024-01-01 12:00:00 INFO request handled in 12ms\n" * 20_000,
+    "这是一段很长的文章内容。" * 50_000,
+    '{"rows": [' + ", ".join(f'{{"id": {i}, "value": "v{i}"}}' for i in range(20_000)) + "]}",
+]
+
+
+_CORPUS_WITH_HASH = [(content, hashlib.md5(content.encode('utf-8')).hexdigest()) for content in CORPUS]
+
+
+def legacy_detect(content: str) -> str:
+    """旧实现：前缀判断 + 全文关键字扫描"""
+    if not content:
+        return "empty"
+    if content.startswith(('http://', 'https://', 'ftp://', 'file://')):
+        return "link"
+    if content.startswith(tuple(f"{chr(letter)}:\\" for letter in range(ord('C'), ord('Z') + 1))):
+        return "file"
+    code_keywords = ['def ', 'class ', 'import ', 'from ', 'if __name__', 'function ', 'var ',
+                     'let ', 'const ', 'public ', 'private ', 'protected ']
+    if any(keyword in content for keyword in code_keywords):
+        return "code"
+    return "text"
+
+
+def _run(classify, rounds: int) -> float:
+    """返回每秒分类次数"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for content, content_hash in _CORPUS_WITH_HASH:
+            classify(content, content_hash)
+    elapsed = time.perf_counter() - start
+    return rounds * len(_CORPUS_WITH_HASH) / elapsed
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROUNDS
+    total_chars = sum(len(content) for content in CORPUS)
+
+    print(f"语料: {len(CORPUS)} 条，共 {total_chars / 1024 / 1024:.1f} M 字符，轮数: {rounds}")
+    print("-" * 60)
+
+    uncached = ContentClassifier(cache_size=0)
+    cached = ContentClassifier()
+    results = [
+        ("旧关键字扫描", _run(lambda content, _hash: legacy_detect(content), rounds)),
+        ("分类器（无缓存）", _run(lambda content, _hash: uncached.classify(content), rounds)),
+        ("分类器（哈希缓存）", _run(cached.classify, rounds)),
+    ]
+    for name, per_second in results:
+        print(f"{name:<14} {per_second:>12,.0f} 次/秒")
+
+    print("-" * 60)
+    print("分类结果: " + ", ".join(
+        f"{content_type}={count}" for content_type, count in
+        sorted(Counter(uncached.classify(content) for content in CORPUS).items())
+    ))
+
+
+if __name__ == "__main__":
+    main()
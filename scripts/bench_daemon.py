@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+守护模式与完整界面的启动对比
+分别在独立子进程中启动无界面守护模式（QCoreApplication）和完整界面（QApplication + 主窗口），
+报告从进程开始到开始监听的耗时和常驻内存；每次运行使用临时数据目录，可预先填入历史项目
+
+用法: QT_QPA_PLATFORM=offscreen python scripts/bench_daemon.py [--history 5000] [--repeat 3]
+"""
+
+import time
+
+# 尽早记录，启动耗时包含导入 PyQt6 和项目模块的时间
+PROCESS_STARTED = time.perf_counter()
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import uuid
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+MODES = ("headless", "gui")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="守护模式与完整界面的启动对比")
+    parser.add_argument("--history", type=int, default=1000, help="预先填入的历史项目数")
+    parser.add_argument("--repeat", type=int, default=3, help="每种模式的启动次数（取中位数）")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def run_child(mode: str):
+    """子进程：启动指定模式，开始监听后输出一行 JSON 结果并退出"""
+    import contextlib
+    import io
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == "headless":
+            from src.daemon import HeadlessDaemon
+            app = HeadlessDaemon()
+            app.start()
+            clipboard_manager = app.clipboard_manager
+        else:
+            from PyQt6.QtWidgets import QApplication
+            from src.main import MainWindow
+            qt_app = QApplication(sys.argv)
+            window = MainWindow()
+            window.show()
+            qt_app.processEvents()
+            clipboard_manager = window.clipboard_manager
+        startup = time.perf_counter() - PROCESS_STARTED
+
+        if mode == "gui":
+            # 界面模式在事件循环开始后由后台线程加载历史，等加载完成再统计项目数
+            loaded = []
+            clipboard_manager.history_loaded.connect(loaded.append)
+            deadline = time.monotonic() + 60
+            while not loaded and time.monotonic() < deadline:
+                qt_app.processEvents()
+                time.sleep(0.001)
+
+        from bench_capture import current_rss
+        result = {
+            'startup_ms': startup * 1000,
+            'rss': current_rss(),
+            'items': len(clipboard_manager.get_all_items()),
+            'modules': len(sys.modules),
+            'qt_widgets': 'PyQt6.QtWidgets' in sys.modules
+        }
+
+        if mode == "headless":
+            app.cleanup()
+        else:
+            clipboard_manager.shutdown()
+            window.database_manager.close()
+    print(json.dumps(result))
+
+
+def seed_history(home: Path, count: int):
+    """在临时数据目录的数据库中写入历史项目"""
+    from src.data.models import ClipboardItem
+    from src.data.database import DatabaseManager
+    from src.utils.load_generator import LoadGenerator, Workload
+
+    database_manager = DatabaseManager(str(home / "AppData" / "Local" / "PasteForWindows" / "clipboard.db"))
+    generator = LoadGenerator(Workload(count=count, duplicate_ratio=0.0))
+    for content in generator.contents():
+        database_manager.save_item(ClipboardItem(id=str(uuid.uuid4()), content=content))
+    database_manager.close()
+
+
+def measure(mode: str, home: Path) -> dict:
+    """在独立子进程中启动一次，返回子进程输出的结果"""
+    env = dict(os.environ, HOME=str(home), USERPROFILE=str(home))
+    completed = subprocess.run(
+        [sys.executable, __file__, "--child", mode],
+        env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        last_line = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else ""
+        raise RuntimeError(f"{mode} 模式启动失败: {last_line}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def median(values: list) -> float:
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main():
+    args = parse_args()
+    if args.child:
+        run_child(args.child)
+        return
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="bench_daemon_") as work_dir:
+        for mode in MODES:
+            runs = []
+            try:
+                for index in range(max(1, args.repeat)):
+                    home = Path(work_dir) / f"{mode}_{index}"
+                    (home / "AppData" / "Local" / "PasteForWindows").mkdir(parents=True)
+                    seed_history(home, args.history)
+                    runs.append(measure(mode, home))
+            except RuntimeError as e:
+                print(f"❌ {e}")
+                continue
+            results[mode] = runs
+
+    print(f"历史项目: {args.history}，每种模式启动 {max(1, args.repeat)} 次（中位数）")
+    print("-" * 60)
+    print(f"{'模式':<10}{'启动ms':>10}{'常驻MB':>10}{'模块数':>8}{'项目数':>8}{'QtWidgets':>11}")
+    for mode, runs in results.items():
+        print(f"{mode:<10}{median([r['startup_ms'] for r in runs]):>10.0f}"
+              f"{median([r['rss'] for r in runs]) / 1024 / 1024:>10.1f}"
+              f"{median([r['modules'] for r in runs]):>8}{runs[0]['items']:>8}"
+              f"{'是' if runs[0]['qt_widgets'] else '否':>11}")
+
+
+if __name__ == "__main__":
+    main()
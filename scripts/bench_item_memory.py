@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+剪贴板项目内存占用报告
+使用 tracemalloc 对比旧的 dataclass 表示与当前紧凑表示的每项字节数
+
+用法: python scripts/bench_item_memory.py [项目数]
+"""
+
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.models import ClipboardItem
+
+DEFAULT_ITEM_COUNT = 100_000
+CONTENT_TYPES = ["text", "link", "code", "file"]
+
+
+@dataclass
+class LegacyClipboardItem:
+    """旧版表示：普通 dataclass，两个 datetime 和每项独立的 metadata 字典"""
+    id: str
+    content: str
+    content_type: str = "text"
+    created_at: datetime = field(default_factory=datetime.now)
+    updated_at: datetime = field(default_factory=datetime.now)
+    access_count: int = 0
+    is_favorite: bool = False
+    tags: str = ""
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    content_hash: str = ""
+    search_text: str = field(default="", repr=False, compare=False)
+    size_bytes: int = field(default=0, repr=False, compare=False)
+
+
+def _make_inputs(count: int) -> list:
+    """预先生成ID、内容和哈希，使两种表示测量的都只是项目本身的开销"""
+    base = datetime(2024, 1, 1)
+    inputs = []
+    for i in range(count):
+        content = f"clipboard content #{i} " + "x" * (i % 200)
+        # 类型字符串来自解析结果，与常量不是同一个对象，模拟从数据库读取
+        content_type = "".join(list(CONTENT_TYPES[i % len(CONTENT_TYPES)]))
+        inputs.append((f"{i:032x}_{i}", content, content_type, base + timedelta(seconds=i), f"{i:032x}"))
+    return inputs
+
+
+def _measure(factory, inputs: list) -> int:
+    """返回创建全部项目新增的字节数"""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    items = [factory(*args) for args in inputs]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return after - before
+
+
+def legacy_factory(item_id, content, content_type, created_at, content_hash):
+    # 旧版 datetime 字段各自持有独立对象（与从数据库逐行解析时一致）
+    return LegacyClipboardItem(item_id, content, content_type, created_at.replace(),
+                               created_at.replace(), content_hash=content_hash,
+                               search_text=content, size_bytes=len(content))
+
+
+def compact_factory(item_id, content, content_type, created_at, content_hash):
+    # 哈希和搜索文本由调用方提供，只测量表示本身；实际运行时它们在捕获时各计算一次
+    return ClipboardItem(item_id, content, content_type, created_at, created_at,
+                         content_hash=content_hash, search_text=content, size_bytes=len(content))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITEM_COUNT
+    inputs = _make_inputs(count)
+    content_bytes = sum(sys.getsizeof(args[1]) for args in inputs)
+
+    print(f"项目数: {count}（内容字符串预先创建，平均 {content_bytes / count:.0f} 字节，不计入下表）")
+    print("-" * 60)
+
+    results = {}
+    for name, factory in (("dataclass（旧）", legacy_factory), ("__slots__（新）", compact_factory)):
+        allocated = _measure(factory, inputs)
+        results[name] = allocated
+        print(f"{name:<16} 总计 {allocated / 1024 / 1024:8.2f} MB | 每项 {allocated / count:8.1f} 字节")
+
+    legacy, compact = results.values()
+    print("-" * 60)
+    print(f"每项节省 {(legacy - compact) / count:.1f} 字节（{(1 - compact / legacy) * 100:.0f}%）")
+
+
+if __name__ == "__main__":
+    main()
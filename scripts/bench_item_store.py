@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+项目存储基准测试
+对比旧实现（字典 + min()/sorted()）与 RecencyItemStore 在不同规模下的耗时
+
+用法: python scripts/bench_item_store.py [规模 ...]
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.item_store import RecencyItemStore
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+RECENT_LIMIT = 20
+
+
+class _Item:
+    """仅包含基准测试所需字段的轻量项目"""
+    __slots__ = ('id', 'created_at')
+
+    def __init__(self, item_id: str, created_at: datetime):
+        self.id = item_id
+        self.created_at = created_at
+
+
+def _make_items(count: int) -> list:
+    base = datetime(2024, 1, 1)
+    return [_Item(f"item_{i}", base + timedelta(seconds=i)) for i in range(count)]
+
+
+def _time_per_op(func, repeat: int) -> float:
+    """返回单次操作耗时（微秒）"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def bench_legacy(items: list, repeat: int) -> dict:
+    """旧实现：字典 + 全量扫描"""
+    store = {item.id: item for item in items}
+    next_id = [len(items)]
+
+    def evict_and_add():
+        oldest = min(store.values(), key=lambda x: x.created_at)
+        del store[oldest.id]
+        item = _Item(f"item_{next_id[0]}", datetime.now())
+        next_id[0] += 1
+        store[item.id] = item
+
+    def recent():
+        sorted(store.values(), key=lambda x: x.created_at, reverse=True)[:RECENT_LIMIT]
+
+    return {
+        'evict_add_us': _time_per_op(evict_and_add, repeat),
+        'recent_us': _time_per_op(recent, repeat),
+        'touch_us': 0.0,  # 旧实现没有重新排序操作
+    }
+
+
+def bench_recency_store(items: list, repeat: int) -> dict:
+    """新实现：RecencyItemStore"""
+    store = RecencyItemStore()
+    for item in items:
+        store.add(item)
+    next_id = [len(items)]
+    middle_id = items[len(items) // 2].id
+
+    def evict_and_add():
+        store.pop_oldest()
+        item = _Item(f"item_{next_id[0]}", datetime.now())
+        next_id[0] += 1
+        store.add(item)
+
+    def recent():
+        store.recent(RECENT_LIMIT)
+
+    def touch():
+        store.touch(middle_id)
+
+    return {
+        'evict_add_us': _time_per_op(evict_and_add, repeat),
+        'recent_us': _time_per_op(recent, repeat),
+        'touch_us': _time_per_op(touch, repeat * 100),
+    }
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+
+    print(f"{'规模':>10} | {'实现':<18} | {'淘汰+添加(µs)':>14} | {'最近{}项(µs)'.format(RECENT_LIMIT):>12} | {'提到最新(µs)':>12}")
+    print("-" * 80)
+
+    for size in sizes:
+        items = _make_items(size)
+        # 全量扫描在大规模下很慢，减少重复次数
+        repeat = max(3, min(200, 2_000_000 // size))
+
+        for name, bench in (("dict + min/sorted", bench_legacy), ("RecencyItemStore", bench_recency_store)):
+            result = bench(list(items), repeat)
+            print(f"{size:>10} | {name:<18} | {result['evict_add_us']:>14.2f} | "
+                  f"{result['recent_us']:>12.2f} | {result['touch_us']:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
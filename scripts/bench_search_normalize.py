@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+搜索规范化基准测试
+对比每次查询都执行 content.lower() 与使用预先规范化的搜索文本时的耗时和内存分配
+
+用法: python scripts/bench_search_normalize.py [项目数]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.search_engine import normalize_for_search
+
+DEFAULT_ITEM_COUNT = 20_000
+QUERIES = ["def", "https", "会议", "ｐｙｔｈｏｎ", "not-present-anywhere", "Error"]
+
+SAMPLES = [
+    "def main():\n    print('Hello, World!')\n    return 0",
+    "https://docs.python.org/3/library/unicodedata.html",
+    "会议记录：明天下午2点开会，讨论项目进展和下一步计划。",
+    "ＦｕｌｌＷｉｄｔｈ Python 文本    带有多个   空格",
+    "Traceback (most recent call last):\n  File \"main.py\", line 1\nValueError: Error",
+    "C:\\Users\\Documents\\important_document.txt",
+]
+
+
+class _Item:
+    """仅包含搜索所需字段的轻量项目"""
+    __slots__ = ('content', 'search_text')
+
+    def __init__(self, content: str):
+        self.content = content
+        self.search_text = normalize_for_search(content)
+
+
+def _make_items(count: int) -> list:
+    rng = random.Random(42)
+    items = []
+    for i in range(count):
+        base = rng.choice(SAMPLES)
+        # 拼接随机长度的内容，模拟真实剪贴板中长短不一的文本
+        items.append(_Item(f"{base} #{i} " + base * rng.randint(0, 8)))
+    return items
+
+
+def match_lower(item: _Item, query: str) -> bool:
+    """旧实现：每次比较都生成内容的小写副本"""
+    return query in item.content.lower()
+
+
+def match_normalized(item: _Item, query: str) -> bool:
+    """新实现：与预先规范化的搜索文本比较"""
+    return query in item.search_text
+
+
+def _measure_time(match, items: list) -> float:
+    """返回执行全部查询的耗时（毫秒）"""
+    start = time.perf_counter()
+    for query in QUERIES:
+        normalized_query = normalize_for_search(query)
+        sum(1 for item in items if match(item, normalized_query))
+    return (time.perf_counter() - start) * 1000
+
+
+def _measure_allocations(match, items: list) -> int:
+    """统计一次查询中比较操作分配的字节总数
+
+    临时副本在比较后立即释放，只看整体峰值会严重低估，因此逐项累计峰值增量
+    """
+    query = normalize_for_search(QUERIES[0])
+    allocated = 0
+
+    tracemalloc.start()
+    for item in items:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        match(item, query)
+        _, peak = tracemalloc.get_traced_memory()
+        allocated += peak - baseline
+    tracemalloc.stop()
+
+    return allocated
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITEM_COUNT
+    items = _make_items(count)
+
+    content_bytes = sum(sys.getsizeof(item.content) for item in items)
+    extra_bytes = sum(
+        sys.getsizeof(item.search_text) for item in items if item.search_text is not item.content
+    )
+    shared = sum(1 for item in items if item.search_text is item.content)
+
+    print(f"项目数: {count}，查询数: {len(QUERIES)}")
+    print(f"原文占用: {content_bytes / 1024 / 1024:.1f} MB，"
+          f"搜索文本额外占用: {extra_bytes / 1024 / 1024:.1f} MB（{shared} 个项目与原文共享）")
+    print("-" * 72)
+
+    for name, match in (("content.lower()", match_lower), ("预规范化搜索文本", match_normalized)):
+        elapsed = _measure_time(match, items)
+        allocated = _measure_allocations(match, items)
+        print(f"{name:<18} 耗时 {elapsed:8.1f} ms | 每次查询约分配 {allocated / 1024 / 1024:8.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
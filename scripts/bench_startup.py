@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动耗时与导入耗时基准测试
+在独立子进程中按 run.py 的方式启动完整界面（offscreen），通过 PASTE_STARTUP_TRACE 取得各阶段耗时：
+导入、加载配置、打开数据库、托盘出现、后台加载历史、首次显示底部面板；
+另用 python -X importtime 统计导入 src.main 的耗时分布，结果写为 JSON 报告
+
+非 Windows 平台上 pywin32 / keyboard 缺失时走程序自身的回退（内存剪贴板后端、快捷键不可用），
+不替换为假模块；报告中记录 win32_available，并检查启动过程中不应加载的模块是否被提前导入
+
+用法: QT_QPA_PLATFORM=offscreen python scripts/bench_startup.py [--history 5000] [--repeat 5] [--output startup.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_daemon import median, seed_history
+
+# 等待后台历史加载完成的最长时间（秒）
+HISTORY_TIMEOUT = 60.0
+
+# 启动（历史加载完成）前不应被导入的模块：面板、自动上屏及其平台依赖
+DEFERRED_MODULES = ("src.gui.bottom_panel", "src.gui.card_generator", "src.utils.auto_type",
+                    "pyautogui", "win32api", "win32gui")
+
+# -X importtime 输出行：import time: self [us] | cumulative | imported package
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="启动耗时与导入耗时基准测试")
+    parser.add_argument("--history", type=int, default=1000, help="预先填入的历史项目数")
+    parser.add_argument("--repeat", type=int, default=5, help="启动次数（各阶段取中位数）")
+    parser.add_argument("--top", type=int, default=20, help="导入耗时报告中列出的模块数")
+    parser.add_argument("--output", "-o", default="startup_report.json", help="JSON 报告路径")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def run_child():
+    """子进程：按 run.py 的顺序启动界面，等待历史加载完成后显示底部面板，输出一行 JSON 结果"""
+    import contextlib
+    import io
+
+    # 与 run.py 相同：最先导入，之后的耗时都相对这里
+    from src.utils.startup_trace import startup_trace
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        from PyQt6.QtWidgets import QApplication
+        from src.core import clipboard_backend
+        from src.main import MainWindow
+
+        qt_app = QApplication(sys.argv)
+        window = MainWindow()
+        window.show()
+        startup_trace.mark("main_window_shown")
+
+        loaded = []
+        window.clipboard_manager.history_loaded.connect(loaded.append)
+        deadline = time.monotonic() + HISTORY_TIMEOUT
+        while not loaded and time.monotonic() < deadline:
+            qt_app.processEvents()
+            time.sleep(0.001)
+        if not loaded:
+            raise RuntimeError(f"{HISTORY_TIMEOUT:.0f} 秒内历史未加载完成")
+        deferred_loaded = [name for name in DEFERRED_MODULES if name in sys.modules]
+
+        # 首次显示底部面板：导入面板模块、创建卡片并处理一轮事件
+        panel_started = startup_trace.since_start_ms()
+        window.show_bottom_panel()
+        qt_app.processEvents()
+        panel_finished = startup_trace.since_start_ms()
+
+        from bench_capture import current_rss
+        result = {
+            'first_panel_render': {
+                'at_ms': round(panel_finished, 2),
+                'duration_ms': round(panel_finished - panel_started, 2)
+            },
+            'items': len(window.clipboard_manager.get_all_items()),
+            'rss': current_rss(),
+            'modules': len(sys.modules),
+            'deferred_modules_loaded': deferred_loaded,
+            'win32_available': clipboard_backend.WIN32_AVAILABLE
+        }
+
+        window._stop_ipc_server()
+        window.clipboard_manager.shutdown()
+        window.database_manager.close()
+    print(json.dumps(result))
+
+
+def measure(home: Path) -> dict:
+    """启动一次，返回合并后的结果：启动阶段（来自 PASTE_STARTUP_TRACE）+ 子进程输出 + 进程总耗时"""
+    trace_path = home / "startup_trace.json"
+    env = dict(os.environ, HOME=str(home), USERPROFILE=str(home), PASTE_STARTUP_TRACE=str(trace_path))
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, __file__, "--child"],
+        env=env, capture_output=True, text=True
+    )
+    process_ms = (time.perf_counter() - started) * 1000
+    if completed.returncode != 0:
+        last_line = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else ""
+        raise RuntimeError(f"启动失败: {last_line}")
+    if not trace_path.exists():
+        raise RuntimeError("程序未写出启动耗时（PASTE_STARTUP_TRACE）")
+
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result.update(json.loads(trace_path.read_text(encoding="utf-8")))
+    result['process_ms'] = process_ms
+    return result
+
+
+def summarize_phases(runs: list) -> list:
+    """按阶段名取各次启动的中位数，阶段顺序以第一次启动为准"""
+    summary = []
+    for phase in [p['phase'] for p in runs[0]['phases']] + ['first_panel_render']:
+        records = [_find_phase(run, phase) for run in runs]
+        records = [r for r in records if r is not None]
+        durations = [r['duration_ms'] for r in records if r['duration_ms'] is not None]
+        summary.append({
+            'phase': phase,
+            'at_ms': round(median([r['at_ms'] for r in records]), 2),
+            'duration_ms': round(median(durations), 2) if durations else None
+        })
+    return summary
+
+
+def _find_phase(run: dict, phase: str):
+    if phase == 'first_panel_render':
+        return run['first_panel_render']
+    for record in run['phases']:
+        if record['phase'] == phase:
+            return record
+    return None
+
+
+def measure_imports(home: Path, top: int) -> dict:
+    """python -X importtime 导入 src.main，返回总耗时、自身耗时最多的模块和按顶层包汇总"""
+    env = dict(os.environ, HOME=str(home), USERPROFILE=str(home))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        cwd=str(project_root), env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        last_line = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else ""
+        raise RuntimeError(f"导入 src.main 失败: {last_line}")
+
+    modules = []
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append({
+                'module': name,
+                'self_ms': int(self_us) / 1000,
+                'cumulative_ms': int(cumulative_us) / 1000,
+                'depth': len(indent) // 2
+            })
+
+    packages = {}
+    for module in modules:
+        package = module['module'].split(".")[0]
+        if package == "src":
+            package = ".".join(module['module'].split(".")[:2])
+        packages[package] = packages.get(package, 0.0) + module['self_ms']
+
+    total = next((m['cumulative_ms'] for m in modules if m['module'] == "src.main"), 0.0)
+    return {
+        'total_ms': total,
+        'module_count': len(modules),
+        'top_self': sorted(modules, key=lambda m: m['self_ms'], reverse=True)[:top],
+        'by_package': dict(sorted(packages.items(), key=lambda kv: kv[1], reverse=True)[:top])
+    }
+
+
+def print_report(report: dict):
+    print(f"历史项目: {report['history']}，启动 {report['repeat']} 次（中位数），"
+          f"pywin32: {'有' if report['win32_available'] else '无'}")
+    print("-" * 60)
+    print(f"{'阶段':<24}{'完成ms':>12}{'耗时ms':>12}")
+    for phase in report['phases']:
+        duration = f"{phase['duration_ms']:.1f}" if phase['duration_ms'] is not None else "-"
+        print(f"{phase['phase']:<24}{phase['at_ms']:>12.1f}{duration:>12}")
+    print("-" * 60)
+
+    time_to_tray = report['time_to_tray_ms']
+    if time_to_tray is not None:
+        status = "✅" if time_to_tray <= report['time_to_tray_target_ms'] else "⚠️"
+        print(f"{status} 托盘出现 {time_to_tray:.0f} ms（目标 {report['time_to_tray_target_ms']} ms）")
+    print(f"进程总耗时 {report['process_ms']:.0f} ms，常驻内存 {report['rss'] / 1024 / 1024:.1f} MB，"
+          f"已加载 {report['items']} 个项目")
+    if report['deferred_modules_loaded']:
+        print(f"⚠️ 启动过程中提前导入了: {', '.join(report['deferred_modules_loaded'])}")
+
+    imports = report.get('imports')
+    if imports:
+        print(f"\n导入 src.main 共 {imports['total_ms']:.1f} ms（{imports['module_count']} 个模块），按包自身耗时:")
+        for package, self_ms in list(imports['by_package'].items())[:10]:
+            print(f"   {self_ms:>8.1f} ms  {package}")
+
+
+def main():
+    args = parse_args()
+    if args.child:
+        run_child()
+        return 0
+
+    from src.utils.startup_trace import TIME_TO_TRAY_TARGET_MS
+
+    runs = []
+    with tempfile.TemporaryDirectory(prefix="bench_startup_") as work_dir:
+        try:
+            for index in range(max(1, args.repeat)):
+                home = Path(work_dir) / f"run_{index}"
+                (home / "AppData" / "Local" / "PasteForWindows").mkdir(parents=True)
+                seed_history(home, args.history)
+                runs.append(measure(home))
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return 1
+
+        try:
+            imports = measure_imports(Path(work_dir) / "run_0", args.top)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            imports = None
+
+    tray_times = [run['time_to_tray_ms'] for run in runs if run['time_to_tray_ms'] is not None]
+    report = {
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'history': args.history,
+        'repeat': len(runs),
+        'win32_available': runs[0]['win32_available'],
+        'time_to_tray_ms': median(tray_times) if tray_times else None,
+        'time_to_tray_target_ms': TIME_TO_TRAY_TARGET_MS,
+        'process_ms': median([run['process_ms'] for run in runs]),
+        'rss': median([run['rss'] for run in runs]),
+        'items': runs[0]['items'],
+        'deferred_modules_loaded': sorted({name for run in runs for name in run['deferred_modules_loaded']}),
+        'phases': summarize_phases(runs),
+        'imports': imports,
+        'runs': runs
+    }
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print_report(report)
+    print(f"\n报告已写入 {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
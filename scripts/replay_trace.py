@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+剪贴板轨迹回放
+把录制的匿名化轨迹（设置中开启 trace_recording_enabled，或 bench_capture.py --record-trace）
+按原速或加速写入内存剪贴板后端，每次写入等待监听线程捕获后再写下一条，经完整的捕获流水线处理，输出与 bench_capture.py 相同的报告，
+用于在同一份真实负载上对比性能改动
+
+用法: QT_QPA_PLATFORM=offscreen python scripts/replay_trace.py trace.jsonl [--speed 10] [--max-gap 1]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_capture import add_harness_args, print_report, run_benchmark
+from src.utils.clipboard_trace import TraceReplayer
+from src.utils.load_generator import play_schedule
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="剪贴板轨迹回放")
+    parser.add_argument("trace", help="轨迹文件（.jsonl）")
+    parser.add_argument("--speed", type=float, default=1.0, help="回放倍速，0 表示不等待")
+    parser.add_argument("--max-gap", type=float, default=None, help="事件之间的最长间隔（秒，按录制时间计）")
+    add_harness_args(parser)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    try:
+        replayer = TraceReplayer(Path(args.trace))
+    except (OSError, ValueError) as e:
+        print(f"❌ 无法读取轨迹: {e}")
+        sys.exit(1)
+
+    summary = replayer.get_summary()
+    speed = f"{args.speed:g} 倍速" if args.speed > 0 else "不限速"
+    description = (f"轨迹: {args.trace}，{summary['events']} 个事件，时长 {summary['duration']:.1f} 秒，"
+                   f"重复 {summary['duplicate_ratio']:.0%}，最大 {summary['max_size']} 字符，{speed}")
+    types = "，".join(f"{name} {count}" for name, count in sorted(summary['types'].items()))
+
+    def drive(backend, on_write, wait_captured=None):
+        return play_schedule(backend, replayer.schedule(args.speed, args.max_gap), on_write,
+                             wait_captured=wait_captured)
+
+    # 每次捕获都有打印输出，默认丢弃，避免终端输出影响测量
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with quiet:
+        # 逐条等待捕获：每个事件恰好对应一次捕获，不同运行之间的负载相同
+        results = run_benchmark(args, drive, max(1000, summary['events']), wait_captured=True)
+    print_report(f"{description}\n类型: {types}", *results)
+
+    captures = results[5]['submitted']
+    if captures != summary['events']:
+        print(f"❌ 捕获数 {captures} 与轨迹事件数 {summary['events']} 不一致，本次回放结果不可比较")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Paste for Windows - 命令行历史查询
+以只读方式直接打开 clipboard.db（WAL 模式下可与运行中的程序同时读写），
+只依赖标准库，不加载 PyQt6 和 pywin32，适合在脚本和启动器中快速调用
+
+用法: python -m src.cli search 关键词 [--limit 20] [--type code] [--json]
+      python -m src.cli recent [--limit 20] [--favorites] [--json]
+      python -m src.cli export [--output history.jsonl] [--format jsonl|json] [--type link]
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.app_paths import get_app_data_dir
+
+# 列表输出中预览的长度（字符）
+PREVIEW_CHARS = 80
+
+# 程序正在写入时等待锁的最长时间（秒）
+BUSY_TIMEOUT = 2.0
+
+_SUMMARY_COLUMNS = "id, content_type, created_at, updated_at, access_count, is_favorite, tags, size_bytes"
+
+
+class HistoryReader:
+    """剪贴板历史只读访问"""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path) if db_path else get_app_data_dir(create=False) / "clipboard.db"
+        if not self.db_path.exists():
+            raise FileNotFoundError(f"没有剪贴板历史，数据库不存在: {self.db_path}")
+        # mode=ro：不创建文件、不写入；query_only 再防止意外的写语句
+        uri = self.db_path.resolve().as_uri() + "?mode=ro"
+        self._connection = sqlite3.connect(uri, uri=True, timeout=BUSY_TIMEOUT)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA query_only = ON")
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def search(self, query: str, limit: int = 20, content_type: Optional[str] = None) -> List[sqlite3.Row]:
+        """按内容或标签查找（不区分 ASCII 大小写），大内容的后续分块也参与匹配"""
+        pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        where, params = self._filters(content_type, False)
+        sql = f"""
+            SELECT {_SUMMARY_COLUMNS}, substr(content, 1, ?) AS preview
+            FROM clipboard_items
+            WHERE (content LIKE ? ESCAPE '\\' OR tags LIKE ? ESCAPE '\\'
+                   OR (is_chunked AND EXISTS (
+                       SELECT 1 FROM content_chunks
+                       WHERE item_id = clipboard_items.id AND data LIKE ? ESCAPE '\\'
+                   ))){where}
+            ORDER BY updated_at DESC
+            LIMIT ?
+        """
+        return self._connection.execute(
+            sql, (PREVIEW_CHARS * 4, pattern, pattern, pattern, *params, limit)
+        ).fetchall()
+
+    def recent(self, limit: int = 20, content_type: Optional[str] = None,
+               favorites_only: bool = False) -> List[sqlite3.Row]:
+        """最近使用的项目"""
+        where, params = self._filters(content_type, favorites_only)
+        sql = f"""
+            SELECT {_SUMMARY_COLUMNS}, substr(content, 1, ?) AS preview
+            FROM clipboard_items
+            WHERE 1 = 1{where}
+            ORDER BY updated_at DESC
+            LIMIT ?
+        """
+        return self._connection.execute(sql, (PREVIEW_CHARS * 4, *params, limit)).fetchall()
+
+    def export(self, content_type: Optional[str] = None,
+               favorites_only: bool = False) -> Iterator[Dict[str, Any]]:
+        """逐条导出完整项目（按创建时间），不一次性读入全部历史"""
+        where, params = self._filters(content_type, favorites_only)
+        rows = self._connection.execute(f"""
+            SELECT {_SUMMARY_COLUMNS}, content, is_chunked, metadata, content_hash
+            FROM clipboard_items
+            WHERE 1 = 1{where}
+            ORDER BY created_at
+        """, params)
+        for row in rows:
+            item = _summary(row)
+            item['content'] = self._assemble_content(row['id'], row['content'], row['is_chunked'])
+            item['metadata'] = json.loads(row['metadata'] or "{}")
+            item['content_hash'] = row['content_hash']
+            yield item
+
+    def _filters(self, content_type: Optional[str], favorites_only: bool):
+        where, params = "", []
+        if content_type:
+            where += " AND content_type = ?"
+            params.append(content_type)
+        if favorites_only:
+            where += " AND is_favorite"
+        return where, params
+
+    def _assemble_content(self, item_id: str, first_chunk: str, is_chunked) -> str:
+        """拼接分块存储的内容"""
+        if not is_chunked:
+            return first_chunk
+        chunks = [first_chunk]
+        chunks.extend(row['data'] for row in self._connection.execute(
+            "SELECT data FROM content_chunks WHERE item_id = ? ORDER BY seq", (item_id,)
+        ))
+        return "".join(chunks)
+
+
+def _summary(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        'id': row['id'],
+        'content_type': row['content_type'],
+        'created_at': row['created_at'],
+        'updated_at': row['updated_at'],
+        'access_count': row['access_count'],
+        'is_favorite': bool(row['is_favorite']),
+        'tags': row['tags'],
+        'size_bytes': row['size_bytes']
+    }
+
+
+def _preview(text: str) -> str:
+    text = " ".join(text.split())
+    return text[:PREVIEW_CHARS] + "..." if len(text) > PREVIEW_CHARS else text
+
+
+def print_rows(rows: List[sqlite3.Row], as_json: bool):
+    """输出列表结果：默认每行 ID、类型、时间、预览（制表符分隔），--json 时每行一个 JSON 对象"""
+    for row in rows:
+        if as_json:
+            item = _summary(row)
+            item['preview'] = _preview(row['preview'])
+            print(json.dumps(item, ensure_ascii=False))
+        else:
+            favorite = "★" if row['is_favorite'] else " "
+            print(f"{row['id']}\t{row['content_type']}\t{row['updated_at'][:16]}\t"
+                  f"{favorite} {_preview(row['preview'])}")
+
+
+def export_items(reader: HistoryReader, output, output_format: str,
+                 content_type: Optional[str], favorites_only: bool) -> int:
+    """导出到文件对象，返回导出数"""
+    count = 0
+    if output_format == "json":
+        output.write("[")
+    for item in reader.export(content_type, favorites_only):
+        line = json.dumps(item, ensure_ascii=False)
+        if output_format == "json":
+            output.write(("," if count else "") + "\n  " + line)
+        else:
+            output.write(line + "\n")
+        count += 1
+    if output_format == "json":
+        output.write("\n]\n")
+    return count
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="查询剪贴板历史（只读）")
+    parser.add_argument("--db", help="数据库路径，默认使用应用数据目录中的 clipboard.db")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search = commands.add_parser("search", help="搜索历史")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=20)
+    search.add_argument("--type", help="只搜索指定类型（text、link、code ...）")
+    search.add_argument("--json", action="store_true", help="每行输出一个 JSON 对象")
+
+    recent = commands.add_parser("recent", help="最近使用的项目")
+    recent.add_argument("--limit", type=int, default=20)
+    recent.add_argument("--type", help="只显示指定类型")
+    recent.add_argument("--favorites", action="store_true", help="只显示收藏的项目")
+    recent.add_argument("--json", action="store_true", help="每行输出一个 JSON 对象")
+
+    export = commands.add_parser("export", help="导出完整历史")
+    export.add_argument("--output", "-o", help="输出文件，默认输出到标准输出")
+    export.add_argument("--format", choices=("jsonl", "json"), default="jsonl")
+    export.add_argument("--type", help="只导出指定类型")
+    export.add_argument("--favorites", action="store_true", help="只导出收藏的项目")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    try:
+        with HistoryReader(args.db) as reader:
+            if args.command == "search":
+                print_rows(reader.search(args.query, args.limit, args.type), args.json)
+            elif args.command == "recent":
+                print_rows(reader.recent(args.limit, args.type, args.favorites), args.json)
+            elif args.command == "export":
+                if args.output:
+                    with open(args.output, "w", encoding="utf-8") as output:
+                        count = export_items(reader, output, args.format, args.type, args.favorites)
+                    print(f"已导出 {count} 个项目到 {args.output}", file=sys.stderr)
+                else:
+                    export_items(reader, sys.stdout, args.format, args.type, args.favorites)
+    except (FileNotFoundError, sqlite3.Error) as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # 输出被管道提前关闭（如 | head）
+        sys.stderr.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+捕获流水线模块
+把一次剪贴板捕获拆成 捕获 → 规范化 → 分类 → 去重 → 持久化 → 通知 几个阶段，
+每个阶段有自己的有界队列和工作线程，慢阶段不会阻塞捕获线程和界面线程
+
+背压策略：
+- 入口队列（第一个阶段）使用 DROP_OLDEST：队列满时丢弃最早排队的捕获并计数，
+  捕获线程从不等待，且最新的剪贴板内容总能进入流水线
+- 其余阶段使用 BLOCK：队列满时上游工作线程等待，压力逐级传回入口，
+  因此同时在途的记录数不超过各阶段队列容量之和
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+# 背压策略
+BLOCK = "block"  # 队列满时等待下游腾出空间
+DROP_OLDEST = "drop_oldest"  # 队列满时丢弃最早排队的记录
+
+# 默认队列容量
+DEFAULT_STAGE_CAPACITY = 128
+
+# 停止标记
+_STOP = object()
+
+
+@dataclass
+class CaptureRecord:
+    """在各阶段之间传递的一次捕获"""
+    content: str
+    original_length: int = 0  # 截断前的原始长度，未截断为 0
+    formats: Optional[Any] = None  # FormatCapture
+    content_hash: str = ""  # 捕获时计算的指纹哈希，规范化阶段复用
+    size_bytes: int = 0
+    sequence: int = 0  # 检测到变化时的剪贴板序号
+    captured_at: float = field(default_factory=time.monotonic)
+    item: Optional[Any] = None  # 规范化阶段生成的 ClipboardItem
+    existing_id: Optional[str] = None  # 去重命中的已有项目ID
+    metadata_updates: Optional[Dict[str, Any]] = None  # 去重命中时要合并到已有项目的元数据
+
+
+class PipelineStage:
+    """流水线阶段：有界队列 + 单个工作线程
+
+    handler 接收一条记录，返回交给下一阶段的记录；返回 None 表示到此结束
+    """
+
+    def __init__(self, name: str, handler: Callable[[Any], Any],
+                 capacity: int = DEFAULT_STAGE_CAPACITY, policy: str = BLOCK):
+        self.name = name
+        self.policy = policy
+        self._handler = handler
+        self._capacity = max(1, capacity)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=self._capacity)
+        self._lock = threading.Lock()
+
+        # 统计
+        self._processed = 0
+        self._dropped = 0
+        self._errors = 0
+        self._observer_errors = 0
+        self._wait_total = 0.0
+        self._service_total = 0.0
+        self._service_max = 0.0
+
+    def put(self, record) -> bool:
+        """按背压策略放入记录，返回是否放入（DROP_OLDEST 总会放入新记录）"""
+        entry = (record, time.monotonic())
+        if self.policy == DROP_OLDEST:
+            while True:
+                try:
+                    self._queue.put_nowait(entry)
+                    return True
+                except queue.Full:
+                    try:
+                        self._queue.get_nowait()
+                        with self._lock:
+                            self._dropped += 1
+                    except queue.Empty:
+                        pass
+        self._queue.put(entry)
+        return True
+
+    def put_stop(self):
+        """放入停止标记（排在已有记录之后）"""
+        self._queue.put((_STOP, time.monotonic()))
+
+    def process(self, record, enqueued_at: float) -> Any:
+        """执行 handler 并记录排队等待和处理耗时，异常向上抛出"""
+        started = time.monotonic()
+        try:
+            return self._handler(record)
+        except Exception:
+            with self._lock:
+                self._errors += 1
+            raise
+        finally:
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self._processed += 1
+                self._wait_total += started - enqueued_at
+                self._service_total += elapsed
+                self._service_max = max(self._service_max, elapsed)
+
+    def count_observer_error(self):
+        """记录一次观察者回调异常"""
+        with self._lock:
+            self._observer_errors += 1
+
+    def get(self):
+        return self._queue.get()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取阶段统计信息"""
+        with self._lock:
+            processed = self._processed
+            return {
+                'policy': self.policy,
+                'queued': self._queue.qsize(),
+                'capacity': self._capacity,
+                'processed': processed,
+                'dropped': self._dropped,
+                'errors': self._errors,
+                'observer_errors': self._observer_errors,
+                'avg_wait_ms': self._wait_total / processed * 1000 if processed else 0.0,
+                'avg_service_ms': self._service_total / processed * 1000 if processed else 0.0,
+                'max_service_ms': self._service_max * 1000
+            }
+
+
+class CapturePipeline:
+    """由若干阶段串联成的流水线"""
+
+    def __init__(self, stages: List[PipelineStage],
+                 on_error: Optional[Callable[[str, Exception], None]] = None):
+        self._stages = stages
+        self._on_error = on_error
+        self._threads: List[threading.Thread] = []
+        self._closing = threading.Event()
+        self._observers: Dict[str, List[Callable[[Any], None]]] = {}
+
+        # 端到端统计（捕获到应用完成）
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._completed = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    @property
+    def closing(self) -> bool:
+        """是否正在停止（阶段中的等待应尽快放弃）"""
+        return self._closing.is_set()
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._threads)
+
+    def start(self):
+        """启动各阶段的工作线程"""
+        if self._threads:
+            return
+        self._closing.clear()
+        for index, stage in enumerate(self._stages):
+            next_stage = self._stages[index + 1] if index + 1 < len(self._stages) else None
+            thread = threading.Thread(
+                target=self._run_stage, args=(stage, next_stage),
+                name=f"CapturePipeline-{stage.name}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0):
+        """处理完已入队的记录后停止各阶段"""
+        if not self._threads:
+            return
+        self._closing.set()
+        self._stages[0].put_stop()
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        self._threads = []
+
+    def submit(self, record) -> bool:
+        """提交一条捕获（不阻塞），流水线未运行时返回 False"""
+        if not self._threads or self._closing.is_set():
+            return False
+        with self._lock:
+            self._submitted += 1
+        return self._stages[0].put(record)
+
+    def add_observer(self, stage_name: str, callback: Callable[[Any], None]):
+        """在指定阶段处理完一条记录后调用 callback(record)（在该阶段的工作线程中执行）
+
+        用于基准测试、会话录制和回放统计各阶段的完成时间
+        """
+        # 替换列表而不是原地修改，工作线程遍历时不受影响
+        self._observers[stage_name] = self._observers.get(stage_name, []) + [callback]
+
+    def remove_observer(self, stage_name: str, callback: Callable[[Any], None]):
+        """移除 add_observer 注册的回调"""
+        self._observers[stage_name] = [
+            observer for observer in self._observers.get(stage_name, []) if observer != callback
+        ]
+
+    def record_completion(self, record: CaptureRecord):
+        """记录一次捕获的端到端延迟（由最后的应用方调用）"""
+        latency = time.monotonic() - record.captured_at
+        with self._lock:
+            self._completed += 1
+            self._latency_total += latency
+            self._latency_max = max(self._latency_max, latency)
+
+    def _run_stage(self, stage: PipelineStage, next_stage: Optional[PipelineStage]):
+        """阶段工作线程主循环"""
+        while True:
+            record, enqueued_at = stage.get()
+            if record is _STOP:
+                if next_stage is not None:
+                    next_stage.put_stop()
+                break
+
+            try:
+                result = stage.process(record, enqueued_at)
+            except Exception as e:
+                print(f"❌ 捕获流水线阶段 {stage.name} 出错: {e}")
+                if self._on_error:
+                    self._on_error(stage.name, e)
+                continue
+
+            # 观察者出错不影响记录继续向下游传递，也不能让工作线程退出
+            for callback in self._observers.get(stage.name, ()):
+                try:
+                    callback(record)
+                except Exception as e:
+                    stage.count_observer_error()
+                    print(f"❌ 捕获流水线阶段 {stage.name} 的观察者出错: {e}")
+                    if self._on_error:
+                        self._on_error(stage.name, e)
+
+            if result is not None and next_stage is not None:
+                next_stage.put(result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取流水线统计：各阶段队列深度、丢弃数、耗时，以及端到端延迟"""
+        with self._lock:
+            completed = self._completed
+            totals = {
+                'submitted': self._submitted,
+                'completed': completed,
+                'avg_latency_ms': self._latency_total / completed * 1000 if completed else 0.0,
+                'max_latency_ms': self._latency_max * 1000
+            }
+        totals['stages'] = {stage.name: stage.get_stats() for stage in self._stages}
+        return totals
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+变化合并模块
+把短时间内的项目增删改合并成一批，每帧最多通知一次界面，
+脚本或密码管理器连续复制时界面不会逐条重新布局
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+# 合并窗口（毫秒），约为一帧
+FRAME_INTERVAL_MS = 16
+
+
+@dataclass
+class ItemChangeBatch:
+    """一批项目变化，只包含项目ID，按发生顺序排列"""
+    added: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.updated or self.removed)
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.updated) + len(self.removed)
+
+
+class ChangeCoalescer(QObject):
+    """项目变化合并器
+
+    同一批中对同一项目的多次变化合并为一次：
+    - 添加后又更新：仍是添加
+    - 添加后又删除：两者都不通知
+    - 更新后又删除：只通知删除
+    - 删除后又添加：同时通知删除和添加（先移除旧卡片，再按添加顺序放到最前）
+    """
+
+    # 信号定义
+    batch_ready = pyqtSignal(object)  # 一批变化（ItemChangeBatch）
+
+    def __init__(self, interval_ms: int = FRAME_INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        # 项目ID -> 'added' / 'updated' / 'removed' / 'replaced'（删除后又添加），保持发生顺序
+        self._pending: Dict[str, str] = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+
+    def add(self, item_id: str):
+        """记录项目添加（排到本批最后）"""
+        previous = self._pending.pop(item_id, None)
+        self._pending[item_id] = 'replaced' if previous == 'removed' else 'added'
+        self._schedule()
+
+    def update(self, item_id: str):
+        """记录项目更新"""
+        if self._pending.get(item_id) not in ('added', 'removed', 'replaced'):
+            self._pending[item_id] = 'updated'
+        self._schedule()
+
+    def remove(self, item_id: str):
+        """记录项目删除"""
+        if self._pending.get(item_id) == 'added':
+            del self._pending[item_id]
+        else:
+            self._pending[item_id] = 'removed'
+        self._schedule()
+
+    def _schedule(self):
+        """本批的第一次变化启动计时，之后的变化不再推迟通知"""
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        """立即发出已合并的变化"""
+        self._timer.stop()
+        if not self._pending:
+            return
+
+        batch = ItemChangeBatch()
+        for item_id, kind in self._pending.items():
+            if kind == 'replaced':
+                batch.removed.append(item_id)
+                batch.added.append(item_id)
+            else:
+                getattr(batch, kind).append(item_id)
+        self._pending = {}
+        self.batch_ready.emit(batch)
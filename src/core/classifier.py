@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+内容分类模块
+按顺序执行一组可扩展的分类规则，判断剪贴板内容的类型
+
+- 只检查内容开头的有限前缀（以及少量结尾字符），耗时与内容长度无关
+- 代码关键字使用一个预编译的正则表达式，而不是逐个子串扫描
+- 结果按内容哈希缓存，重复复制同一内容时不再分类
+"""
+
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Pattern
+
+# 分类时检查的前缀长度（字符）
+CLASSIFY_PREFIX_CHARS = 4096
+# 用于判断结尾（如 JSON 闭合括号）的字符数
+CLASSIFY_SUFFIX_CHARS = 64
+
+
+class ContentSample:
+    """分类规则使用的内容样本"""
+
+    __slots__ = ('head', 'tail', 'length', 'complete')
+
+    def __init__(self, content: str, prefix_chars: int = CLASSIFY_PREFIX_CHARS):
+        self.length = len(content)
+        # complete 为 True 时 head 即完整内容（去掉首尾空白）
+        self.complete = self.length <= prefix_chars
+        if self.complete:
+            self.head = content.strip()
+            self.tail = self.head[-CLASSIFY_SUFFIX_CHARS:]
+        else:
+            self.head = content[:prefix_chars].lstrip()
+            self.tail = content[-CLASSIFY_SUFFIX_CHARS:].rstrip()
+
+    @property
+    def is_single_line(self) -> bool:
+        return self.complete and '\n' not in self.head
+
+
+class ClassifierRule:
+    """分类规则基类，子类实现 matches()"""
+
+    content_type = "text"
+
+    def matches(self, sample: ContentSample) -> bool:
+        raise NotImplementedError
+
+
+class PrefixRule(ClassifierRule):
+    """内容开头匹配正则表达式"""
+
+    def __init__(self, content_type: str, pattern: str, flags: int = 0):
+        self.content_type = content_type
+        self._pattern: Pattern[str] = re.compile(pattern, flags)
+
+    def matches(self, sample: ContentSample) -> bool:
+        return self._pattern.match(sample.head) is not None
+
+
+class SearchRule(ClassifierRule):
+    """前缀中任意位置匹配正则表达式"""
+
+    def __init__(self, content_type: str, pattern: str, flags: int = 0):
+        self.content_type = content_type
+        self._pattern: Pattern[str] = re.compile(pattern, flags)
+
+    def matches(self, sample: ContentSample) -> bool:
+        return self._pattern.search(sample.head) is not None
+
+
+class ExactRule(ClassifierRule):
+    """单行短内容整体匹配正则表达式（邮箱、颜色、UUID、数字等）"""
+
+    def __init__(self, content_type: str, pattern: str, flags: int = 0, max_length: int = 256):
+        self.content_type = content_type
+        self._pattern: Pattern[str] = re.compile(pattern, flags)
+        self._max_length = max_length
+
+    def matches(self, sample: ContentSample) -> bool:
+        return (sample.is_single_line and len(sample.head) <= self._max_length
+                and self._pattern.fullmatch(sample.head) is not None)
+
+
+class JsonRule(ClassifierRule):
+    """JSON 对象或数组
+
+    完整样本用 json.loads 校验；超出前缀的大内容只检查首尾括号
+    """
+
+    content_type = "json"
+
+    _OPENERS = {'{': '}', '[': ']'}
+    _OBJECT_START = re.compile(r'\{\s*(?:"|\})|\[\s*(?:[\[{"\]\d-]|true|false|null)')
+
+    def matches(self, sample: ContentSample) -> bool:
+        head = sample.head
+        if not head or head[0] not in self._OPENERS:
+            return False
+        if not sample.tail or sample.tail[-1] != self._OPENERS[head[0]]:
+            return False
+        if not self._OBJECT_START.match(head):
+            return False
+        if not sample.complete:
+            return True
+        try:
+            json.loads(head)
+        except ValueError:
+            return False
+        return True
+
+
+# 代码关键字合并成一个正则，只在前缀中查找一次
+_CODE_KEYWORDS = (
+    'def', 'class', 'import', 'from', 'function', 'var', 'let', 'const',
+    'public', 'private', 'protected'
+)
+_CODE_PATTERN = r'(?<![\w$])(?:' + '|'.join(_CODE_KEYWORDS) + r') |if __name__'
+
+
+def default_rules() -> List[ClassifierRule]:
+    """内置规则，按优先级排列"""
+    return [
+        PrefixRule("link", r'(?:https?|ftp|file)://', re.IGNORECASE),
+        # Windows 盘符路径、UNC 路径、POSIX 绝对路径和家目录路径
+        PrefixRule("file", r'[A-Za-z]:[\\/]|\\\\[^\\\s]+\\'),
+        ExactRule("file", r'~/[^\s\0]+|/[^\s/\0]+(?:/[^\s\0]*)+', max_length=4096),
+        ExactRule("uuid", r'\{?[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-'
+                          r'[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\}?'),
+        ExactRule("color", r'#(?:[0-9a-fA-F]{3,4}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})'),
+        ExactRule("email", r'(?:mailto:)?[\w.!#$%&\'*+/=?^`{|}~-]+@[\w-]+(?:\.[\w-]+)*\.[A-Za-z]{2,}',
+                  re.IGNORECASE),
+        ExactRule("number", r'[+-]?(?:(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?%?'),
+        JsonRule(),
+        SearchRule("code", _CODE_PATTERN),
+    ]
+
+
+class ContentClassifier:
+    """可扩展的内容分类器
+
+    规则按顺序执行，第一个匹配的规则决定类型，均不匹配时为 "text"。
+    传入内容哈希时结果会缓存（LRU）
+    """
+
+    def __init__(self, rules: Optional[List[ClassifierRule]] = None,
+                 prefix_chars: int = CLASSIFY_PREFIX_CHARS, cache_size: int = 1024):
+        self._rules = list(rules) if rules is not None else default_rules()
+        self._prefix_chars = prefix_chars
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_size = max(0, cache_size)
+        self._lock = threading.Lock()
+
+        # 统计计数
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def rules(self) -> List[ClassifierRule]:
+        return list(self._rules)
+
+    def add_rule(self, rule: ClassifierRule, index: Optional[int] = None):
+        """添加规则，index 为 None 时追加到末尾（在默认规则之后）"""
+        with self._lock:
+            if index is None:
+                self._rules.append(rule)
+            else:
+                self._rules.insert(index, rule)
+            self._cache.clear()
+
+    def classify(self, content: str, content_hash: Optional[str] = None) -> str:
+        """判断内容类型"""
+        if not content:
+            return "empty"
+
+        if content_hash:
+            with self._lock:
+                content_type = self._cache.get(content_hash)
+                if content_type is not None:
+                    self._cache.move_to_end(content_hash)
+                    self.cache_hits += 1
+                    return content_type
+                self.cache_misses += 1
+
+        content_type = self._classify_sample(ContentSample(content, self._prefix_chars))
+
+        if content_hash and self._cache_size:
+            with self._lock:
+                self._cache[content_hash] = content_type
+                while len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        return content_type
+
+    def _classify_sample(self, sample: ContentSample) -> str:
+        if not sample.head:
+            return "text"
+        for rule in self._rules:
+            if rule.matches(sample):
+                return rule.content_type
+        return "text"
+
+    def clear_cache(self):
+        """清空分类缓存"""
+        with self._lock:
+            self._cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息"""
+        with self._lock:
+            lookups = self.cache_hits + self.cache_misses
+            return {
+                'rules': len(self._rules),
+                'cache_entries': len(self._cache),
+                'cache_hits': self.cache_hits,
+                'cache_misses': self.cache_misses,
+                'hit_rate': self.cache_hits / lookups if lookups else 0.0
+            }
+
+
+# 全局分类器
+default_classifier = ContentClassifier()
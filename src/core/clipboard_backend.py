@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+剪贴板后端模块
+封装系统剪贴板访问，提供廉价的变化序号，使监听只在剪贴板真正变化时读取内容
+
+- Win32ClipboardBackend：使用 GetClipboardSequenceNumber，查询序号不需要打开剪贴板
+- InMemoryClipboardBackend：内存实现，用于测试和非 Windows 平台，变化时立即唤醒等待方
+
+格式统一用名称表示：标准格式为 "CF_UNICODETEXT" 等常量名，注册格式为其注册名（如 "HTML Format"）
+"""
+
+import ctypes
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+try:
+    import win32clipboard
+    import win32con
+    WIN32_AVAILABLE = True
+except ImportError:
+    WIN32_AVAILABLE = False
+
+# 主文本格式：作为条目内容保存，不作为附加格式
+PRIMARY_TEXT_FORMATS = frozenset(("CF_UNICODETEXT", "CF_TEXT", "CF_OEMTEXT", "CF_LOCALE"))
+
+# 值得保存数据的附加格式（按优先级）；其他格式只记录名称
+SECONDARY_FORMATS = ("HTML Format", "Rich Text Format", "PNG", "CF_DIB", "CF_HDROP")
+
+# Windows 标准格式编号与名称
+_STANDARD_FORMATS = {
+    1: "CF_TEXT", 2: "CF_BITMAP", 3: "CF_METAFILEPICT", 7: "CF_OEMTEXT", 8: "CF_DIB",
+    13: "CF_UNICODETEXT", 14: "CF_ENHMETAFILE", 15: "CF_HDROP", 16: "CF_LOCALE", 17: "CF_DIBV5",
+}
+_STANDARD_FORMAT_IDS = {name: format_id for format_id, name in _STANDARD_FORMATS.items()}
+
+
+@dataclass
+class FormatCapture:
+    """一次捕获得到的附加格式
+
+    available 为除主文本外的全部格式名；data 为在预算内读取的数据；
+    deferred 为超出预算未读取的格式，剪贴板序号仍为 sequence 时可以补读
+    """
+    sequence: int
+    available: List[str] = field(default_factory=list)
+    data: Dict[str, bytes] = field(default_factory=dict)
+    deferred: List[str] = field(default_factory=list)
+
+
+class ClipboardBackend:
+    """剪贴板后端接口"""
+
+    def __init__(self):
+        self._wake_event = threading.Event()
+
+    def get_sequence_number(self) -> int:
+        """获取剪贴板变化序号，每次内容变化后递增"""
+        raise NotImplementedError
+
+    def read_text(self) -> Optional[str]:
+        """读取剪贴板文本，剪贴板为空时返回 None，访问失败时抛出异常"""
+        raise NotImplementedError
+
+    def write_text(self, text: str, formats: Optional[Dict[str, bytes]] = None):
+        """写入剪贴板文本及附加格式，失败时抛出异常"""
+        raise NotImplementedError
+
+    def available_formats(self) -> List[str]:
+        """列出剪贴板中可用的格式名"""
+        raise NotImplementedError
+
+    def format_size(self, name: str) -> Optional[int]:
+        """不读取数据获取格式的字节数，无法得知时返回 None"""
+        return None
+
+    def read_format(self, name: str) -> Optional[bytes]:
+        """读取指定格式的数据，不存在时返回 None"""
+        raise NotImplementedError
+
+    def capture_formats(self, max_bytes: int) -> FormatCapture:
+        """列出附加格式，并在 max_bytes 预算内读取值得保存的格式
+
+        读取期间剪贴板发生变化时丢弃已读数据，避免把不同内容的格式混在一起
+        """
+        sequence = self.get_sequence_number()
+        capture = FormatCapture(sequence, [
+            name for name in self.available_formats() if name not in PRIMARY_TEXT_FORMATS
+        ])
+
+        remaining = max_bytes
+        for name in SECONDARY_FORMATS:
+            if name not in capture.available:
+                continue
+            size = self.format_size(name)
+            if size is not None and size > remaining:
+                capture.deferred.append(name)
+                continue
+            data = self.read_format(name)
+            if data is None:
+                continue
+            if len(data) > remaining:
+                capture.deferred.append(name)
+                continue
+            capture.data[name] = data
+            remaining -= len(data)
+
+        if self.get_sequence_number() != sequence:
+            return FormatCapture(sequence)
+        return capture
+
+    def last_change_time(self) -> Optional[float]:
+        """最近一次变化的 time.monotonic() 时间，后端无法得知时返回 None"""
+        return None
+
+    def wake(self):
+        """唤醒正在 wait_for_change 中等待的线程"""
+        self._wake_event.set()
+
+    def wait_for_change(self, last_sequence: int, timeout: float) -> int:
+        """等待序号不同于 last_sequence 或超时，返回当前序号
+
+        默认实现等待 timeout（可被 wake() 打断）后再查询一次序号；
+        能够接收变化通知的后端应重写此方法
+        """
+        sequence = self.get_sequence_number()
+        if sequence == last_sequence:
+            self._wake_event.wait(timeout)
+            self._wake_event.clear()
+            sequence = self.get_sequence_number()
+        return sequence
+
+
+class Win32ClipboardBackend(ClipboardBackend):
+    """Windows 剪贴板后端"""
+
+    def __init__(self):
+        if not WIN32_AVAILABLE:
+            raise RuntimeError("pywin32 未安装，无法使用 Windows 剪贴板后端")
+        super().__init__()
+
+    def get_sequence_number(self) -> int:
+        return win32clipboard.GetClipboardSequenceNumber()
+
+    def read_text(self) -> Optional[str]:
+        win32clipboard.OpenClipboard()
+        try:
+            if win32clipboard.IsClipboardFormatAvailable(win32con.CF_UNICODETEXT):
+                return win32clipboard.GetClipboardData(win32con.CF_UNICODETEXT)
+
+            if win32clipboard.IsClipboardFormatAvailable(win32con.CF_TEXT):
+                content = win32clipboard.GetClipboardData(win32con.CF_TEXT)
+                if isinstance(content, bytes):
+                    content = content.decode('utf-8', errors='ignore')
+                return content
+
+            # 非文本格式只记录摘要
+            if win32clipboard.IsClipboardFormatAvailable(win32con.CF_DIB):
+                data = win32clipboard.GetClipboardData(win32con.CF_DIB)
+                return f"[图片数据 - {len(data)} 字节]"
+
+            if win32clipboard.IsClipboardFormatAvailable(win32con.CF_HDROP):
+                data = win32clipboard.GetClipboardData(win32con.CF_HDROP)
+                return f"[文件列表 - {len(data)} 字节]"
+
+            if win32clipboard.EnumClipboardFormats(0):
+                return "[未知格式内容]"
+            return None
+        finally:
+            win32clipboard.CloseClipboard()
+
+    def write_text(self, text: str, formats: Optional[Dict[str, bytes]] = None):
+        win32clipboard.OpenClipboard()
+        try:
+            win32clipboard.EmptyClipboard()
+            win32clipboard.SetClipboardData(win32con.CF_UNICODETEXT, text)
+            # 文件列表需要构造 DROPFILES 结构，不恢复
+            for name, data in (formats or {}).items():
+                if name != "CF_HDROP":
+                    win32clipboard.SetClipboardData(self._format_id(name), data)
+        finally:
+            win32clipboard.CloseClipboard()
+
+    @staticmethod
+    def _format_id(name: str) -> int:
+        format_id = _STANDARD_FORMAT_IDS.get(name)
+        if format_id is None:
+            format_id = win32clipboard.RegisterClipboardFormat(name)
+        return format_id
+
+    @staticmethod
+    def _format_name(format_id: int) -> str:
+        name = _STANDARD_FORMATS.get(format_id)
+        if name is None:
+            try:
+                name = win32clipboard.GetClipboardFormatName(format_id)
+            except Exception:
+                name = f"#{format_id}"
+        return name
+
+    def available_formats(self) -> List[str]:
+        formats = []
+        win32clipboard.OpenClipboard()
+        try:
+            clipboard_format = win32clipboard.EnumClipboardFormats(0)
+            while clipboard_format:
+                formats.append(self._format_name(clipboard_format))
+                clipboard_format = win32clipboard.EnumClipboardFormats(clipboard_format)
+        finally:
+            win32clipboard.CloseClipboard()
+        return formats
+
+    def format_size(self, name: str) -> Optional[int]:
+        win32clipboard.OpenClipboard()
+        try:
+            handle = win32clipboard.GetClipboardDataHandle(self._format_id(name))
+            return ctypes.windll.kernel32.GlobalSize(handle) if handle else None
+        except Exception:
+            return None
+        finally:
+            win32clipboard.CloseClipboard()
+
+    def read_format(self, name: str) -> Optional[bytes]:
+        format_id = self._format_id(name)
+        win32clipboard.OpenClipboard()
+        try:
+            if not win32clipboard.IsClipboardFormatAvailable(format_id):
+                return None
+            data = win32clipboard.GetClipboardData(format_id)
+        finally:
+            win32clipboard.CloseClipboard()
+
+        # 文件列表以文件名元组返回
+        if isinstance(data, tuple):
+            data = "\n".join(data)
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        return data
+
+
+class InMemoryClipboardBackend(ClipboardBackend):
+    """内存剪贴板后端
+
+    写入时递增序号并唤醒 wait_for_change 的等待方，不需要轮询
+    """
+
+    def __init__(self, text: Optional[str] = None):
+        super().__init__()
+        self._condition = threading.Condition()
+        self._sequence = 0
+        self._text = text
+        self._formats: Dict[str, bytes] = {}
+        self._changed_at: Optional[float] = None
+        self._woken = False
+
+    def get_sequence_number(self) -> int:
+        with self._condition:
+            return self._sequence
+
+    def read_text(self) -> Optional[str]:
+        with self._condition:
+            return self._text
+
+    def write_text(self, text: str, formats: Optional[Dict[str, bytes]] = None):
+        with self._condition:
+            self._text = text
+            self._formats = dict(formats or {})
+            self._sequence += 1
+            self._changed_at = time.monotonic()
+            self._condition.notify_all()
+
+    def clear(self):
+        """清空剪贴板"""
+        with self._condition:
+            self._text = None
+            self._formats = {}
+            self._sequence += 1
+            self._changed_at = time.monotonic()
+            self._condition.notify_all()
+
+    def available_formats(self) -> List[str]:
+        with self._condition:
+            names = ["CF_UNICODETEXT"] if self._text is not None else []
+            return names + list(self._formats)
+
+    def format_size(self, name: str) -> Optional[int]:
+        with self._condition:
+            data = self._formats.get(name)
+            return len(data) if data is not None else None
+
+    def read_format(self, name: str) -> Optional[bytes]:
+        with self._condition:
+            return self._formats.get(name)
+
+    def last_change_time(self) -> Optional[float]:
+        with self._condition:
+            return self._changed_at
+
+    def wake(self):
+        with self._condition:
+            self._woken = True
+            self._condition.notify_all()
+
+    def wait_for_change(self, last_sequence: int, timeout: float) -> int:
+        with self._condition:
+            self._condition.wait_for(lambda: self._sequence != last_sequence or self._woken, timeout)
+            self._woken = False
+            return self._sequence
+
+
+def create_default_backend() -> ClipboardBackend:
+    """创建当前平台的默认后端：Windows 使用系统剪贴板，其他平台使用内存实现"""
+    if WIN32_AVAILABLE:
+        return Win32ClipboardBackend()
+    return InMemoryClipboardBackend()
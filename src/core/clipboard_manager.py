@@ -5,86 +5,68 @@
 负责监听和管理剪贴板内容
 """
 
-import asyncio
+import re
+import sys
 import time
-import hashlib
 import ctypes
 import os
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from typing import Optional, Callable, Dict, Any, List
-from dataclasses import dataclass, field
 
-import win32clipboard
-import win32con
-import win32gui
-import win32api
-from PyQt6.QtCore import QObject, pyqtSignal, QTimer, QThread
-from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import Qt, QObject, pyqtSignal, QTimer, QThread
 
+from .capture_pipeline import DROP_OLDEST, CapturePipeline, CaptureRecord, PipelineStage
+from .change_coalescer import ChangeCoalescer
+from .classifier import default_classifier
+from .clipboard_backend import (
+    SECONDARY_FORMATS, ClipboardBackend, FormatCapture, create_default_backend
+)
+from .item_store import RecencyItemStore
+from .poll_scheduler import AdaptivePollScheduler
+from .payload import (
+    DEFAULT_MAX_PAYLOAD_CHARS, SEARCH_PREFIX_CHARS, ContentFingerprint, fingerprint, hash_and_size,
+    truncate_payload
+)
+from .search_engine import (
+    RegexSearchEngine, SearchMatch, make_match, map_normalized_span, normalize_for_search
+)
+from ..data.cache_manager import ContentPager, QueryCache
+from ..data.models import ClipboardItem, StatsSnapshot  # 模型已移到 data.models，这里保留旧的导入路径
+from ..utils.app_paths import get_app_data_dir
+from ..utils.capture_log import CaptureLogWriter
+from ..utils.clipboard_trace import TraceRecorder
 
-@dataclass
-class ClipboardItem:
-    """剪贴板项目数据模型"""
-    id: str
-    content: str
-    content_type: str = "text"
-    created_at: datetime = field(default_factory=datetime.now)
-    updated_at: datetime = field(default_factory=datetime.now)
-    access_count: int = 0
-    is_favorite: bool = False
-    tags: str = ""
-    metadata: Dict[str, Any] = field(default_factory=dict)
-    
-    def __post_init__(self):
-        if not self.id:
-            self.id = self._generate_id()
-    
-    def _generate_id(self) -> str:
-        """生成唯一ID"""
-        content_hash = hashlib.md5(self.content.encode('utf-8')).hexdigest()
-        timestamp = int(time.time() * 1000)
-        return f"{content_hash}_{timestamp}"
-    
-    def update_access(self):
-        """更新访问次数和时间"""
-        self.access_count += 1
-        self.updated_at = datetime.now()
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """转换为字典格式"""
-        return {
-            'id': self.id,
-            'content': self.content,
-            'content_type': self.content_type,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
-            'access_count': self.access_count,
-            'is_favorite': self.is_favorite,
-            'tags': self.tags,
-            'metadata': self.metadata
-        }
-    
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'ClipboardItem':
-        """从字典创建实例"""
-        data = data.copy()
-        data['created_at'] = datetime.fromisoformat(data['created_at'])
-        data['updated_at'] = datetime.fromisoformat(data['updated_at'])
-        return cls(**data)
 
+# 捕获时立即读取附加格式的默认字节预算
+DEFAULT_FORMAT_BUDGET = 4 * 1024 * 1024
+
+# 等待界面线程应用的捕获数上限，界面忙时通知阶段等待，压力传回流水线入口
+NOTIFY_BACKLOG = 64
 
 class ClipboardListener(QObject):
-    """剪贴板监听器 - 使用Windows消息机制"""
+    """剪贴板监听器 - 通过剪贴板后端检测变化（捕获流水线的捕获阶段）
+    
+    clipboard_changed 在监听线程中发出，连接时应使用直接连接，使后续处理不经过界面线程；
+    是否变化由监听线程按内容指纹判断，这里不保留内容副本
+    """
     
     # 信号定义
-    clipboard_changed = pyqtSignal(ClipboardItem)  # 剪贴板内容变化
+    clipboard_changed = pyqtSignal(object)  # 剪贴板内容变化（CaptureRecord）
     clipboard_error = pyqtSignal(str)  # 错误信号
     
-    def __init__(self, parent=None):
+    def __init__(self, backend: Optional[ClipboardBackend] = None, parent=None):
         super().__init__(parent)
-        self._last_content = ""
+        self._backend = backend or create_default_backend()
+        self._scheduler = AdaptivePollScheduler()
+        self._capture_log: Optional[CaptureLogWriter] = CaptureLogWriter(
+            get_app_data_dir() / "logs" / "clipboard_changes.log"
+        )
         self._is_listening = False
         self._listener_thread = None
+        self._max_payload_chars = DEFAULT_MAX_PAYLOAD_CHARS
+        self._format_budget = DEFAULT_FORMAT_BUDGET
         self._hwnd = None
         self._clipboard_viewer_next = None
         
@@ -92,11 +74,16 @@ class ClipboardListener(QObject):
         """开始监听剪贴板"""
         if not self._is_listening:
             self._is_listening = True
-            self._listener_thread = ClipboardListenerThread(self)
-            self._listener_thread.clipboard_changed.connect(self._on_clipboard_changed)
+            self._listener_thread = ClipboardListenerThread(self._backend, self._scheduler, self)
+            self._listener_thread.set_max_payload_chars(self._max_payload_chars)
+            self._listener_thread.set_format_budget(self._format_budget)
+            self._listener_thread.set_capture_log(self._capture_log)
+            self._listener_thread.clipboard_changed.connect(
+                self.clipboard_changed.emit, Qt.ConnectionType.DirectConnection
+            )
             self._listener_thread.error_occurred.connect(self.clipboard_error.emit)
             self._listener_thread.start()
-            print("✅ 剪贴板监听已启动（使用Windows消息机制）")
+            print("✅ 剪贴板监听已启动（按剪贴板变化序号）")
     
     def stop_listening(self):
         """停止监听剪贴板"""
@@ -108,99 +95,115 @@ class ClipboardListener(QObject):
                 self._listener_thread = None
             print("✅ 剪贴板监听已停止")
     
-    def _on_clipboard_changed(self, content: str):
-        """处理剪贴板变化"""
-        if content and content != self._last_content:
-            self._last_content = content
-            self._process_clipboard_content(content)
+    def set_max_payload_chars(self, max_chars: int):
+        """设置单条内容的硬上限（字符），超出部分截断；0 表示不限制"""
+        self._max_payload_chars = max(0, max_chars)
+        if self._listener_thread:
+            self._listener_thread.set_max_payload_chars(self._max_payload_chars)
     
-    def _process_clipboard_content(self, content: str):
-        """处理剪贴板内容"""
-        try:
-            # 创建剪贴板项目
-            item = ClipboardItem(
-                id="",  # 空字符串，会在 __post_init__ 中自动生成
-                content=content,
-                content_type=self._detect_content_type(content)
-            )
-            
-            # 发送信号
-            self.clipboard_changed.emit(item)
-            
-            print(f"📋 监听到新的剪贴板内容: {content[:50]}{'...' if len(content) > 50 else ''}")
-            
-        except Exception as e:
-            self.clipboard_error.emit(f"处理剪贴板内容错误: {str(e)}")
+    def set_format_budget(self, max_bytes: int):
+        """设置捕获时立即读取附加格式的字节预算，超出的格式只记录名称、需要时再读取"""
+        self._format_budget = max(0, max_bytes)
+        if self._listener_thread:
+            self._listener_thread.set_format_budget(self._format_budget)
     
-    def _detect_content_type(self, content: str) -> str:
-        """检测内容类型"""
-        if not content:
-            return "empty"
-        
-        # 检测URL
-        if content.startswith(('http://', 'https://', 'ftp://', 'file://')):
-            return "link"
+    def set_check_interval(self, interval: int, max_interval: Optional[int] = None):
+        """设置检查间隔（毫秒）
         
-        # 检测文件路径
-        if content.startswith(('C:\\', 'D:\\', 'E:\\', 'F:\\', 'G:\\', 'H:\\', 'I:\\', 'J:\\', 'K:\\', 'L:\\', 'M:\\', 'N:\\', 'O:\\', 'P:\\', 'Q:\\', 'R:\\', 'S:\\', 'T:\\', 'U:\\', 'V:\\', 'W:\\', 'X:\\', 'Y:\\', 'Z:\\')):
-            return "file"
-        
-        # 检测代码片段（简单检测）
-        code_keywords = ['def ', 'class ', 'import ', 'from ', 'if __name__', 'function ', 'var ', 'let ', 'const ', 'public ', 'private ', 'protected ']
-        if any(keyword in content for keyword in code_keywords):
-            return "code"
-        
-        # 默认为文本
-        return "text"
+        interval 为剪贴板变化后的最短间隔，空闲时按指数退避到 max_interval；
+        省略 max_interval 时使用固定间隔。正在进行的等待会立即按新间隔重新开始
+        """
+        if max_interval is None:
+            max_interval = interval
+        self._scheduler.set_bounds(interval / 1000, max_interval / 1000)
+        self._backend.wake()
+        print(f"📊 检查间隔已设置为: {interval} ~ {max_interval} 毫秒")
+    
+    def get_poll_stats(self) -> Dict[str, Any]:
+        """获取轮询统计：当前间隔、检测延迟、每分钟空闲唤醒次数"""
+        return self._scheduler.get_stats()
     
-    def set_check_interval(self, interval: int):
-        """设置检查间隔（兼容性方法，实际不使用）"""
-        pass
+    def set_capture_log(self, capture_log: Optional[CaptureLogWriter]):
+        """替换捕获日志写入器，None 表示关闭记录"""
+        if self._capture_log is not capture_log and self._capture_log:
+            self._capture_log.close()
+        self._capture_log = capture_log
+        if self._listener_thread:
+            self._listener_thread.set_capture_log(capture_log)
+    
+    def close_capture_log(self):
+        """写完剩余记录并停止日志线程"""
+        if self._capture_log:
+            self._capture_log.close()
 
 
 class ClipboardListenerThread(QThread):
-    """剪贴板监听线程 - 使用轮询方式（稳定版）"""
+    """剪贴板监听线程
+    
+    等待后端的变化序号改变，只有序号变化时才打开剪贴板读取内容
+    """
     
     # 信号定义
-    clipboard_changed = pyqtSignal(str)  # 剪贴板内容变化
+    # 剪贴板内容变化（CaptureRecord：内容、原始长度、附加格式和指纹哈希）
+    # 以 object 传递，避免大字符串在 QString 之间来回转换复制
+    clipboard_changed = pyqtSignal(object)
     error_occurred = pyqtSignal(str)  # 错误信号
     
-    def __init__(self, parent=None):
+    def __init__(self, backend: ClipboardBackend, scheduler: AdaptivePollScheduler, parent=None):
         super().__init__(parent)
+        self._backend = backend
+        self._scheduler = scheduler  # 序号检查间隔：有变化时缩短，空闲时退避
         self._is_running = False
-        self._last_content = ""
-        self._poll_interval = 0.5  # 改为0.5秒轮询间隔
+        self._last_fingerprint: Optional[ContentFingerprint] = None  # 上一次内容的指纹，不保留内容本身
+        self._max_payload_chars = DEFAULT_MAX_PAYLOAD_CHARS
+        self._format_budget = DEFAULT_FORMAT_BUDGET
         self._consecutive_failures = 0
         self._max_consecutive_failures = 5  # 减少连续失败次数限制
-        self._log_file = "clipboard_changes.log"  # 记录文件
+        self._capture_log: Optional[CaptureLogWriter] = None  # 捕获日志
         
     def run(self):
         """运行监听线程"""
         try:
             self._is_running = True
             self._consecutive_failures = 0
-            print("🔄 开始剪贴板监听（轮询方式）...")
-            print(f"📊 轮询间隔: {self._poll_interval} 秒")
+            print(f"🔄 开始剪贴板监听（{type(self._backend).__name__}，按变化序号）...")
+            print(f"📊 序号检查间隔: {self._scheduler.interval:.2f} 秒（自适应）")
             print(f"🔄 最大连续失败次数: {self._max_consecutive_failures}")
             
-            # 获取初始剪贴板内容
-            initial_content = self._get_clipboard_content()
+            # 记录初始序号和内容
+            last_sequence = self._backend.get_sequence_number()
+            try:
+                initial_content, _ = truncate_payload(self._get_clipboard_content(), self._max_payload_chars)
+            except Exception as e:
+                print(f"⚠️ 读取初始剪贴板内容失败: {e}")
+                initial_content = ""
             if initial_content:
-                self._last_content = initial_content
+                self._last_fingerprint = fingerprint(initial_content)
                 print(f"📋 初始剪贴板内容: {initial_content[:50]}{'...' if len(initial_content) > 50 else ''}")
             else:
                 print("📋 初始剪贴板为空或无法访问")
             
             print("💡 现在请复制一些文本内容进行测试")
             
-            # 轮询循环
+            # 等待循环：序号不变时不访问剪贴板
             while self._is_running:
                 try:
-                    # 获取当前剪贴板内容
-                    current_content = self._get_clipboard_content()
+                    wait_started = time.monotonic()
+                    sequence = self._backend.wait_for_change(last_sequence, self._scheduler.interval)
+                    if sequence == last_sequence:
+                        if self._is_running:
+                            self._scheduler.on_idle()
+                        continue
+                    self._scheduler.on_change(self._detection_latency(wait_started))
                     
-                    # 检查内容是否发生变化
-                    if current_content and current_content != self._last_content:
+                    # 获取当前剪贴板内容，超过硬上限的部分立即截断，后续比较和保存都有界
+                    current_content, original_length = truncate_payload(
+                        self._get_clipboard_content(), self._max_payload_chars
+                    )
+                    
+                    # 按指纹检查内容是否发生变化（哈希随记录传给后续阶段复用）
+                    current_fingerprint = fingerprint(current_content) if current_content else None
+                    if current_fingerprint is not None and current_fingerprint != self._last_fingerprint:
                         print(f"🆕 检测到剪贴板变化: {current_content[:50]}{'...' if len(current_content) > 50 else ''}")
                         
                         # 写入记录
@@ -211,17 +214,22 @@ class ClipboardListenerThread(QThread):
                             content_type = "文件列表"
                         elif current_content.startswith("[未知格式"):
                             content_type = "未知"
-                        elif current_content.startswith("获取剪贴板失败"):
-                            content_type = "错误"
                         
-                        self._write_to_log(current_content, content_type)
+                        # 写入记录（只入队，由后台线程写文件）
+                        if self._capture_log:
+                            self._capture_log.log(current_content, content_type)
                         
-                        self._last_content = current_content
-                        self.clipboard_changed.emit(current_content)
-                        self._consecutive_failures = 0  # 重置失败计数
+                        self._last_fingerprint = current_fingerprint
+                        self.clipboard_changed.emit(CaptureRecord(
+                            current_content, original_length or 0, self._capture_formats(),
+                            content_hash=current_fingerprint.content_hash,
+                            size_bytes=current_fingerprint.size_bytes,
+                            sequence=sequence
+                        ))
                     
-                    # 等待下一次轮询
-                    time.sleep(self._poll_interval)
+                    # 读取成功后才确认该序号，失败时下一轮会重试
+                    last_sequence = sequence
+                    self._consecutive_failures = 0  # 重置失败计数
                     
                 except Exception as e:
                     self._consecutive_failures += 1
@@ -243,87 +251,78 @@ class ClipboardListenerThread(QThread):
         finally:
             print("🔄 监听线程已退出")
     
-    def _get_clipboard_content(self):
-        """获取剪贴板内容（改进版）"""
-        try:
-            win32clipboard.OpenClipboard()
-            
-            # 尝试获取文本内容
-            try:
-                content = win32clipboard.GetClipboardData(win32con.CF_UNICODETEXT)
-                content_type = "文本"
-            except:
-                # 如果不是文本，尝试获取其他格式
-                try:
-                    content = win32clipboard.GetClipboardData(win32con.CF_TEXT)
-                    content_type = "文本(ANSI)"
-                except:
-                    # 检查是否有图片
-                    try:
-                        content = win32clipboard.GetClipboardData(win32con.CF_DIB)
-                        content_type = "图片"
-                    except:
-                        # 检查是否有文件列表
-                        try:
-                            content = win32clipboard.GetClipboardData(win32con.CF_HDROP)
-                            content_type = "文件列表"
-                        except:
-                            content = "未知格式"
-                            content_type = "未知"
-            
-            win32clipboard.CloseClipboard()
-            
-            # 处理不同类型的内容
-            if content_type == "文本(ANSI)" and isinstance(content, bytes):
-                content = content.decode('utf-8', errors='ignore')
-            elif content_type == "图片":
-                content = f"[图片数据 - {len(content)} 字节]"
-            elif content_type == "文件列表":
-                content = f"[文件列表 - {len(content)} 字节]"
-            elif content_type == "未知":
-                content = "[未知格式内容]"
-            
-            return content
-            
-        except Exception as e:
-            return f"获取剪贴板失败: {str(e)}"
+    def set_max_payload_chars(self, max_chars: int):
+        """设置单条内容的硬上限（字符）"""
+        self._max_payload_chars = max_chars
     
-    def _write_to_log(self, content: str, content_type: str = "文本"):
-        """写入记录到日志文件"""
+    def set_capture_log(self, capture_log: Optional[CaptureLogWriter]):
+        """设置捕获日志，None 表示不记录"""
+        self._capture_log = capture_log
+    
+    def set_format_budget(self, max_bytes: int):
+        """设置捕获时立即读取附加格式的字节预算"""
+        self._format_budget = max_bytes
+    
+    def _capture_formats(self) -> Optional[FormatCapture]:
+        """列出附加格式并在预算内读取，失败时只保存文本"""
         try:
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            # 限制内容长度，避免日志文件过大
-            if len(content) > 200:
-                display_content = content[:200] + "..."
-                content_length = len(content)
-            else:
-                display_content = content
-                content_length = len(content)
-            
-            log_entry = f"[{current_time}] 剪贴板内容变化 ({content_type}): {display_content}"
-            if len(content) > 200:
-                log_entry += f" (总长度: {content_length} 字符)"
-            
-            # 写入日志文件
-            with open(self._log_file, 'a', encoding='utf-8') as f:
-                f.write(log_entry + "\n")
-                f.write("-" * 80 + "\n")
-            
-            print(f"📝 已记录到日志: {self._log_file}")
-            
+            return self._backend.capture_formats(self._format_budget)
         except Exception as e:
-            print(f"❌ 写入日志失败: {e}")
+            print(f"⚠️ 读取附加格式失败: {e}")
+            return None
+    
+    def _get_clipboard_content(self) -> str:
+        """通过后端读取剪贴板内容，剪贴板为空时返回空字符串"""
+        return self._backend.read_text() or ""
+    
+    def _detection_latency(self, wait_started: float) -> float:
+        """估算检测延迟：后端知道变化时间时取实际值，否则取本次等待时长（上界）"""
+        now = time.monotonic()
+        changed_at = self._backend.last_change_time()
+        if changed_at is not None:
+            return max(0.0, now - changed_at)
+        return now - wait_started
     
     def stop(self):
         """停止监听"""
         print("🛑 停止剪贴板监听...")
         self._is_running = False
+        self._backend.wake()
+
+
+class RegexSearchThread(QThread):
+    """正则搜索线程 - 在后台等待搜索进程并分块回传结果"""
     
-    def set_poll_interval(self, interval):
-        """设置轮询间隔"""
-        self._poll_interval = interval
-        print(f"📊 轮询间隔已设置为: {interval} 秒")
+    # 信号定义
+    chunk_ready = pyqtSignal(int, list)  # 搜索编号, (项目ID, 起, 止) 列表
+    search_finished = pyqtSignal(int, bool)  # 搜索编号, 是否超时
+    error_occurred = pyqtSignal(int, str)  # 搜索编号, 错误信息
+    
+    def __init__(self, engine: RegexSearchEngine, run_id: int, pattern: str,
+                 items: list, limit: int, parent=None):
+        super().__init__(parent)
+        self._engine = engine
+        self._run_id = run_id
+        self._pattern = pattern
+        self._items = items
+        self._limit = limit
+    
+    def run(self):
+        """执行搜索"""
+        try:
+            result = self._engine.search(
+                self._pattern,
+                self._items,
+                self._limit,
+                on_chunk=lambda ids: self.chunk_ready.emit(self._run_id, ids)
+            )
+            if result.error:
+                self.error_occurred.emit(self._run_id, result.error)
+            self.search_finished.emit(self._run_id, result.timed_out)
+            
+        except Exception as e:
+            self.error_occurred.emit(self._run_id, str(e))
+            self.search_finished.emit(self._run_id, False)
 
 
 class ClipboardManager(QObject):
@@ -333,28 +332,89 @@ class ClipboardManager(QObject):
     item_added = pyqtSignal(ClipboardItem)  # 新项目添加
     item_updated = pyqtSignal(ClipboardItem)  # 项目更新
     item_removed = pyqtSignal(str)  # 项目删除
+    items_changed = pyqtSignal(object)  # 合并后的一批变化（ItemChangeBatch，只含项目ID），每帧最多一次
     error_occurred = pyqtSignal(str)  # 错误信号
+    regex_search_chunk = pyqtSignal(int, list)  # 搜索编号, 本批搜索结果
+    regex_search_finished = pyqtSignal(int, bool)  # 搜索编号, 是否超时
+    history_loaded = pyqtSignal(int)  # 后台历史加载完成，参数为加载的项目数
+    _capture_ready = pyqtSignal(object)  # 流水线处理完成的捕获（CaptureRecord），在界面线程应用
+    _history_ready = pyqtSignal(object)  # 后台读取的历史项目（列表），在界面线程合并
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, backend: Optional[ClipboardBackend] = None):
         super().__init__(parent)
-        self._listener = ClipboardListener()
-        self._items: Dict[str, ClipboardItem] = {}
+        self._backend = backend or create_default_backend()
+        self._listener = ClipboardListener(self._backend)
+        self._items = RecencyItemStore()  # 按最近使用排序
+        self._hash_index: Dict[str, str] = {}  # 内容哈希 -> 项目ID
+        self._index_lock = threading.Lock()  # 去重阶段在流水线线程中读写哈希索引
+        
+        # 增量维护的统计计数
+        self._type_counts: Dict[str, int] = {}
+        self._favorite_count = 0
+        self._total_bytes = 0
+        self._stats_snapshot: Optional[StatsSnapshot] = None
         self._max_items = 1000  # 最大项目数
+        
+        # 内存预算：常驻内容超过预算时，最久未用的项目只保留头部信息
+        self._memory_budget = 0  # 字节，0 表示不限制
+        self._resident_order: "OrderedDict[str, int]" = OrderedDict()  # 常驻项目ID -> 字节数（从旧到新）
+        self._resident_bytes = 0
+        self._transient_ids = set()  # 只在内存中的项目（数据库中没有，不能换出）
+        self._content_pager: Optional[ContentPager] = None
+        self._page_cache_bytes = 32 * 1024 * 1024
         self._is_enabled = False
         self._database_manager = None  # 数据库管理器
+        self._query_cache = QueryCache()  # 查询结果缓存
+        self._regex_engine = RegexSearchEngine()  # 正则搜索引擎（独立进程）
+        self._regex_threads = set()
+        self._regex_run_id = 0
+        
+        # 捕获流水线：规范化 → 分类 → 去重 → 持久化 → 通知，最后在界面线程应用到内存
+        self._pipeline = CapturePipeline([
+            PipelineStage("normalize", self._stage_normalize, policy=DROP_OLDEST),
+            PipelineStage("classify", self._stage_classify),
+            PipelineStage("dedup", self._stage_dedup),
+            PipelineStage("persist", self._stage_persist),
+            PipelineStage("notify", self._stage_notify),
+        ], on_error=lambda stage, e: self.error_occurred.emit(f"处理剪贴板变化错误（{stage}）: {str(e)}"))
+        self._notify_slots = threading.Semaphore(NOTIFY_BACKLOG)
+        self._trace_recorder: Optional[TraceRecorder] = None  # 会话录制（匿名化轨迹）
         
-        # 连接信号
-        self._listener.clipboard_changed.connect(self._on_clipboard_changed)
+        # 连接信号（捕获在监听线程中直接提交给流水线）
+        self._listener.clipboard_changed.connect(self._submit_capture, Qt.ConnectionType.DirectConnection)
         self._listener.clipboard_error.connect(self.error_occurred.emit)
+        self._capture_ready.connect(self._apply_capture)
+        self._history_ready.connect(self._merge_history)
+        self._history_thread: Optional[threading.Thread] = None
+        
+        # 项目变化时按需失效查询缓存
+        self.item_added.connect(self._query_cache.on_item_added)
+        self.item_updated.connect(self._query_cache.on_item_updated)
+        self.item_removed.connect(self._query_cache.on_item_removed)
+        
+        # 界面按批处理变化：连续复制时每帧最多更新一次
+        self._change_coalescer = ChangeCoalescer(parent=self)
+        self.item_added.connect(lambda item: self._change_coalescer.add(item.id))
+        self.item_updated.connect(lambda item: self._change_coalescer.update(item.id))
+        self.item_removed.connect(self._change_coalescer.remove)
+        self._change_coalescer.batch_ready.connect(self.items_changed.emit)
+    
+    @property
+    def backend(self) -> ClipboardBackend:
+        """剪贴板后端（读写系统剪贴板）"""
+        return self._backend
     
     def set_database_manager(self, database_manager):
         """设置数据库管理器"""
         self._database_manager = database_manager
+        self._content_pager = ContentPager(database_manager, self._page_cache_bytes)
     
     def start(self):
         """启动剪贴板管理器"""
         if not self._is_enabled:
             self._is_enabled = True
+            self._stats_snapshot = None
+            self._pipeline.start()
             self._listener.start_listening()
             print("✅ 剪贴板管理器已启动")
     
@@ -362,37 +422,207 @@ class ClipboardManager(QObject):
         """停止剪贴板管理器"""
         if self._is_enabled:
             self._is_enabled = False
+            self._stats_snapshot = None
             self._listener.stop_listening()
             print("✅ 剪贴板管理器已停止")
     
-    def _on_clipboard_changed(self, item: ClipboardItem):
-        """处理剪贴板变化"""
-        try:
-            # 检查是否已存在相同内容
-            existing_item = self._find_item_by_content(item.content)
+    def shutdown(self):
+        """停止监听并释放后台资源"""
+        self.stop()
+        self._pipeline.stop()
+        self.cancel_regex_search()
+        for thread in list(self._regex_threads):
+            thread.wait()
+        self._regex_engine.shutdown()
+        self._listener.close_capture_log()
+        self.stop_trace_recording()
+    
+    def _submit_capture(self, record: CaptureRecord):
+        """捕获阶段：把剪贴板变化提交给流水线（在监听线程中执行，不阻塞）"""
+        self._pipeline.submit(record)
+    
+    def _stage_normalize(self, record: CaptureRecord) -> CaptureRecord:
+        """规范化阶段：生成项目（搜索文本在构造时规范化）
+        
+        监听线程已随指纹算出哈希和字节数时直接复用
+        """
+        content = record.content
+        if record.content_hash:
+            content_hash, size_bytes = record.content_hash, record.size_bytes
+        else:
+            content_hash, size_bytes = hash_and_size(content)
+        
+        # original_length 非 0 表示内容已被截断到硬上限
+        metadata = None
+        if record.original_length:
+            metadata = {'truncated': True, 'original_length': record.original_length}
+        formats = record.formats
+        if formats is not None and formats.available:
+            # 只记录格式名和序号，格式数据在持久化阶段另存
+            metadata = dict(metadata or {}, formats=formats.available,
+                            clipboard_sequence=formats.sequence)
+        
+        record.item = ClipboardItem(
+            id="",  # 空字符串，会在构造时自动生成
+            content=content,
+            metadata=metadata,
+            content_hash=content_hash,
+            size_bytes=size_bytes
+        )
+        return record
+    
+    def _stage_classify(self, record: CaptureRecord) -> CaptureRecord:
+        """分类阶段：检测内容类型（规则见 classifier 模块，结果按哈希缓存）"""
+        item = record.item
+        item.content_type = sys.intern(default_classifier.classify(item.content, item.content_hash))
+        return record
+    
+    def _stage_dedup(self, record: CaptureRecord) -> CaptureRecord:
+        """去重阶段：按内容哈希查找已有项目
+        
+        新内容立即在哈希索引中预留，之后在入库前再次复制同一内容也会命中
+        """
+        item = record.item
+        with self._index_lock:
+            existing_id = self._hash_index.get(item.content_hash)
+            if existing_id is None:
+                self._hash_index[item.content_hash] = item.id
+        
+        if existing_id is not None:
+            record.existing_id = existing_id
+            # 附加格式以最近一次复制为准
+            updates = {key: item.metadata[key] for key in ('formats', 'clipboard_sequence') if key in item.metadata}
+            record.metadata_updates = updates or None
+        return record
+    
+    def _stage_persist(self, record: CaptureRecord) -> CaptureRecord:
+        """持久化阶段：写入数据库（内容落盘后才能换出）"""
+        database_manager = self._database_manager
+        if not database_manager:
+            return record
+        
+        item = record.item
+        if record.existing_id is not None:
+            if database_manager.record_capture_hit(record.existing_id, record.metadata_updates):
+                self._save_formats(record.existing_id, record.formats)
+                return record
             
-            if existing_item:
-                # 更新现有项目
-                existing_item.update_access()
-                self.item_updated.emit(existing_item)
-                
-                # 保存到数据库
-                if self._database_manager:
-                    self._database_manager.save_item(existing_item)
-                    
-                print(f"🔄 更新现有剪贴板项目: {item.content[:30]}{'...' if len(item.content) > 30 else ''}")
-            else:
+            # 命中的项目已被删除，作为新项目保存
+            with self._index_lock:
+                self._hash_index[item.content_hash] = item.id
+            record.existing_id = None
+            record.metadata_updates = None
+        
+        database_manager.save_item(item)
+        self._save_formats(item.id, record.formats)
+        return record
+    
+    def _stage_notify(self, record: CaptureRecord) -> None:
+        """通知阶段：交给界面线程应用
+        
+        界面线程积压 NOTIFY_BACKLOG 个未应用的捕获时等待；流水线停止时不再等待
+        """
+        while not self._notify_slots.acquire(timeout=0.1):
+            if self._pipeline.closing:
+                return None
+        self._capture_ready.emit(record)
+        return None
+    
+    def _apply_capture(self, record: CaptureRecord):
+        """应用一次捕获到内存中的历史（在界面线程执行）"""
+        try:
+            item = record.item
+            if record.existing_id is None:
                 # 添加新项目
                 self._add_item(item)
-                
-                # 保存到数据库
-                if self._database_manager:
-                    self._database_manager.save_item(item)
-                    
+                self._enforce_memory_budget()
                 print(f"📝 新增剪贴板项目: {item.content[:30]}{'...' if len(item.content) > 30 else ''}")
-                
+                return
+            
+            existing_item = self._items.get(record.existing_id)
+            if existing_item is None:
+                # 处理期间项目已被删除
+                return
+            
+            # 更新现有项目，并提到最近位置；已换出的内容直接用本次捕获的内容恢复
+            if not existing_item.is_resident:
+                self._page_in(existing_item, item.content)
+            if record.metadata_updates:
+                existing_item.update_metadata(**record.metadata_updates)
+            existing_item.update_access()
+            self._touch_item(existing_item)
+            self.item_updated.emit(existing_item)
+            self._enforce_memory_budget()
+            
+            print(f"🔄 更新现有剪贴板项目: {item.content[:30]}{'...' if len(item.content) > 30 else ''}")
+            
         except Exception as e:
             self.error_occurred.emit(f"处理剪贴板变化错误: {str(e)}")
+        finally:
+            self._notify_slots.release()
+            self._pipeline.record_completion(record)
+    
+    def flush_changes(self):
+        """立即发出尚未合并通知的项目变化"""
+        self._change_coalescer.flush()
+    
+    def add_pipeline_observer(self, stage_name: str, callback: Callable[[CaptureRecord], None]):
+        """观察捕获流水线某个阶段的完成（如 "persist"），回调在流水线线程中执行"""
+        self._pipeline.add_observer(stage_name, callback)
+    
+    def get_pipeline_stats(self) -> Dict[str, Any]:
+        """获取捕获流水线统计：各阶段队列深度、丢弃数、排队和处理耗时，以及端到端延迟"""
+        return self._pipeline.get_stats()
+    
+    def _save_formats(self, item_id: str, formats: Optional[FormatCapture]):
+        """保存捕获时已读取的附加格式数据"""
+        if formats is not None and formats.data:
+            self._database_manager.save_item_formats(item_id, formats.data)
+    
+    def get_item_formats(self, item_id: str) -> Dict[str, bytes]:
+        """获取项目的附加格式数据
+        
+        先读取已保存的格式；捕获时超出预算未读取的附加格式，如果剪贴板仍是该项目的内容，
+        则此时从后端补读并保存
+        """
+        item = self._items.get(item_id)
+        if item is None:
+            return {}
+        
+        saved = self._database_manager.get_item_formats(item_id) if self._database_manager else {}
+        missing = [
+            name for name in item.metadata.get('formats', ())
+            if name in SECONDARY_FORMATS and name not in saved
+        ]
+        sequence = item.metadata.get('clipboard_sequence')
+        if not missing or sequence is None or self._backend.get_sequence_number() != sequence:
+            return saved
+        
+        fetched = {}
+        try:
+            for name in missing:
+                data = self._backend.read_format(name)
+                if data is not None:
+                    fetched[name] = data
+        except Exception as e:
+            print(f"⚠️ 补读附加格式失败: {e}")
+            return saved
+        
+        # 读取期间剪贴板变化则丢弃
+        if self._backend.get_sequence_number() != sequence:
+            return saved
+        if fetched and self._database_manager:
+            self._database_manager.save_item_formats(item_id, fetched)
+        saved.update(fetched)
+        return saved
+    
+    def copy_to_clipboard(self, item: ClipboardItem):
+        """将项目写回剪贴板，同时恢复已保存的附加格式（如 HTML、RTF），失败时抛出异常"""
+        self._backend.write_text(item.content, self.get_item_formats(item.id))
+    
+    def set_format_capture_budget(self, max_bytes: int):
+        """设置捕获时立即读取附加格式的字节预算"""
+        self._listener.set_format_budget(max_bytes)
     
     def _add_item(self, item: ClipboardItem):
         """添加新项目"""
@@ -401,31 +631,138 @@ class ClipboardManager(QObject):
             self._remove_oldest_item()
         
         # 添加新项目
-        self._items[item.id] = item
+        self._items.add(item)
+        with self._index_lock:
+            self._hash_index[item.content_hash] = item.id
+        self._count_item(item, 1)
+        self._track_resident(item)
         self.item_added.emit(item)
         
         print(f"✅ 剪贴板项目已添加到内存: {item.content_type} 类型")
     
+    def add_transient_item(self, item: ClipboardItem):
+        """添加只在内存中的项目（不保存到数据库，如调试模式的测试卡片）
+        
+        换出后无法从数据库读回内容，因此不参与内存预算，始终常驻
+        """
+        self._transient_ids.add(item.id)
+        self._add_item(item)
+    
     def _remove_oldest_item(self):
-        """移除最旧的项目"""
-        if not self._items:
+        """移除最久未使用的项目"""
+        oldest_item = self._items.pop_oldest()
+        if oldest_item is None:
             return
         
-        # 找到最旧的项目
-        oldest_item = min(self._items.values(), key=lambda x: x.created_at)
-        del self._items[oldest_item.id]
+        self._unindex_item(oldest_item)
+        self._count_item(oldest_item, -1)
+        self._untrack_resident(oldest_item.id)
         self.item_removed.emit(oldest_item.id)
         
         # 从数据库中也删除
         if self._database_manager:
             self._database_manager.delete_item(oldest_item.id)
     
-    def _find_item_by_content(self, content: str) -> Optional[ClipboardItem]:
-        """根据内容查找项目"""
-        for item in self._items.values():
-            if item.content == content:
-                return item
-        return None
+    def _unindex_item(self, item: ClipboardItem):
+        """从哈希索引中移除项目"""
+        with self._index_lock:
+            if self._hash_index.get(item.content_hash) == item.id:
+                del self._hash_index[item.content_hash]
+    
+    def _count_item(self, item: ClipboardItem, delta: int):
+        """增量更新统计计数，delta 为 1（添加）或 -1（移除）"""
+        count = self._type_counts.get(item.content_type, 0) + delta
+        if count > 0:
+            self._type_counts[item.content_type] = count
+        else:
+            self._type_counts.pop(item.content_type, None)
+        
+        if item.is_favorite:
+            self._favorite_count += delta
+        self._total_bytes += delta * item.size_bytes
+        self._stats_snapshot = None
+    
+    def _reset_counters(self):
+        """清零统计计数"""
+        self._type_counts.clear()
+        self._favorite_count = 0
+        self._total_bytes = 0
+        self._stats_snapshot = None
+        self._resident_order.clear()
+        self._resident_bytes = 0
+        self._transient_ids.clear()
+        if self._content_pager:
+            self._content_pager.clear()
+    
+    def _track_resident(self, item: ClipboardItem, oldest: bool = False):
+        """登记项目的常驻状态，已换出的项目绑定分页器；oldest 为 True 时排在最先换出的位置"""
+        if item.id in self._transient_ids:
+            return
+        if item.is_resident:
+            self._resident_order[item.id] = item.size_bytes
+            if oldest:
+                self._resident_order.move_to_end(item.id, last=False)
+            self._resident_bytes += item.size_bytes
+        else:
+            item.page_out(self._content_pager)
+    
+    def _untrack_resident(self, item_id: str):
+        """注销项目的常驻状态"""
+        self._transient_ids.discard(item_id)
+        size = self._resident_order.pop(item_id, None)
+        if size is not None:
+            self._resident_bytes -= size
+        if self._content_pager:
+            self._content_pager.discard(item_id)
+    
+    def _touch_item(self, item: ClipboardItem):
+        """将项目提到最近位置"""
+        self._items.touch(item.id)
+        if item.id in self._resident_order:
+            self._resident_order.move_to_end(item.id)
+    
+    def _page_in(self, item: ClipboardItem, content: str):
+        """恢复项目的常驻内容"""
+        item.page_in(content)
+        self._content_pager.discard(item.id)
+        self._track_resident(item)
+    
+    def _enforce_memory_budget(self):
+        """换出最久未用的常驻内容，直到常驻字节数不超过预算
+        
+        内容必须已保存到数据库，因此只在持久化之后调用
+        """
+        if not self._memory_budget or not self._content_pager:
+            return
+        
+        while self._resident_bytes > self._memory_budget and self._resident_order:
+            item_id, size = self._resident_order.popitem(last=False)
+            self._resident_bytes -= size
+            item = self._items.get(item_id)
+            if item is not None:
+                item.page_out(self._content_pager)
+    
+    def set_memory_budget(self, budget_bytes: int):
+        """设置常驻内容的内存预算（字节，0 表示不限制）"""
+        self._memory_budget = max(0, budget_bytes)
+        self._enforce_memory_budget()
+    
+    def set_page_cache_size(self, max_bytes: int):
+        """设置换出内容读取缓存的字节上限"""
+        self._page_cache_bytes = max(0, max_bytes)
+        if self._content_pager:
+            self._content_pager.set_max_bytes(self._page_cache_bytes)
+    
+    def get_memory_stats(self) -> Dict[str, Any]:
+        """获取内存使用统计，用于按机器调整预算"""
+        return {
+            'budget_bytes': self._memory_budget,
+            'resident_bytes': self._resident_bytes,
+            'resident_items': len(self._resident_order),
+            'paged_out_items': len(self._items) - len(self._resident_order) - len(self._transient_ids),
+            'total_bytes': self._total_bytes,
+            'page_cache': self._content_pager.get_stats() if self._content_pager else {}
+        }
     
     def get_item(self, item_id: str) -> Optional[ClipboardItem]:
         """根据ID获取项目"""
@@ -436,14 +773,48 @@ class ClipboardManager(QObject):
         return list(self._items.values())
     
     def get_recent_items(self, limit: int = 50) -> list[ClipboardItem]:
-        """获取最近的项目"""
-        sorted_items = sorted(self._items.values(), key=lambda x: x.created_at, reverse=True)
-        return sorted_items[:limit]
+        """获取最近的项目（按最近使用排序）"""
+        cache_key = ('recent', limit)
+        cached = self._query_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        results = self._items.recent(limit)
+        self._query_cache.put(cache_key, results, lambda item: True, update_sensitive=True)
+        return results
+    
+    def record_access(self, item: ClipboardItem):
+        """记录项目被使用：更新访问信息、提到最近位置并保存"""
+        item.update_access()
+        self._touch_item(item)
+        self.item_updated.emit(item)
+        
+        if self._database_manager:
+            self._database_manager.update_item_state(item)
+    
+    def set_favorite(self, item_id: str, is_favorite: bool) -> bool:
+        """设置项目收藏状态"""
+        item = self._items.get(item_id)
+        if item is None:
+            return False
+        
+        if item.is_favorite != is_favorite:
+            item.is_favorite = is_favorite
+            self._favorite_count += 1 if is_favorite else -1
+            self._stats_snapshot = None
+            self.item_updated.emit(item)
+            
+            if self._database_manager:
+                self._database_manager.update_item_state(item)
+        return True
     
     def remove_item(self, item_id: str) -> bool:
         """移除项目"""
-        if item_id in self._items:
-            del self._items[item_id]
+        item = self._items.remove(item_id)
+        if item is not None:
+            self._unindex_item(item)
+            self._count_item(item, -1)
+            self._untrack_resident(item_id)
             self.item_removed.emit(item_id)
             
             # 从数据库中也删除
@@ -457,6 +828,10 @@ class ClipboardManager(QObject):
         """清空所有项目"""
         item_ids = list(self._items.keys())
         self._items.clear()
+        with self._index_lock:
+            self._hash_index.clear()
+        self._reset_counters()
+        self._query_cache.clear()
         for item_id in item_ids:
             self.item_removed.emit(item_id)
         
@@ -471,40 +846,333 @@ class ClipboardManager(QObject):
         while len(self._items) > self._max_items:
             self._remove_oldest_item()
     
-    def search_items(self, query: str, limit: int = 50) -> List[ClipboardItem]:
-        """搜索项目"""
+    def set_max_payload_chars(self, max_chars: int):
+        """设置单条剪贴板内容的硬上限（字符），超出部分截断并在元数据中记录原始长度"""
+        self._listener.set_max_payload_chars(max_chars)
+    
+    def set_check_interval(self, interval: int, max_interval: Optional[int] = None):
+        """设置剪贴板检查间隔范围（毫秒），空闲时在两者之间指数退避"""
+        self._listener.set_check_interval(interval, max_interval)
+    
+    def get_poll_stats(self) -> Dict[str, Any]:
+        """获取剪贴板检查的统计信息（检测延迟、空闲唤醒次数等）"""
+        return self._listener.get_poll_stats()
+    
+    def configure_capture_log(self, enabled: bool, max_bytes: int, backup_count: int,
+                              rotate_interval: float):
+        """配置捕获日志：大小上限、保留的旧文件数和按时间轮转的间隔（秒）"""
+        if not enabled:
+            self._listener.set_capture_log(None)
+            return
+        self._listener.set_capture_log(CaptureLogWriter(
+            get_app_data_dir() / "logs" / "clipboard_changes.log",
+            max_bytes=max_bytes, backup_count=backup_count, rotate_interval=rotate_interval
+        ))
+    
+    def configure_trace_recording(self, enabled: bool, scramble_content: bool = False):
+        """配置会话录制：开启时在数据目录 traces 下新建一份轨迹文件"""
+        if not enabled:
+            self.stop_trace_recording()
+            return
+        file_name = f"trace-{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl"
+        self.start_trace_recording(get_app_data_dir() / "traces" / file_name, scramble_content)
+    
+    def start_trace_recording(self, path, scramble_content: bool = False) -> TraceRecorder:
+        """开始把剪贴板事件录制为匿名化轨迹（分类阶段完成后记录），已在录制时先结束旧文件"""
+        self.stop_trace_recording()
+        self._trace_recorder = TraceRecorder(path, scramble_content)
+        self._pipeline.add_observer("classify", self._trace_recorder.record)
+        print(f"⏺️ 开始录制剪贴板轨迹: {path}")
+        return self._trace_recorder
+    
+    def stop_trace_recording(self):
+        """结束会话录制"""
+        recorder, self._trace_recorder = self._trace_recorder, None
+        if recorder is None:
+            return
+        self._pipeline.remove_observer("classify", recorder.record)
+        recorder.close()
+        print(f"⏹️ 剪贴板轨迹录制结束，共 {recorder.event_count} 个事件")
+    
+    def search_items(self, query: str, limit: int = 50, mode: str = "text") -> List[ClipboardItem]:
+        """搜索项目
+
+        支持 ``type:<类型>`` 过滤，例如 ``type:code def``。
+        mode 为 "regex" 时在搜索进程中执行正则匹配，超时返回已得到的部分结果。
+        """
         if not query.strip():
             return self.get_recent_items(limit)
         
-        query_lower = query.lower()
+        return [match.item for match in self.search_matches(query, limit, mode)]
+    
+    def search_matches(self, query: str, limit: int = 50, mode: str = "text") -> List[SearchMatch]:
+        """搜索项目并返回命中位置和摘要片段"""
+        if not query.strip():
+            return [make_match(item, []) for item in self.get_recent_items(limit)]
+        
+        if mode == "regex":
+            return self._search_matches_regex(query, limit)
+        
+        text, content_type = self._parse_query(query)
+        cache_key = ('search', text, content_type, limit)
+        cached = self._query_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # 已换出的项目、以及大内容搜索前缀之后的部分在数据库中查找
+        database_hits = self._search_in_database(text, content_type)
+        
         results = []
+        for item in self._items.iter_recent():
+            if content_type and item.content_type != content_type:
+                continue
+            
+            offsets = []
+            if text and not item.is_resident:
+                if item.id not in database_hits:
+                    continue
+                offsets = self._locate(item.content, text)
+            elif text:
+                search_text = item.search_text
+                position = search_text.find(text)
+                if position >= 0:
+                    if search_text is item.content:
+                        offsets.append((position, position + len(text)))
+                    else:
+                        offsets.append(map_normalized_span(item.content, position, position + len(text)))
+                elif item.id in database_hits:
+                    offsets = self._locate(item.content, text)
+                else:
+                    continue
+            
+            results.append(make_match(item, offsets))
+            if len(results) >= limit:
+                break
         
-        for item in self._items.values():
-            if query_lower in item.content.lower():
-                results.append(item)
-                if len(results) >= limit:
-                    break
+        self._query_cache.put(cache_key, results, self._build_matcher(text, content_type),
+                              update_sensitive=True, item_ids=[match.item_id for match in results])
+        return results
+    
+    def _search_in_database(self, text: str, content_type: Optional[str]) -> set:
+        """在数据库中查找内容包含 text 的项目ID
+        
+        查找范围是已换出的项目，以及超过搜索前缀（SEARCH_PREFIX_CHARS）的常驻大内容；
+        数据库按 ASCII 不区分大小写匹配，全角等需要规范化才能命中的文本只在搜索文本覆盖的部分生效
+        """
+        if not text or not self._database_manager:
+            return set()
+        
+        item_ids = [
+            item.id for item in self._items.values()
+            if (not content_type or item.content_type == content_type)
+            and (not item.is_resident or len(item.content) > SEARCH_PREFIX_CHARS)
+        ]
+        return self._database_manager.search_item_ids(text, item_ids)
+    
+    @staticmethod
+    def _locate(content: str, text: str) -> list:
+        """在完整内容中定位命中，返回原始内容中的位置列表（未找到时为空，卡片显示开头）"""
+        position = normalize_for_search(content).find(text)
+        if position < 0:
+            return []
+        return [map_normalized_span(content, position, position + len(text))]
+    
+    @staticmethod
+    def _parse_query(query: str) -> tuple:
+        """解析查询字符串，拆分出文本和类型过滤"""
+        content_type = None
+        terms = []
+        for term in query.split():
+            if term.lower().startswith('type:') and len(term) > 5:
+                content_type = term[5:].lower()
+            else:
+                terms.append(term)
+        
+        text = ' '.join(terms) if content_type else query
+        return normalize_for_search(text), content_type
+    
+    @staticmethod
+    def _build_matcher(text: str, content_type: Optional[str]) -> Callable[[ClipboardItem], bool]:
+        """根据查询条件构建匹配函数"""
+        def matcher(item: ClipboardItem) -> bool:
+            if content_type and item.content_type != content_type:
+                return False
+            # 已换出的项目没有搜索文本、大内容的搜索文本只覆盖前缀，保守地视为匹配
+            return (not text or not item.is_resident or text in item.search_text
+                    or len(item.content) > SEARCH_PREFIX_CHARS)
         
+        return matcher
+    
+    def _search_matches_regex(self, pattern: str, limit: int) -> List[SearchMatch]:
+        """同步执行正则搜索"""
+        try:
+            result = self._regex_engine.search(pattern, self.regex_search_snapshot(), limit)
+        except re.error as e:
+            self.error_occurred.emit(f"正则表达式无效: {str(e)}")
+            return []
+        
+        if result.error:
+            self.error_occurred.emit(f"正则搜索错误: {result.error}")
+        return self.regex_matches_to_results(result.matches)
+    
+    def regex_matches_to_results(self, matches: list) -> List[SearchMatch]:
+        """将 (项目ID, 起, 止) 转换为搜索结果"""
+        results = []
+        for item_id, start, end in matches:
+            item = self._items.get(item_id)
+            if item is not None:
+                results.append(make_match(item, [(start, end)]))
         return results
     
+    def regex_search_snapshot(self) -> list:
+        """生成正则搜索所需的 (ID, 内容) 快照，已换出的内容直接从数据库读取，不占用分页缓存"""
+        return [
+            (item.id, item.content if item.is_resident else self._content_pager.read_through(item))
+            for item in self._items.iter_recent()
+        ]
+    
+    def start_regex_search(self, pattern: str, limit: int = 50) -> int:
+        """在后台启动正则搜索，返回搜索编号
+
+        匹配结果（SearchMatch 列表）通过 regex_search_chunk 分批发送，
+        结束时发送 regex_search_finished
+        """
+        self.cancel_regex_search()
+        self._regex_run_id += 1
+        run_id = self._regex_run_id
+        
+        try:
+            re.compile(pattern, re.IGNORECASE)
+        except re.error as e:
+            self.error_occurred.emit(f"正则表达式无效: {str(e)}")
+            self.regex_search_finished.emit(run_id, False)
+            return run_id
+        
+        # 旧线程已被取消，会在下一次轮询时退出
+        thread = RegexSearchThread(self._regex_engine, run_id, pattern,
+                                   self.regex_search_snapshot(), limit, self)
+        thread.chunk_ready.connect(self._on_regex_chunk_ready)
+        thread.search_finished.connect(self.regex_search_finished.emit)
+        thread.error_occurred.connect(
+            lambda _run_id, message: self.error_occurred.emit(f"正则搜索错误: {message}")
+        )
+        thread.finished.connect(lambda: self._on_regex_thread_finished(thread))
+        self._regex_threads.add(thread)
+        thread.start()
+        return run_id
+    
+    def cancel_regex_search(self):
+        """取消正在执行的正则搜索"""
+        if self._regex_threads:
+            self._regex_engine.cancel()
+    
+    def _on_regex_thread_finished(self, thread: RegexSearchThread):
+        """回收已结束的搜索线程"""
+        self._regex_threads.discard(thread)
+        thread.deleteLater()
+    
+    @property
+    def regex_search_timeout(self) -> float:
+        """正则搜索超时（秒）"""
+        return self._regex_engine.timeout
+    
+    def set_regex_search_timeout(self, timeout: float):
+        """设置正则搜索超时（秒）"""
+        self._regex_engine.set_timeout(timeout)
+    
+    def _on_regex_chunk_ready(self, run_id: int, matches: list):
+        """将正则搜索的命中位置转换为搜索结果后转发"""
+        if run_id != self._regex_run_id:
+            return
+        results = self.regex_matches_to_results(matches)
+        if results:
+            self.regex_search_chunk.emit(run_id, results)
+    
+    def get_query_cache_stats(self) -> Dict[str, Any]:
+        """获取查询缓存统计信息（命中率、淘汰次数等）"""
+        return self._query_cache.get_stats()
+    
+    def set_query_cache_size(self, max_entries: int):
+        """设置查询缓存最大条数"""
+        self._query_cache.set_max_entries(max_entries)
+    
     def get_stats(self) -> Dict[str, Any]:
         """获取统计信息"""
-        total_items = len(self._items)
-        content_types = self._get_content_type_stats()
+        return self.get_stats_snapshot().to_dict()
+    
+    def get_stats_snapshot(self) -> StatsSnapshot:
+        """获取统计信息快照
+
+        计数在添加/更新/删除时增量维护，读取不遍历项目
+        """
+        if self._stats_snapshot is None:
+            self._stats_snapshot = StatsSnapshot(
+                total_items=len(self._items),
+                content_types=self._type_counts,
+                favorite_count=self._favorite_count,
+                total_bytes=self._total_bytes,
+                is_enabled=self._is_enabled
+            )
+        return self._stats_snapshot
+    
+    def _read_history(self) -> List[ClipboardItem]:
+        """从数据库读取最近的项目；设置了内存预算时，超出预算的项目只读取头部信息"""
+        if self._memory_budget:
+            return self._database_manager.get_recent_items_within_budget(
+                self._max_items, self._memory_budget
+            )
+        return self._database_manager.get_recent_items(self._max_items)
+    
+    def load_from_database_async(self):
+        """在后台线程读取历史项目，读取完成后在界面线程合并并发出 history_loaded
         
-        return {
-            'total_items': total_items,
-            'content_types': content_types,
-            'is_enabled': self._is_enabled
-        }
+        启动时不必等待读取完成即可显示托盘和开始监听；合并前新捕获的项目保持在最近位置
+        """
+        if not self._database_manager or self._history_thread is not None:
+            return
+        
+        def read():
+            try:
+                self._history_ready.emit(self._read_history())
+            except Exception as e:
+                print(f"❌ 从数据库加载项目失败: {e}")
+                self.error_occurred.emit(f"从数据库加载项目失败: {str(e)}")
+                self._history_ready.emit([])
+        
+        self._history_thread = threading.Thread(target=read, name="HistoryLoader", daemon=True)
+        self._history_thread.start()
     
-    def _get_content_type_stats(self) -> Dict[str, int]:
-        """获取内容类型统计"""
-        stats = {}
-        for item in self._items.values():
-            content_type = item.content_type
-            stats[content_type] = stats.get(content_type, 0) + 1
-        return stats
+    def _merge_history(self, db_items: List[ClipboardItem]):
+        """合并后台读取的历史项目（界面线程）
+        
+        历史项目排在已有项目之前（更旧）；加载期间已重新捕获的内容以新项目为准，
+        数据库中对应的旧记录删除，避免同一内容保存两份
+        """
+        self._history_thread = None
+        loaded = 0
+        stale_ids = []
+        with self._index_lock:
+            for item in db_items:  # 从新到旧
+                if item.id in self._items:
+                    continue
+                if item.content_hash in self._hash_index:
+                    stale_ids.append(item.id)
+                    continue
+                if len(self._items) >= self._max_items:
+                    break
+                self._items.add_oldest(item)
+                self._hash_index[item.content_hash] = item.id
+                self._count_item(item, 1)
+                self._track_resident(item, oldest=True)
+                loaded += 1
+        
+        if self._database_manager:
+            for item_id in stale_ids:
+                self._database_manager.delete_item(item_id)
+        self._query_cache.clear()
+        self._enforce_memory_budget()
+        print(f"✅ 从数据库加载了 {loaded} 个剪贴板项目")
+        self.history_loaded.emit(loaded)
     
     def load_from_database(self):
         """从数据库加载项目"""
@@ -512,15 +1180,21 @@ class ClipboardManager(QObject):
             return
         
         try:
-            # 从数据库获取最近的项目
-            db_items = self._database_manager.get_recent_items(self._max_items)
+            db_items = self._read_history()
             
             # 清空当前内存中的项目
             self._items.clear()
+            self._reset_counters()
+            self._query_cache.clear()
             
-            # 加载数据库中的项目
-            for item in db_items:
-                self._items[item.id] = item
+            # 数据库按从新到旧返回，倒序添加使最新的项目排在最近位置
+            with self._index_lock:
+                self._hash_index.clear()
+                for item in reversed(db_items):
+                    self._items.add(item)
+                    self._hash_index[item.content_hash] = item.id
+                    self._count_item(item, 1)
+                    self._track_resident(item)
             
             print(f"✅ 从数据库加载了 {len(db_items)} 个剪贴板项目")
             
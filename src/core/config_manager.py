@@ -12,6 +12,8 @@ from typing import Any, Dict, Optional
 from dataclasses import dataclass, field, asdict
 from PyQt6.QtCore import QObject, pyqtSignal
 
+from ..utils.app_paths import get_app_data_dir
+
 
 @dataclass
 class AppConfig:
@@ -23,8 +25,23 @@ class AppConfig:
     
     # 剪贴板设置
     max_clipboard_items: int = 1000
-    clipboard_check_interval: int = 100  # 毫秒
+    clipboard_check_interval: int = 100  # 毫秒，剪贴板变化后的最短检查间隔
+    clipboard_check_interval_max: int = 2000  # 毫秒，空闲时指数退避的最长检查间隔
     auto_clean_days: int = 30
+    history_memory_budget_mb: int = 256  # 常驻内存的历史内容上限，0 表示不限制
+    content_page_cache_mb: int = 32  # 换出内容的读取缓存上限
+    max_payload_mb: int = 64  # 单条内容上限（百万字符），超出部分截断，0 表示不限制
+    format_capture_budget_kb: int = 4096  # 复制时立即保存的附加格式（HTML、RTF、图片等）总大小上限
+    
+    # 捕获日志设置（位于应用数据目录 logs 下）
+    capture_log_enabled: bool = True
+    capture_log_max_kb: int = 1024  # 单个日志文件大小上限
+    capture_log_backup_count: int = 3  # 轮转后保留的旧文件数
+    capture_log_rotate_hours: int = 24  # 按时间轮转的间隔
+    
+    # 会话录制（匿名化轨迹，位于应用数据目录 traces 下，用于性能回放）
+    trace_recording_enabled: bool = False
+    trace_scramble_content: bool = False  # 同时保存打乱后的内容，否则回放时按类型和大小合成
     
     # 界面设置
     window_width: int = 800
@@ -40,6 +57,7 @@ class AppConfig:
     
     # 系统集成设置
     auto_start: bool = False
+    ipc_server_enabled: bool = True  # 本地 IPC 查询接口，供启动器、编辑器插件和脚本使用
     minimize_to_tray: bool = True
     show_notifications: bool = True
     start_minimized: bool = False
@@ -47,6 +65,7 @@ class AppConfig:
     # 搜索设置
     search_history_limit: int = 20
     fuzzy_search: bool = True
+    regex_search_timeout: float = 2.0  # 秒，正则搜索的单次时间上限
     
     # 数据设置
     backup_enabled: bool = True
@@ -80,9 +99,7 @@ class ConfigManager(QObject):
         
         if config_file is None:
             # 默认配置文件路径
-            app_data_dir = Path.home() / "AppData" / "Local" / "PasteForWindows"
-            app_data_dir.mkdir(parents=True, exist_ok=True)
-            config_file = app_data_dir / "config.json"
+            config_file = get_app_data_dir() / "config.json"
         
         self.config_file = Path(config_file)
         self.config_file.parent.mkdir(parents=True, exist_ok=True)
@@ -210,6 +227,7 @@ class ConfigManager(QObject):
         return {
             'max_items': self.get('max_clipboard_items'),
             'check_interval': self.get('clipboard_check_interval'),
+            'check_interval_max': self.get('clipboard_check_interval_max'),
             'auto_clean_days': self.get('auto_clean_days')
         }
     
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地 IPC 服务模块
+让同一台机器上的其他工具（启动器、编辑器插件、脚本）查询和使用剪贴板历史，
+支持 search、recent、get、pin、paste 命令，协议见 utils/ipc_protocol.py
+
+- 监听和每个连接各在一个工作线程中处理，不阻塞界面线程
+- 对剪贴板管理器的调用通过信号转到管理器所在线程执行，工作线程等待结果；
+  正则匹配（IPC 专用的搜索进程）和自动输入在连接线程中进行，界面线程不等待
+- 列表结果分块发送，客户端收到第一块即可开始显示
+"""
+
+import inspect
+import os
+import re
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from multiprocessing.connection import Client, Listener
+from typing import Any, Callable, Dict, List, Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from .search_engine import RegexSearchEngine, SearchMatch
+from ..utils.ipc_protocol import (
+    COMMANDS, PREVIEW_CHARS, PROTOCOL_VERSION, STREAM_CHUNK_SIZE, decode_frame, encode_frame,
+    get_ipc_address, get_ipc_family, load_authkey
+)
+
+# 等待管理器线程执行一次调用的最长时间（秒）
+CALL_TIMEOUT = 10.0
+
+# 单个请求的列表结果上限
+MAX_RESULTS = 1000
+
+
+class IpcServer(QObject):
+    """剪贴板历史 IPC 服务"""
+
+    # 工作线程请求在管理器线程中执行调用
+    _call_requested = pyqtSignal(object)  # (callable, Future)
+
+    def __init__(self, clipboard_manager, address: Optional[str] = None,
+                 authkey: Optional[bytes] = None, parent=None):
+        super().__init__(parent)
+        self._clipboard_manager = clipboard_manager
+        self._address = address or get_ipc_address()
+        self._authkey = authkey
+        self._listener: Optional[Listener] = None
+        self._accept_thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._connections = set()
+        self._connections_lock = threading.Lock()
+        # IPC 的正则搜索使用自己的搜索进程，不与面板的正则搜索争用，首次使用时创建
+        self._regex_engine: Optional[RegexSearchEngine] = None
+        self._regex_engine_lock = threading.Lock()
+
+        self._call_requested.connect(self._run_call)
+
+    @property
+    def address(self) -> str:
+        return self._address
+
+    @property
+    def is_running(self) -> bool:
+        return self._listener is not None
+
+    def start(self) -> bool:
+        """开始监听，已有实例在运行或地址不可用时返回 False"""
+        if self._listener is not None:
+            return True
+
+        try:
+            if self._authkey is None:
+                self._authkey = load_authkey(create=True)
+            if self._other_instance_running():
+                print(f"⚠️ IPC 地址已被其他实例使用: {self._address}")
+                return False
+            self._listener = Listener(self._address, family=get_ipc_family(), authkey=self._authkey)
+        except Exception as e:
+            print(f"❌ IPC 服务启动失败: {e}")
+            return False
+
+        self._stopping.clear()
+        self._accept_thread = threading.Thread(target=self._accept_loop, name="IpcServer", daemon=True)
+        self._accept_thread.start()
+        print(f"✅ IPC 服务已启动: {self._address}")
+        return True
+
+    def stop(self):
+        """停止监听并断开所有连接"""
+        if self._listener is None:
+            return
+        self._stopping.set()
+
+        # accept() 不会因关闭监听而返回，连接一次将其唤醒
+        try:
+            Client(self._address, family=get_ipc_family(), authkey=self._authkey).close()
+        except Exception:
+            pass
+        if self._accept_thread:
+            self._accept_thread.join(2.0)
+            self._accept_thread = None
+
+        self._listener.close()
+        self._listener = None
+        with self._connections_lock:
+            for conn in list(self._connections):
+                conn.close()
+            self._connections.clear()
+        with self._regex_engine_lock:
+            if self._regex_engine is not None:
+                self._regex_engine.shutdown()
+                self._regex_engine = None
+        print("✅ IPC 服务已停止")
+
+    def _other_instance_running(self) -> bool:
+        """地址上是否已有服务；Unix 套接字文件残留（上次未正常退出）时删除"""
+        family = get_ipc_family()
+        if family == "AF_UNIX" and not os.path.exists(self._address):
+            return False
+        try:
+            Client(self._address, family=family, authkey=self._authkey).close()
+            return True
+        except Exception:
+            if family == "AF_UNIX":
+                os.unlink(self._address)
+            return False
+
+    def _accept_loop(self):
+        """监听线程：接受连接，每个连接一个处理线程"""
+        while not self._stopping.is_set():
+            try:
+                conn = self._listener.accept()
+            except Exception as e:
+                if self._stopping.is_set():
+                    break
+                print(f"⚠️ IPC 连接被拒绝: {e}")
+                continue
+
+            if self._stopping.is_set():
+                conn.close()
+                break
+            with self._connections_lock:
+                self._connections.add(conn)
+            threading.Thread(target=self._serve_connection, args=(conn,),
+                             name="IpcConnection", daemon=True).start()
+
+    def _serve_connection(self, conn):
+        """连接线程：逐帧读取请求（单个或批量），按顺序应答"""
+        try:
+            while not self._stopping.is_set():
+                try:
+                    frame = decode_frame(conn.recv_bytes())
+                except (EOFError, OSError):
+                    break
+                except ValueError as e:
+                    conn.send_bytes(encode_frame({'id': None, 'ok': False, 'error': f"无效的请求帧: {e}"}))
+                    continue
+
+                requests = frame if isinstance(frame, list) else [frame]
+                for request in requests:
+                    self._handle_request(conn, request)
+        except (OSError, EOFError):
+            pass
+        finally:
+            with self._connections_lock:
+                self._connections.discard(conn)
+            conn.close()
+
+    def _handle_request(self, conn, request: Any):
+        """处理一个请求：列表结果分块发送，最后发送结束帧"""
+        request_id = request.get('id') if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("请求必须是对象")
+            command = request.get('cmd')
+            if command not in COMMANDS:
+                raise ValueError(f"未知命令: {command}")
+            args = request.get('args')
+            if args is None:
+                args = {}
+            elif not isinstance(args, dict):
+                raise ValueError("无效的请求: args 必须是对象")
+
+            # 只有参数绑定失败才是参数错误，命令执行中的 TypeError 按普通错误返回
+            handler = getattr(self, f"_cmd_{command}")
+            try:
+                bound = inspect.signature(handler).bind(**args)
+            except TypeError as e:
+                raise ValueError(f"参数错误: {e}")
+            result = handler(*bound.args, **bound.kwargs)
+        except Exception as e:
+            self._send(conn, {'id': request_id, 'ok': False, 'error': str(e)})
+            return
+
+        if isinstance(result, list):
+            for start in range(0, len(result), STREAM_CHUNK_SIZE):
+                self._send(conn, {'id': request_id, 'chunk': result[start:start + STREAM_CHUNK_SIZE]})
+            self._send(conn, {'id': request_id, 'ok': True, 'streamed': True, 'count': len(result),
+                              'version': PROTOCOL_VERSION})
+            return
+        self._send(conn, {'id': request_id, 'ok': True, 'result': result, 'version': PROTOCOL_VERSION})
+
+    def _send(self, conn, data: Dict[str, Any]):
+        conn.send_bytes(encode_frame(data))
+
+    def _call(self, func: Callable[[], Any]) -> Any:
+        """在管理器所在线程执行 func 并返回结果（从连接线程调用）"""
+        future: Future = Future()
+        self._call_requested.emit((func, future))
+        try:
+            return future.result(CALL_TIMEOUT)
+        except FutureTimeoutError:
+            future.cancel()  # 尚未开始执行时不再执行
+            raise TimeoutError("程序繁忙，请求超时")
+
+    def _run_call(self, call):
+        """管理器线程：执行工作线程提交的调用"""
+        func, future = call
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(func())
+        except Exception as e:
+            future.set_exception(e)
+
+    # ---- 命令 ----
+
+    def _cmd_search(self, query: str, limit: int = 50, mode: str = "text") -> List[Dict[str, Any]]:
+        limit = _clamp_limit(limit)
+        if mode == "regex":
+            return self._search_regex(query, limit)
+        return self._call(lambda: [
+            _match_summary(match) for match in self._clipboard_manager.search_matches(query, limit, mode)
+        ])
+
+    def _search_regex(self, pattern: str, limit: int) -> List[Dict[str, Any]]:
+        """正则搜索：管理器线程只生成快照和转换结果，等待搜索进程在连接线程中进行"""
+        try:
+            re.compile(pattern, re.IGNORECASE)
+        except re.error as e:
+            raise ValueError(f"正则表达式无效: {e}")
+
+        snapshot = self._call(self._clipboard_manager.regex_search_snapshot)
+        result = self._get_regex_engine().search(
+            pattern, snapshot, limit, timeout=self._clipboard_manager.regex_search_timeout
+        )
+        if result.error:
+            raise ValueError(f"正则搜索错误: {result.error}")
+        return self._call(lambda: [
+            _match_summary(match)
+            for match in self._clipboard_manager.regex_matches_to_results(result.matches)
+        ])
+
+    def _get_regex_engine(self) -> RegexSearchEngine:
+        with self._regex_engine_lock:
+            if self._regex_engine is None:
+                self._regex_engine = RegexSearchEngine()
+            return self._regex_engine
+
+    def _cmd_recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        limit = _clamp_limit(limit)
+        return self._call(lambda: [
+            _item_summary(item, _preview(item.content))
+            for item in self._clipboard_manager.get_recent_items(limit)
+        ])
+
+    def _cmd_get(self, id: str) -> Dict[str, Any]:
+        def get():
+            item = self._require_item(id)
+            summary = _item_summary(item, None)
+            summary['content'] = item.content
+            summary['metadata'] = dict(item.metadata)
+            return summary
+        return self._call(get)
+
+    def _cmd_pin(self, id: str, pinned: bool = True) -> Dict[str, Any]:
+        def pin():
+            self._require_item(id)
+            self._clipboard_manager.set_favorite(id, bool(pinned))
+            return {'id': id, 'is_favorite': bool(pinned)}
+        return self._call(pin)
+
+    def _cmd_paste(self, id: str, auto_type: bool = False) -> Dict[str, Any]:
+        """复制到剪贴板；auto_type 为 True 时同时输入到当前激活窗口（在连接线程中输入，不占用界面线程）"""
+        def paste():
+            item = self._require_item(id)
+            self._clipboard_manager.copy_to_clipboard(item)
+            self._clipboard_manager.record_access(item)
+            return item.content
+        content = self._call(paste)
+
+        typed = False
+        if auto_type:
+            from ..utils.auto_type import auto_type_manager
+            typed = auto_type_manager.type_text(content, method="clipboard")
+        return {'id': id, 'copied': True, 'typed': typed}
+
+    def _require_item(self, item_id: str):
+        item = self._clipboard_manager.get_item(item_id)
+        if item is None:
+            raise ValueError(f"项目不存在: {item_id}")
+        return item
+
+
+def _clamp_limit(limit: Any) -> int:
+    """把客户端给出的 limit 限制在 1..MAX_RESULTS，无法转换为整数时报参数错误"""
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"参数错误: limit 必须是整数: {limit!r}")
+    return max(1, min(limit, MAX_RESULTS))
+
+
+def _preview(content: str) -> str:
+    return content[:PREVIEW_CHARS] + "..." if len(content) > PREVIEW_CHARS else content
+
+
+def _item_summary(item, preview: Optional[str]) -> Dict[str, Any]:
+    """列表结果中的项目（不含完整内容）"""
+    summary = {
+        'id': item.id,
+        'content_type': item.content_type,
+        'size_bytes': item.size_bytes,
+        'created_at': item.created_at.isoformat(),
+        'updated_at': item.updated_at.isoformat(),
+        'access_count': item.access_count,
+        'is_favorite': item.is_favorite
+    }
+    if preview is not None:
+        summary['preview'] = preview
+    return summary
+
+
+def _match_summary(match: SearchMatch) -> Dict[str, Any]:
+    summary = _item_summary(match.item, match.snippet)
+    summary['highlight'] = list(match.highlight) if match.highlight else None
+    return summary
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+项目存储模块
+按最近使用顺序保存剪贴板项目，支持 O(1) 淘汰和 O(k) 读取最近项目
+"""
+
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Iterator, List, Optional
+
+
+class RecencyItemStore:
+    """按最近使用排序的项目存储
+
+    内部是以项目ID为键的有序字典，最旧的项目在前、最新的在后：
+    - 添加 / 按ID查找 / 删除 / 提到最新：O(1)
+    - 淘汰最旧项目：O(1)
+    - 读取最近 k 个项目：O(k)
+    """
+
+    def __init__(self):
+        self._items: "OrderedDict[str, Any]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._items
+
+    def get(self, item_id: str) -> Optional[Any]:
+        """根据ID获取项目"""
+        return self._items.get(item_id)
+
+    def add(self, item: Any):
+        """添加项目，作为最新项目"""
+        self._items[item.id] = item
+        self._items.move_to_end(item.id)
+
+    def add_oldest(self, item: Any):
+        """添加项目，作为最旧项目（后台加载的历史排在加载期间新捕获的项目之后）"""
+        self._items[item.id] = item
+        self._items.move_to_end(item.id, last=False)
+
+    def touch(self, item_id: str) -> bool:
+        """将项目提到最新位置"""
+        if item_id not in self._items:
+            return False
+        self._items.move_to_end(item_id)
+        return True
+
+    def remove(self, item_id: str) -> Optional[Any]:
+        """删除项目，返回被删除的项目"""
+        return self._items.pop(item_id, None)
+
+    def pop_oldest(self) -> Optional[Any]:
+        """移除并返回最旧的项目"""
+        if not self._items:
+            return None
+        _, item = self._items.popitem(last=False)
+        return item
+
+    def recent(self, limit: int) -> List[Any]:
+        """获取最近的 limit 个项目（从新到旧）"""
+        return list(islice(reversed(self._items.values()), limit))
+
+    def iter_recent(self) -> Iterator[Any]:
+        """从新到旧遍历项目"""
+        return reversed(self._items.values())
+
+    def keys(self):
+        """项目ID（从旧到新）"""
+        return self._items.keys()
+
+    def values(self):
+        """项目（从旧到新）"""
+        return self._items.values()
+
+    def clear(self):
+        """清空所有项目"""
+        self._items.clear()
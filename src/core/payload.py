@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+大内容处理模块
+为超大剪贴板内容提供分块哈希、硬上限截断和基于前缀的派生数据，
+使捕获一条巨大内容的内存和时间开销有界
+"""
+
+import hashlib
+from typing import Iterator, NamedTuple, Optional, Tuple
+
+# 分块大小（字符）：哈希、计算字节数和分块存储都按此切分
+PAYLOAD_CHUNK_CHARS = 1024 * 1024
+# 超过此长度视为大内容：搜索文本和预览只取前缀
+LARGE_PAYLOAD_CHARS = 1024 * 1024
+# 大内容建立搜索文本时使用的前缀长度（之后的部分在数据库中按不区分 ASCII 大小写匹配，不做全角等规范化）
+SEARCH_PREFIX_CHARS = 1024 * 1024
+# 预览使用的前缀长度
+PREVIEW_PREFIX_CHARS = 4096
+# 默认硬上限（字符），超出部分截断
+DEFAULT_MAX_PAYLOAD_CHARS = 64 * 1024 * 1024
+
+
+def iter_chunks(content: str, chunk_chars: int = PAYLOAD_CHUNK_CHARS) -> Iterator[str]:
+    """按固定字符数切分内容，逐块生成，不复制整段内容"""
+    for start in range(0, len(content), chunk_chars):
+        yield content[start:start + chunk_chars]
+
+
+def hash_and_size(content: str) -> Tuple[str, int]:
+    """分块计算内容的 MD5 和 UTF-8 字节数
+
+    结果与 hashlib.md5(content.encode('utf-8')) 一致，但每次只编码一块，
+    峰值内存为一个分块而不是整段内容的编码副本
+    """
+    digest = hashlib.md5()
+    size = 0
+    for chunk in iter_chunks(content):
+        data = chunk.encode('utf-8')
+        digest.update(data)
+        size += len(data)
+    return digest.hexdigest(), size
+
+
+class ContentFingerprint(NamedTuple):
+    """内容指纹：字符数 + 分块哈希
+
+    用于判断剪贴板内容是否变化，比较为 O(1)，不需要保留上一次内容的完整副本；
+    哈希和字节数在后续处理中复用，不再重新计算
+    """
+    length: int
+    content_hash: str
+    size_bytes: int
+
+
+def fingerprint(content: str) -> ContentFingerprint:
+    """计算内容指纹"""
+    content_hash, size_bytes = hash_and_size(content)
+    return ContentFingerprint(len(content), content_hash, size_bytes)
+
+
+def truncate_payload(content: str, max_chars: int) -> Tuple[str, Optional[int]]:
+    """将内容截断到硬上限
+
+    返回 (内容, 原始长度)，未截断时原始长度为 None
+    """
+    if max_chars <= 0 or len(content) <= max_chars:
+        return content, None
+    return content[:max_chars], len(content)
+
+
+def is_large_payload(content: str) -> bool:
+    """是否为大内容"""
+    return len(content) > LARGE_PAYLOAD_CHARS
+
+
+def search_prefix(content: str) -> str:
+    """建立搜索文本使用的内容（大内容只取前缀）"""
+    if len(content) > SEARCH_PREFIX_CHARS:
+        return content[:SEARCH_PREFIX_CHARS]
+    return content
+
+
+def preview_prefix(content: str, max_chars: int = PREVIEW_PREFIX_CHARS) -> str:
+    """生成预览使用的内容前缀"""
+    if len(content) > max_chars:
+        return content[:max_chars]
+    return content
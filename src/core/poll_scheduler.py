@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+自适应轮询调度模块
+剪贴板刚变化后以最短间隔检查，空闲时按指数退避到最长间隔，
+并统计检测延迟和空闲唤醒次数，便于在响应速度和唤醒开销之间取舍
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+# 统计空闲唤醒次数的时间窗口（秒）
+WAKEUP_WINDOW_SECONDS = 60.0
+
+
+class AdaptivePollScheduler:
+    """自适应轮询间隔
+
+    - 检测到变化：间隔重置为最小值
+    - 一次检查无变化：间隔乘以退避系数，不超过最大值
+    """
+
+    def __init__(self, min_interval: float = 0.1, max_interval: float = 2.0, backoff: float = 2.0):
+        self._lock = threading.Lock()
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._backoff = max(1.0, backoff)
+        self._interval = min_interval
+        self._normalize_bounds()
+
+        # 统计
+        self._started = time.monotonic()
+        self._changes = 0
+        self._idle_wakeups = 0
+        self._recent_idle_wakeups: "deque[float]" = deque()
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    def _normalize_bounds(self):
+        """保证 0 < min <= max，并将当前间隔限制在范围内（调用方需持有锁或在构造中）"""
+        self._min_interval = max(0.001, self._min_interval)
+        self._max_interval = max(self._min_interval, self._max_interval)
+        self._interval = min(max(self._interval, self._min_interval), self._max_interval)
+
+    @property
+    def interval(self) -> float:
+        """下一次等待的间隔（秒）"""
+        with self._lock:
+            return self._interval
+
+    def set_bounds(self, min_interval: float, max_interval: float):
+        """设置间隔范围（秒），立即生效"""
+        with self._lock:
+            self._min_interval = min_interval
+            self._max_interval = max_interval
+            self._interval = min_interval
+            self._normalize_bounds()
+
+    def on_change(self, latency: Optional[float] = None):
+        """检测到变化，latency 为变化发生到被检测到的时间（秒）"""
+        with self._lock:
+            self._interval = self._min_interval
+            self._changes += 1
+            if latency is not None:
+                self._latency_total += latency
+                self._latency_max = max(self._latency_max, latency)
+
+    def on_idle(self):
+        """一次检查没有变化"""
+        now = time.monotonic()
+        with self._lock:
+            self._interval = min(self._interval * self._backoff, self._max_interval)
+            self._idle_wakeups += 1
+            self._recent_idle_wakeups.append(now)
+            self._trim_window(now)
+
+    def _trim_window(self, now: float):
+        """丢弃时间窗口之外的唤醒记录（调用方需持有锁）"""
+        cutoff = now - WAKEUP_WINDOW_SECONDS
+        while self._recent_idle_wakeups and self._recent_idle_wakeups[0] < cutoff:
+            self._recent_idle_wakeups.popleft()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取调度统计信息"""
+        now = time.monotonic()
+        with self._lock:
+            self._trim_window(now)
+            window = min(WAKEUP_WINDOW_SECONDS, now - self._started) or 1.0
+            return {
+                'interval_ms': self._interval * 1000,
+                'min_interval_ms': self._min_interval * 1000,
+                'max_interval_ms': self._max_interval * 1000,
+                'changes': self._changes,
+                'idle_wakeups': self._idle_wakeups,
+                'idle_wakeups_per_minute': len(self._recent_idle_wakeups) * 60.0 / window,
+                'avg_latency_ms': self._latency_total / self._changes * 1000 if self._changes else 0.0,
+                'max_latency_ms': self._latency_max * 1000
+            }
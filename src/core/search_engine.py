@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+搜索引擎模块
+提供搜索文本规范化、匹配位置与摘要片段的计算，以及在独立工作进程中执行的正则搜索
+"""
+
+import queue
+import re
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+# 工作进程内缓存的已编译正则数量上限
+_MAX_COMPILED_PATTERNS = 32
+
+# 摘要片段默认长度（与卡片预览长度一致）
+SNIPPET_WIDTH = 60
+
+_WHITESPACE_RE = re.compile(r'\s+')
+# 连续的非空白 ASCII 字符：规范化前后逐个对应
+_ASCII_RUN_RE = re.compile(r'[^\s\x80-\U0010ffff]+')
+
+
+def normalize_for_search(text: str) -> str:
+    """生成用于搜索比较的规范化文本
+
+    大小写折叠、全角/半角统一（NFKC）、连续空白合并为一个空格。
+    结果与原文相同时直接返回原字符串，不额外占用内存。
+    """
+    if text.isascii():
+        normalized = text.lower()
+    else:
+        normalized = unicodedata.normalize('NFKC', text).casefold()
+    normalized = _WHITESPACE_RE.sub(' ', normalized)
+    return text if normalized == text else normalized
+
+
+def _normalized_length(text: str) -> int:
+    """一段非空白文本规范化后的长度"""
+    if text.isascii():
+        return len(text)
+    return len(unicodedata.normalize('NFKC', text).casefold())
+
+
+def _composed_run_end(content: str, index: int) -> int:
+    """从 index 开始的组合序列的结束位置
+
+    基字符连同其后的组合字符（如 "e\u0301"）、以及 NFKC 会合成为一个字符的序列（如韩文字母）
+    作为整体处理，逐个字符规范化会让后续位置整体偏移
+    """
+    end = index + 1
+    length = len(content)
+    while end < length and not content[end].isascii() and not content[end].isspace():
+        char = content[end]
+        # 规范化后以组合字符开头的（如半角浊点 "ﾟ"）同样附着在前一个字符上
+        if not unicodedata.combining(unicodedata.normalize('NFKC', char)[:1] or char):
+            run = content[index:end]
+            combined = _normalized_length(run + char)
+            if combined == _normalized_length(run) + _normalized_length(char):
+                break
+        end += 1
+    return end
+
+
+def map_normalized_span(content: str, start: int, end: int) -> Tuple[int, int]:
+    """将规范化文本中的位置映射回原始内容中的位置
+
+    按组合序列推进，命中落在某个序列内部时扩展到整个序列；
+    只对返回给界面的少量结果调用，耗时与命中位置成正比
+    """
+    position = 0  # 规范化文本中的位置
+    original_start = None
+    index = 0
+    length = len(content)
+
+    while index < length and position < end:
+        if content[index].isspace():
+            # 连续空白在规范化文本中只占一个空格
+            run_end = index
+            while run_end < length and content[run_end].isspace():
+                run_end += 1
+            run_length = 1
+        elif content[index].isascii() and (index + 1 == length or content[index + 1].isascii()):
+            # 整段 ASCII 一次推进；最后一个字符后面是非 ASCII 时可能带组合字符，留给下一轮
+            run_end = _ASCII_RUN_RE.match(content, index).end()
+            if run_end < length and not content[run_end].isascii() and run_end - 1 > index:
+                run_end -= 1
+            run_end = min(run_end, index + end - position)
+            run_length = run_end - index
+            if original_start is None and position + run_length > start:
+                original_start = index + max(0, start - position)
+        else:
+            run_end = _composed_run_end(content, index)
+            run_length = _normalized_length(content[index:run_end])
+
+        if original_start is None and position + run_length > start:
+            original_start = index
+        position += run_length
+        index = run_end
+
+    if original_start is None:
+        original_start = min(index, length)
+    return original_start, max(original_start, index)
+
+
+@dataclass
+class SearchMatch:
+    """单个搜索命中
+
+    offsets 为命中在原始内容中的 (起, 止) 位置；
+    snippet 为围绕首个命中截取的片段，highlight 为命中在片段中的位置
+    """
+    item: Any
+    offsets: List[Tuple[int, int]] = field(default_factory=list)
+    snippet: str = ""
+    highlight: Optional[Tuple[int, int]] = None
+
+    @property
+    def item_id(self) -> str:
+        return self.item.id
+
+
+def build_snippet(content: str, start: int, end: int,
+                  width: int = SNIPPET_WIDTH) -> Tuple[str, Tuple[int, int]]:
+    """围绕命中位置截取摘要片段
+
+    Returns:
+        (片段, 命中在片段中的位置)
+    """
+    match_length = end - start
+    if len(content) <= width:
+        return content, (start, end)
+
+    # 命中前保留约三分之一的上下文
+    context = max(0, (width - match_length) // 3)
+    window_start = max(0, start - context)
+    window_end = min(len(content), max(end, window_start + width))
+    window_start = max(0, min(window_start, window_end - width))
+
+    prefix = "..." if window_start > 0 else ""
+    suffix = "..." if window_end < len(content) else ""
+    snippet = prefix + content[window_start:window_end] + suffix
+
+    highlight_start = len(prefix) + start - window_start
+    return snippet, (highlight_start, highlight_start + match_length)
+
+
+def make_match(item: Any, offsets: List[Tuple[int, int]],
+               width: int = SNIPPET_WIDTH) -> SearchMatch:
+    """根据命中位置构建搜索结果"""
+    content = item.content
+    if not offsets:
+        snippet = content[:width] + "..." if len(content) > width else content
+        return SearchMatch(item=item, snippet=snippet)
+
+    start, end = offsets[0]
+    snippet, highlight = build_snippet(content, start, end, width)
+    return SearchMatch(item=item, offsets=offsets, snippet=snippet, highlight=highlight)
+
+
+def _regex_worker(task_queue, result_queue):
+    """正则搜索工作进程入口
+
+    循环处理分块任务，同一模式编译后在后续分块中复用
+    """
+    compiled: Dict[Tuple[str, int], "re.Pattern"] = {}
+
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+
+        run_id, chunk_index, pattern, flags, chunk = task
+        try:
+            regex = compiled.get((pattern, flags))
+            if regex is None:
+                if len(compiled) >= _MAX_COMPILED_PATTERNS:
+                    compiled.clear()
+                regex = re.compile(pattern, flags)
+                compiled[(pattern, flags)] = regex
+
+            matches = []
+            for item_id, content in chunk:
+                match = regex.search(content)
+                if match:
+                    matches.append((item_id, match.start(), match.end()))
+            result_queue.put((run_id, chunk_index, matches, None))
+
+        except Exception as e:
+            result_queue.put((run_id, chunk_index, [], str(e)))
+
+
+@dataclass
+class RegexSearchResult:
+    """正则搜索结果，matches 为 (项目ID, 起, 止) 列表"""
+    matches: List[Tuple[str, int, int]] = field(default_factory=list)
+    timed_out: bool = False
+    cancelled: bool = False
+    scanned: int = 0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+
+class RegexSearchEngine:
+    """正则搜索引擎
+
+    - 在进程池中执行匹配，每次搜索有硬性超时，超时后直接终止工作进程
+    - 内容按分块下发，匹配结果按原始顺序逐块回传
+    - 同一时间只执行一个搜索，新搜索可通过 cancel() 打断旧搜索
+    """
+
+    def __init__(self, workers: int = 2, chunk_size: int = 2000, timeout: float = 2.0):
+        self._workers = max(1, workers)
+        self._chunk_size = max(1, chunk_size)
+        self._timeout = timeout
+        # 延迟导入：只使用数据模型和规范化函数的模块（如数据库、命令行工具）不必加载 multiprocessing
+        import multiprocessing
+        self._context = multiprocessing.get_context('spawn')
+        self._processes: List[Any] = []
+        self._task_queue = None
+        self._result_queue = None
+        self._run_id = 0
+        self._cancelled_run_id = 0
+        self._search_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+
+    @property
+    def timeout(self) -> float:
+        """单次搜索超时（秒）"""
+        return self._timeout
+
+    def set_timeout(self, timeout: float):
+        """设置单次搜索超时（秒）"""
+        self._timeout = timeout
+
+    def cancel(self):
+        """取消当前正在执行的搜索"""
+        with self._state_lock:
+            self._cancelled_run_id = self._run_id
+
+    def search(self, pattern: str, items: Sequence[Tuple[str, str]], limit: int = 50,
+               flags: int = re.IGNORECASE, timeout: Optional[float] = None,
+               on_chunk: Optional[Callable[[List[Tuple[str, int, int]]], None]] = None) -> RegexSearchResult:
+        """执行正则搜索
+
+        Args:
+            pattern: 正则表达式
+            items: (项目ID, 内容) 序列，结果按该顺序返回
+            limit: 最大结果数
+            flags: 正则标志
+            timeout: 超时时间（秒），None 使用默认值
+            on_chunk: 每得到一批有序匹配结果时的回调
+
+        Raises:
+            re.error: 正则表达式无效
+        """
+        # 先在当前进程校验语法，编译本身不会回溯
+        re.compile(pattern, flags)
+
+        with self._search_lock:
+            with self._state_lock:
+                self._run_id += 1
+                run_id = self._run_id
+
+            return self._run_search(run_id, pattern, flags, items, limit,
+                                    self._timeout if timeout is None else timeout, on_chunk)
+
+    def _run_search(self, run_id, pattern, flags, items, limit, timeout, on_chunk) -> RegexSearchResult:
+        """分块下发任务并按顺序收集结果"""
+        result = RegexSearchResult()
+        start_time = time.monotonic()
+        deadline = start_time + timeout
+
+        chunks = [items[i:i + self._chunk_size] for i in range(0, len(items), self._chunk_size)]
+        if not chunks:
+            return result
+
+        self._ensure_workers()
+
+        max_in_flight = self._workers * 2
+        next_to_send = 0
+        next_to_emit = 0
+        pending: Dict[int, List[Tuple[str, int, int]]] = {}
+
+        while next_to_emit < len(chunks) and len(result.matches) < limit:
+            # 保持有限数量的分块在途，避免一次性把全部内容塞进管道
+            while next_to_send < len(chunks) and next_to_send - next_to_emit < max_in_flight:
+                self._task_queue.put((run_id, next_to_send, pattern, flags, chunks[next_to_send]))
+                next_to_send += 1
+
+            if self._cancelled_run_id >= run_id:
+                result.cancelled = True
+                break
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                result.timed_out = True
+                break
+
+            try:
+                # 分段等待，以便及时响应取消
+                message = self._result_queue.get(timeout=min(remaining, 0.05))
+            except queue.Empty:
+                continue
+
+            message_run_id, chunk_index, matches, error = message
+            if message_run_id != run_id:
+                continue  # 之前搜索遗留的结果
+            if error:
+                result.error = error
+                break
+
+            pending[chunk_index] = matches
+            while next_to_emit in pending:
+                ordered = pending.pop(next_to_emit)
+                result.scanned += len(chunks[next_to_emit])
+                next_to_emit += 1
+
+                ordered = ordered[:limit - len(result.matches)]
+                if ordered:
+                    result.matches.extend(ordered)
+                    if on_chunk:
+                        on_chunk(ordered)
+
+        if result.timed_out:
+            # 工作进程可能卡在回溯中，只能强制终止，下次搜索时重建
+            print(f"⚠️ 正则搜索超时（{timeout} 秒），终止搜索进程")
+            self._terminate_workers()
+        else:
+            self._drain_tasks()
+
+        result.elapsed = time.monotonic() - start_time
+        return result
+
+    def _ensure_workers(self):
+        """确保工作进程已启动"""
+        if self._processes and all(process.is_alive() for process in self._processes):
+            return
+
+        self._terminate_workers()
+        self._task_queue = self._context.Queue()
+        self._result_queue = self._context.Queue()
+        for _ in range(self._workers):
+            process = self._context.Process(
+                target=_regex_worker,
+                args=(self._task_queue, self._result_queue),
+                daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+
+    def _drain_tasks(self):
+        """丢弃尚未被领取的旧任务"""
+        if self._task_queue is None:
+            return
+        try:
+            while True:
+                self._task_queue.get_nowait()
+        except (queue.Empty, OSError, ValueError):
+            pass
+
+    def _terminate_workers(self):
+        """终止全部工作进程"""
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+            process.join(timeout=1.0)
+        self._processes = []
+
+        for q in (self._task_queue, self._result_queue):
+            if q is not None:
+                q.close()
+                q.cancel_join_thread()
+        self._task_queue = None
+        self._result_queue = None
+
+    def shutdown(self):
+        """关闭搜索引擎"""
+        self.cancel()
+        with self._search_lock:
+            if self._task_queue is not None:
+                for _ in self._processes:
+                    self._task_queue.put(None)
+                for process in self._processes:
+                    process.join(timeout=1.0)
+            self._terminate_workers()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Paste for Windows - 无界面守护模式
+只运行剪贴板捕获和存储（ClipboardManager + DatabaseManager），基于 QCoreApplication，
+不创建窗口、底部面板和系统托盘，适用于自助终端镜像和测试环境
+
+用法: python run.py --headless
+"""
+
+import multiprocessing
+import signal
+import sys
+import time
+from pathlib import Path
+
+from PyQt6.QtCore import QCoreApplication, QTimer
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.clipboard_manager import ClipboardManager
+from src.core.config_manager import ConfigManager
+from src.data.database import DatabaseManager
+
+
+def setup_clipboard_manager(config_manager: ConfigManager, database_manager: DatabaseManager,
+                            backend=None, load_history: bool = True) -> ClipboardManager:
+    """按配置创建剪贴板管理器并加载历史项目（不启动监听）
+
+    界面模式和守护模式共用；load_history 为 False 时由调用方稍后加载（如界面模式在后台加载）
+    """
+    clipboard_manager = ClipboardManager(backend=backend)
+
+    # 设置剪贴板管理器与数据库管理器的关联
+    clipboard_manager.set_database_manager(database_manager)
+    clipboard_manager.set_regex_search_timeout(
+        config_manager.get('regex_search_timeout')
+    )
+    clipboard_manager.set_page_cache_size(
+        config_manager.get('content_page_cache_mb') * 1024 * 1024
+    )
+    clipboard_manager.set_memory_budget(
+        config_manager.get('history_memory_budget_mb') * 1024 * 1024
+    )
+    clipboard_manager.set_max_payload_chars(
+        config_manager.get('max_payload_mb') * 1024 * 1024
+    )
+    clipboard_manager.set_format_capture_budget(
+        config_manager.get('format_capture_budget_kb') * 1024
+    )
+    apply_check_interval(clipboard_manager, config_manager)
+    clipboard_manager.configure_capture_log(
+        config_manager.get('capture_log_enabled'),
+        config_manager.get('capture_log_max_kb') * 1024,
+        config_manager.get('capture_log_backup_count'),
+        config_manager.get('capture_log_rotate_hours') * 3600
+    )
+    clipboard_manager.configure_trace_recording(
+        config_manager.get('trace_recording_enabled'),
+        config_manager.get('trace_scramble_content')
+    )
+
+    # 从数据库加载历史项目
+    if load_history:
+        clipboard_manager.load_from_database()
+    return clipboard_manager
+
+
+def start_ipc_server(clipboard_manager: ClipboardManager, config_manager: ConfigManager):
+    """按配置启动本地 IPC 服务，未开启或启动失败时返回 None"""
+    if not config_manager.get('ipc_server_enabled'):
+        return None
+    # 延迟导入：IPC 服务（及 multiprocessing.connection）在托盘出现后才需要
+    from src.core.ipc_server import IpcServer
+    ipc_server = IpcServer(clipboard_manager)
+    return ipc_server if ipc_server.start() else None
+
+
+def apply_check_interval(clipboard_manager: ClipboardManager, config_manager: ConfigManager):
+    """应用剪贴板检查间隔范围"""
+    clipboard_manager.set_check_interval(
+        config_manager.get('clipboard_check_interval'),
+        config_manager.get('clipboard_check_interval_max')
+    )
+
+
+class HeadlessDaemon:
+    """无界面守护进程：捕获剪贴板并保存到数据库"""
+
+    # 检查退出信号的间隔（毫秒）：Qt 事件循环运行时 Python 只在解释器获得控制权时处理信号
+    SIGNAL_CHECK_INTERVAL_MS = 200
+
+    def __init__(self):
+        self.app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+        self.app.setApplicationName("Paste for Windows")
+        self.app.setApplicationVersion("1.0.0")
+        self.app.setOrganizationName("PasteForWindows")
+
+        self.config_manager = None
+        self.database_manager = None
+        self.clipboard_manager = None
+        self.ipc_server = None
+        self.startup_seconds = 0.0
+        self._signal_timer = None
+
+    def start(self):
+        """创建组件并开始监听"""
+        started = time.perf_counter()
+        self.config_manager = ConfigManager()
+        self.database_manager = DatabaseManager()
+        self.clipboard_manager = setup_clipboard_manager(self.config_manager, self.database_manager)
+        self.clipboard_manager.error_occurred.connect(lambda message: print(f"❌ {message}"))
+        self.config_manager.config_changed.connect(self._on_config_changed)
+        self.clipboard_manager.start()
+        self.ipc_server = start_ipc_server(self.clipboard_manager, self.config_manager)
+        self.startup_seconds = time.perf_counter() - started
+        print(f"✅ 守护模式已启动（{self.startup_seconds * 1000:.0f} ms），"
+              f"已加载 {len(self.clipboard_manager.get_all_items())} 个项目")
+
+    def run(self) -> int:
+        """运行事件循环，收到 Ctrl+C 或 SIGTERM 时退出"""
+        try:
+            self.start()
+        except Exception as e:
+            print(f"守护模式启动失败: {e}")
+            return 1
+
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: self.app.quit())
+        self._signal_timer = QTimer()
+        self._signal_timer.timeout.connect(lambda: None)
+        self._signal_timer.start(self.SIGNAL_CHECK_INTERVAL_MS)
+
+        return self.app.exec()
+
+    def _on_config_changed(self, key: str, value):
+        """配置项变化"""
+        if key in ('clipboard_check_interval', 'clipboard_check_interval_max'):
+            apply_check_interval(self.clipboard_manager, self.config_manager)
+
+    def cleanup(self):
+        """清理资源"""
+        if self._signal_timer:
+            self._signal_timer.stop()
+        if self.ipc_server:
+            self.ipc_server.stop()
+            self.ipc_server = None
+        if self.clipboard_manager:
+            self.clipboard_manager.shutdown()
+            self.clipboard_manager = None
+        if self.database_manager:
+            self.database_manager.close()
+            self.database_manager = None
+
+
+def main():
+    """守护模式主函数"""
+    # 正则搜索使用独立进程，打包后需要支持子进程启动
+    multiprocessing.freeze_support()
+
+    print("✅ 守护模式启动中...")
+
+    daemon = HeadlessDaemon()
+    try:
+        exit_code = daemon.run()
+    except KeyboardInterrupt:
+        exit_code = 0
+    except Exception as e:
+        print(f"守护模式异常退出: {e}")
+        exit_code = 1
+    finally:
+        daemon.cleanup()
+        print("✅ 守护模式已退出")
+
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
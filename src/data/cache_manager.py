@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+缓存管理模块
+为高频查询提供有界的 LRU 结果缓存，并为换出到数据库的项目内容提供按需读取的 LRU 缓存
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+
+class _QueryCacheEntry:
+    """单条缓存记录"""
+
+    __slots__ = ('results', 'item_ids', 'matcher', 'update_sensitive')
+
+    def __init__(self, results: List[Any], item_ids: Iterable[str],
+                 matcher: Callable[[Any], bool], update_sensitive: bool):
+        self.results = results
+        self.item_ids = frozenset(item_ids)
+        self.matcher = matcher
+        self.update_sensitive = update_sensitive
+
+
+class QueryCache:
+    """查询结果 LRU 缓存
+
+    每条记录保存结果列表以及一个匹配函数，项目变化时只失效
+    可能受其影响的记录：
+    - 新增：匹配函数命中新项目的记录
+    - 更新：结果顺序依赖访问时间且匹配该项目的记录
+    - 删除：结果中包含该项目的记录
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self._entries: "OrderedDict[Hashable, _QueryCacheEntry]" = OrderedDict()
+        self._max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+
+        # 统计计数
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[List[Any]]:
+        """读取缓存结果，未命中返回 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry.results)
+
+    def put(self, key: Hashable, results: List[Any], matcher: Callable[[Any], bool],
+            update_sensitive: bool = False, item_ids: Optional[Iterable[str]] = None):
+        """写入缓存结果
+
+        item_ids 为结果涉及的项目ID，省略时取各结果的 id 属性
+        """
+        if item_ids is None:
+            item_ids = [result.id for result in results]
+
+        with self._lock:
+            self._entries[key] = _QueryCacheEntry(list(results), item_ids, matcher, update_sensitive)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def on_item_added(self, item):
+        """新项目添加后失效相关记录"""
+        self._invalidate_where(lambda entry: entry.matcher(item))
+
+    def on_item_updated(self, item):
+        """项目更新后失效相关记录"""
+        self._invalidate_where(
+            lambda entry: entry.update_sensitive and entry.matcher(item)
+        )
+
+    def on_item_removed(self, item_id: str):
+        """项目删除后失效相关记录"""
+        self._invalidate_where(lambda entry: item_id in entry.item_ids)
+
+    def _invalidate_where(self, predicate: Callable[[_QueryCacheEntry], bool]):
+        """失效满足条件的记录"""
+        with self._lock:
+            stale_keys = [key for key, entry in self._entries.items() if predicate(entry)]
+            for key in stale_keys:
+                del self._entries[key]
+            self.invalidations += len(stale_keys)
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def set_max_entries(self, max_entries: int):
+        """设置最大缓存条数"""
+        with self._lock:
+            self._max_entries = max(1, max_entries)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self._max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+
+class ContentPager:
+    """已换出内容的分页器
+
+    项目超出内存预算后只在内存中保留头部信息，内容留在数据库中。
+    访问内容时经由分页器从数据库读取，最近读取的内容按字节数保存在有界 LRU 中
+    """
+
+    def __init__(self, database_manager, max_bytes: int = 32 * 1024 * 1024):
+        self._database_manager = database_manager
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._max_bytes = max(0, max_bytes)
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+
+        # 统计计数
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def load(self, item) -> str:
+        """读取项目内容，优先使用缓存"""
+        with self._lock:
+            content = self._entries.get(item.id)
+            if content is not None:
+                self._entries.move_to_end(item.id)
+                self.hits += 1
+                return content
+            self.misses += 1
+
+        content = self.read_through(item)
+
+        with self._lock:
+            if item.size_bytes <= self._max_bytes and item.id not in self._entries:
+                self._entries[item.id] = content
+                self._sizes[item.id] = item.size_bytes
+                self._cached_bytes += item.size_bytes
+                self._evict_over_budget()
+        return content
+
+    def read_through(self, item) -> str:
+        """直接从数据库读取内容，不写入缓存（用于批量扫描）"""
+        with self._lock:
+            content = self._entries.get(item.id)
+        if content is None:
+            content = self._database_manager.get_item_content(item.id)
+        return content or ""
+
+    def discard(self, item_id: str):
+        """丢弃项目的缓存内容"""
+        with self._lock:
+            if self._entries.pop(item_id, None) is not None:
+                self._cached_bytes -= self._sizes.pop(item_id)
+
+    def _evict_over_budget(self):
+        """淘汰最久未用的内容直到不超过上限（调用方需持有锁）"""
+        while self._cached_bytes > self._max_bytes and self._entries:
+            item_id, _ = self._entries.popitem(last=False)
+            self._cached_bytes -= self._sizes.pop(item_id)
+            self.evictions += 1
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._cached_bytes = 0
+
+    def set_max_bytes(self, max_bytes: int):
+        """设置缓存字节上限"""
+        with self._lock:
+            self._max_bytes = max(0, max_bytes)
+            self._evict_over_budget()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取分页统计信息"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'cached_bytes': self._cached_bytes,
+                'max_bytes': self._max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions
+            }
@@ -6,35 +6,56 @@
 """
 
 import sqlite3
+import functools
+import hashlib
 import json
+import threading
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set
 from pathlib import Path
 
-from ..core.clipboard_manager import ClipboardItem
+from .models import ClipboardItem
+from ..core.payload import PAYLOAD_CHUNK_CHARS, iter_chunks
+from ..utils.app_paths import get_app_data_dir
+
+
+def _synchronized(method):
+    """在连接锁内执行方法（连接由界面线程和捕获流水线的持久化线程共享）"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
 
 class DatabaseManager:
-    """数据库管理器"""
+    """数据库管理器
+    
+    连接可在多个线程间共享，所有公开方法都在同一把锁内执行
+    """
     
     def __init__(self, db_path: str = None):
         if db_path is None:
             # 默认数据库路径
-            app_data_dir = Path.home() / "AppData" / "Local" / "PasteForWindows"
-            app_data_dir.mkdir(parents=True, exist_ok=True)
-            db_path = app_data_dir / "clipboard.db"
+            db_path = get_app_data_dir() / "clipboard.db"
         
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._connection = None
+        self._lock = threading.RLock()
         self._init_database()
     
     def _init_database(self):
         """初始化数据库"""
         try:
-            self._connection = sqlite3.connect(str(self.db_path))
+            self._connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
             self._connection.row_factory = sqlite3.Row  # 使结果可以通过列名访问
             
+            # WAL 模式：命令行工具等只读连接可以在程序写入的同时读取，互不阻塞；
+            # WAL 下 synchronous=NORMAL 断电最多丢失最近的事务，不会损坏数据库
+            self._connection.execute("PRAGMA journal_mode = WAL")
+            self._connection.execute("PRAGMA synchronous = NORMAL")
+            
             # 创建表
             self._create_tables()
             
@@ -62,9 +83,57 @@ class DatabaseManager:
                 access_count INTEGER DEFAULT 0,
                 is_favorite BOOLEAN DEFAULT FALSE,
                 tags TEXT DEFAULT '',
-                metadata TEXT DEFAULT '{}'
+                metadata TEXT DEFAULT '{}',
+                content_hash TEXT NOT NULL DEFAULT '',
+                is_chunked BOOLEAN NOT NULL DEFAULT FALSE,
+                size_bytes INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        
+        # 旧版本数据库补充内容哈希列和分块存储列
+        self._migrate_content_hash(cursor)
+        self._migrate_chunk_columns(cursor)
+        
+        # 大内容分块表：content 列保存第一块，其余块按顺序保存在这里
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS content_chunks (
+                item_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                FOREIGN KEY (item_id) REFERENCES clipboard_items(id) ON DELETE CASCADE,
+                PRIMARY KEY (item_id, seq)
+            )
+        """)
+        
+        # 附加格式数据按哈希去重存储，多个项目的相同格式数据只存一份
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS format_blobs (
+                hash TEXT PRIMARY KEY,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        
+        # 项目附加格式：格式名 -> 数据哈希
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS item_formats (
+                item_id TEXT NOT NULL,
+                format TEXT NOT NULL,
+                blob_hash TEXT NOT NULL,
+                FOREIGN KEY (item_id) REFERENCES clipboard_items(id) ON DELETE CASCADE,
+                PRIMARY KEY (item_id, format)
             )
         """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_item_formats_blob_hash
+            ON item_formats (blob_hash)
+        """)
+        
+        # 内容哈希索引，用于去重查找
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_clipboard_items_content_hash
+            ON clipboard_items (content_hash)
+        """)
         
         # 标签表
         cursor.execute("""
@@ -112,27 +181,82 @@ class DatabaseManager:
         
         self._connection.commit()
     
+    def _migrate_content_hash(self, cursor):
+        """为旧数据库添加 content_hash 列并回填"""
+        cursor.execute("PRAGMA table_info(clipboard_items)")
+        columns = {row['name'] for row in cursor.fetchall()}
+        if 'content_hash' in columns:
+            return
+        
+        cursor.execute("ALTER TABLE clipboard_items ADD COLUMN content_hash TEXT NOT NULL DEFAULT ''")
+        
+        cursor.execute("SELECT id, content FROM clipboard_items")
+        updates = [
+            (ClipboardItem.compute_hash(row['content']), row['id'])
+            for row in cursor.fetchall()
+        ]
+        cursor.executemany("UPDATE clipboard_items SET content_hash = ? WHERE id = ?", updates)
+        print(f"数据库迁移完成: 为 {len(updates)} 个项目补充内容哈希")
+    
+    def _migrate_chunk_columns(self, cursor):
+        """为旧数据库添加分块标记和字节数列"""
+        cursor.execute("PRAGMA table_info(clipboard_items)")
+        columns = {row['name'] for row in cursor.fetchall()}
+        
+        if 'is_chunked' not in columns:
+            cursor.execute("ALTER TABLE clipboard_items ADD COLUMN is_chunked BOOLEAN NOT NULL DEFAULT FALSE")
+        if 'size_bytes' not in columns:
+            cursor.execute("ALTER TABLE clipboard_items ADD COLUMN size_bytes INTEGER NOT NULL DEFAULT 0")
+            cursor.execute("UPDATE clipboard_items SET size_bytes = length(CAST(content AS BLOB))")
+    
+    @_synchronized
     def save_item(self, item: ClipboardItem) -> bool:
-        """保存剪贴板项目"""
+        """保存剪贴板项目
+        
+        超过一个分块的内容分块写入 content_chunks，逐块绑定参数，不生成整段副本；
+        使用 UPSERT 而不是 REPLACE，避免级联删除项目已保存的附加格式
+        """
         try:
             cursor = self._connection.cursor()
+            content = item.content
+            is_chunked = len(content) > PAYLOAD_CHUNK_CHARS
             
+            cursor.execute("DELETE FROM content_chunks WHERE item_id = ?", (item.id,))
             cursor.execute("""
-                INSERT OR REPLACE INTO clipboard_items 
-                (id, content, content_type, created_at, updated_at, access_count, is_favorite, tags, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO clipboard_items 
+                (id, content, content_type, created_at, updated_at, access_count, is_favorite, tags, metadata,
+                 content_hash, is_chunked, size_bytes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    content = excluded.content, content_type = excluded.content_type,
+                    created_at = excluded.created_at, updated_at = excluded.updated_at,
+                    access_count = excluded.access_count, is_favorite = excluded.is_favorite,
+                    tags = excluded.tags, metadata = excluded.metadata,
+                    content_hash = excluded.content_hash, is_chunked = excluded.is_chunked,
+                    size_bytes = excluded.size_bytes
             """, (
                 item.id,
-                item.content,
+                content[:PAYLOAD_CHUNK_CHARS] if is_chunked else content,
                 item.content_type,
                 item.created_at.isoformat(),
                 item.updated_at.isoformat(),
                 item.access_count,
                 item.is_favorite,
                 item.tags,
-                json.dumps(item.metadata)
+                json.dumps(dict(item.metadata)),
+                item.content_hash,
+                is_chunked,
+                item.size_bytes
             ))
             
+            if is_chunked:
+                chunks = iter_chunks(content)
+                next(chunks)  # 第一块已写入 content 列
+                cursor.executemany(
+                    "INSERT INTO content_chunks (item_id, seq, data) VALUES (?, ?, ?)",
+                    ((item.id, seq, chunk) for seq, chunk in enumerate(chunks, 1))
+                )
+            
             self._connection.commit()
             return True
             
@@ -140,6 +264,7 @@ class DatabaseManager:
             print(f"保存项目失败: {e}")
             return False
     
+    @_synchronized
     def get_item(self, item_id: str) -> Optional[ClipboardItem]:
         """获取指定项目"""
         try:
@@ -158,6 +283,81 @@ class DatabaseManager:
             print(f"获取项目失败: {e}")
             return None
     
+    @_synchronized
+    def get_item_content(self, item_id: str) -> Optional[str]:
+        """只读取项目内容（用于按需加载已换出的内容）"""
+        try:
+            cursor = self._connection.cursor()
+            
+            cursor.execute("SELECT content, is_chunked FROM clipboard_items WHERE id = ?", (item_id,))
+            
+            row = cursor.fetchone()
+            if row:
+                return self._assemble_content(item_id, row['content'], row['is_chunked'])
+            return None
+            
+        except Exception as e:
+            print(f"读取项目内容失败: {e}")
+            return None
+    
+    @_synchronized
+    def save_item_formats(self, item_id: str, formats: Dict[str, bytes]) -> bool:
+        """保存项目的附加格式数据，相同数据只存一份"""
+        if not formats:
+            return True
+        try:
+            cursor = self._connection.cursor()
+            
+            mappings = []
+            for name, data in formats.items():
+                blob_hash = hashlib.md5(data).hexdigest()
+                cursor.execute(
+                    "INSERT OR IGNORE INTO format_blobs (hash, data, size) VALUES (?, ?, ?)",
+                    (blob_hash, data, len(data))
+                )
+                mappings.append((item_id, name, blob_hash))
+            cursor.executemany(
+                "INSERT OR REPLACE INTO item_formats (item_id, format, blob_hash) VALUES (?, ?, ?)",
+                mappings
+            )
+            
+            self._connection.commit()
+            return True
+            
+        except Exception as e:
+            print(f"保存附加格式失败: {e}")
+            return False
+    
+    @_synchronized
+    def get_item_formats(self, item_id: str, names: Optional[List[str]] = None) -> Dict[str, bytes]:
+        """读取项目已保存的附加格式数据，names 为 None 时读取全部"""
+        try:
+            cursor = self._connection.cursor()
+            
+            cursor.execute("""
+                SELECT f.format, b.data FROM item_formats f
+                JOIN format_blobs b ON b.hash = f.blob_hash
+                WHERE f.item_id = ?
+            """, (item_id,))
+            
+            return {
+                row['format']: bytes(row['data'])
+                for row in cursor.fetchall()
+                if names is None or row['format'] in names
+            }
+            
+        except Exception as e:
+            print(f"读取附加格式失败: {e}")
+            return {}
+    
+    def _delete_orphan_blobs(self, cursor):
+        """删除不再被任何项目引用的格式数据"""
+        cursor.execute("""
+            DELETE FROM format_blobs
+            WHERE hash NOT IN (SELECT blob_hash FROM item_formats)
+        """)
+    
+    @_synchronized
     def get_all_items(self, limit: int = None, offset: int = 0) -> List[ClipboardItem]:
         """获取所有项目"""
         try:
@@ -182,10 +382,47 @@ class DatabaseManager:
             print(f"获取所有项目失败: {e}")
             return []
     
+    @_synchronized
     def get_recent_items(self, limit: int = 50) -> List[ClipboardItem]:
         """获取最近的项目"""
         return self.get_all_items(limit=limit)
     
+    @_synchronized
+    def get_recent_items_within_budget(self, limit: int, content_budget: int) -> List[ClipboardItem]:
+        """获取最近的项目，只为最新的、累计大小不超过 content_budget 字节的项目读取内容
+        
+        其余项目只返回头部信息（content 为 None），内容留在数据库中按需读取
+        """
+        try:
+            cursor = self._connection.cursor()
+            
+            cursor.execute("""
+                SELECT id, content_type, created_at, updated_at, access_count, is_favorite,
+                       tags, metadata, content_hash, size_bytes, is_chunked,
+                       CASE WHEN running_bytes <= ? THEN content END AS content
+                FROM (
+                    SELECT *,
+                           SUM(size_bytes) OVER (
+                               ORDER BY updated_at DESC ROWS UNBOUNDED PRECEDING
+                           ) AS running_bytes
+                    FROM clipboard_items
+                    ORDER BY updated_at DESC
+                    LIMIT ?
+                )
+                ORDER BY updated_at DESC
+            """, (content_budget, limit))
+            
+            items = []
+            for row in cursor.fetchall():
+                items.append(self._row_to_item(row))
+            
+            return items
+            
+        except Exception as e:
+            print(f"获取最近项目失败: {e}")
+            return []
+    
+    @_synchronized
     def get_favorite_items(self) -> List[ClipboardItem]:
         """获取收藏的项目"""
         try:
@@ -207,6 +444,7 @@ class DatabaseManager:
             print(f"获取收藏项目失败: {e}")
             return []
     
+    @_synchronized
     def search_items(self, query: str, limit: int = 50) -> List[ClipboardItem]:
         """搜索项目"""
         try:
@@ -229,30 +467,142 @@ class DatabaseManager:
             print(f"搜索项目失败: {e}")
             return []
     
+    @_synchronized
+    def search_item_ids(self, query: str, item_ids: List[str]) -> Set[str]:
+        """在指定项目中查找内容包含 query 的项目ID（不区分 ASCII 大小写）
+        
+        分块存储的大内容逐块匹配，跨越分块边界的命中用相邻两块的首尾拼接检查
+        """
+        if not item_ids:
+            return set()
+        
+        pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        overlap = len(query) - 1  # 跨边界命中在前一块中最多占的字符数
+        boundary_sql = """
+                        OR EXISTS (
+                            SELECT 1 FROM content_chunks c
+                            LEFT JOIN content_chunks prev
+                                ON prev.item_id = c.item_id AND prev.seq = c.seq - 1
+                            WHERE c.item_id = clipboard_items.id
+                              AND substr(COALESCE(prev.data, clipboard_items.content), -?)
+                                  || substr(c.data, 1, ?) LIKE ? ESCAPE '\\'
+                        )""" if overlap > 0 else ""
+        boundary_params = (overlap, overlap, pattern) if overlap > 0 else ()
+        matched = set()
+        try:
+            cursor = self._connection.cursor()
+            
+            # 分批查询，避免超过 SQLite 的参数数量上限
+            batch_size = 500
+            for start in range(0, len(item_ids), batch_size):
+                batch = item_ids[start:start + batch_size]
+                placeholders = ",".join("?" * len(batch))
+                cursor.execute(f"""
+                    SELECT id FROM clipboard_items
+                    WHERE id IN ({placeholders}) AND (
+                        content LIKE ? ESCAPE '\\'
+                        OR (is_chunked AND (
+                            EXISTS (
+                                SELECT 1 FROM content_chunks
+                                WHERE item_id = clipboard_items.id AND data LIKE ? ESCAPE '\\'
+                            ){boundary_sql}
+                        ))
+                    )
+                """, (*batch, pattern, pattern, *boundary_params))
+                matched.update(row['id'] for row in cursor.fetchall())
+            
+            return matched
+            
+        except Exception as e:
+            print(f"搜索项目失败: {e}")
+            return matched
+    
+    @_synchronized
+    def record_capture_hit(self, item_id: str, metadata_updates: Optional[Dict[str, Any]] = None) -> bool:
+        """记录重复捕获：更新时间、访问次数加一并合并元数据，项目不存在时返回 False"""
+        try:
+            cursor = self._connection.cursor()
+            
+            if metadata_updates:
+                cursor.execute("SELECT metadata FROM clipboard_items WHERE id = ?", (item_id,))
+                row = cursor.fetchone()
+                if row is None:
+                    return False
+                metadata = json.loads(row['metadata'] or '{}')
+                metadata.update(metadata_updates)
+                cursor.execute("UPDATE clipboard_items SET metadata = ? WHERE id = ?",
+                               (json.dumps(metadata), item_id))
+            
+            cursor.execute("""
+                UPDATE clipboard_items
+                SET updated_at = ?, access_count = access_count + 1
+                WHERE id = ?
+            """, (datetime.now().isoformat(), item_id))
+            
+            self._connection.commit()
+            return cursor.rowcount > 0
+            
+        except Exception as e:
+            print(f"记录重复捕获失败: {e}")
+            return False
+    
+    @_synchronized
     def update_item(self, item: ClipboardItem) -> bool:
         """更新项目"""
         return self.save_item(item)
     
+    @_synchronized
+    def update_item_state(self, item: ClipboardItem) -> bool:
+        """只更新项目状态字段，不重写内容（内容可能已换出内存）"""
+        try:
+            cursor = self._connection.cursor()
+            
+            cursor.execute("""
+                UPDATE clipboard_items
+                SET updated_at = ?, access_count = ?, is_favorite = ?, tags = ?, metadata = ?
+                WHERE id = ?
+            """, (
+                item.updated_at.isoformat(),
+                item.access_count,
+                item.is_favorite,
+                item.tags,
+                json.dumps(dict(item.metadata)),
+                item.id
+            ))
+            
+            self._connection.commit()
+            return cursor.rowcount > 0
+            
+        except Exception as e:
+            print(f"更新项目状态失败: {e}")
+            return False
+    
+    @_synchronized
     def delete_item(self, item_id: str) -> bool:
         """删除项目"""
         try:
             cursor = self._connection.cursor()
             
             cursor.execute("DELETE FROM clipboard_items WHERE id = ?", (item_id,))
+            deleted = cursor.rowcount > 0
+            if deleted:
+                self._delete_orphan_blobs(cursor)
             
             self._connection.commit()
-            return cursor.rowcount > 0
+            return deleted
             
         except Exception as e:
             print(f"删除项目失败: {e}")
             return False
     
+    @_synchronized
     def clear_all_items(self) -> bool:
         """清空所有项目"""
         try:
             cursor = self._connection.cursor()
             
             cursor.execute("DELETE FROM clipboard_items")
+            cursor.execute("DELETE FROM format_blobs")
             
             self._connection.commit()
             return True
@@ -261,6 +611,7 @@ class DatabaseManager:
             print(f"清空所有项目失败: {e}")
             return False
     
+    @_synchronized
     def get_stats(self) -> Dict[str, Any]:
         """获取统计信息"""
         try:
@@ -301,20 +652,35 @@ class DatabaseManager:
             print(f"获取统计信息失败: {e}")
             return {}
     
+    def _assemble_content(self, item_id: str, first_chunk: Optional[str], is_chunked) -> Optional[str]:
+        """拼接分块存储的内容"""
+        if first_chunk is None or not is_chunked:
+            return first_chunk
+        
+        cursor = self._connection.cursor()
+        cursor.execute("SELECT data FROM content_chunks WHERE item_id = ? ORDER BY seq", (item_id,))
+        chunks = [first_chunk]
+        chunks.extend(row['data'] for row in cursor)
+        return "".join(chunks)
+    
     def _row_to_item(self, row) -> ClipboardItem:
         """将数据库行转换为ClipboardItem对象"""
+        # 只含头部信息的行 content 为 None
         return ClipboardItem(
             id=row['id'],
-            content=row['content'],
+            content=self._assemble_content(row['id'], row['content'], row['is_chunked']),
             content_type=row['content_type'],
             created_at=datetime.fromisoformat(row['created_at']),
             updated_at=datetime.fromisoformat(row['updated_at']),
             access_count=row['access_count'],
             is_favorite=bool(row['is_favorite']),
             tags=row['tags'],
-            metadata=json.loads(row['metadata'])
+            metadata=json.loads(row['metadata']),
+            content_hash=row['content_hash'],
+            size_bytes=row['size_bytes']
         )
     
+    @_synchronized
     def close(self):
         """关闭数据库连接"""
         if self._connection:
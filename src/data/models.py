@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+数据模型
+剪贴板项目和统计快照，只依赖标准库和纯 Python 的内容工具，
+命令行工具和数据库模块导入时不会加载 PyQt6 和 pywin32
+"""
+
+import hashlib
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+
+from ..core.payload import hash_and_size, is_large_payload, search_prefix
+from ..core.search_engine import normalize_for_search
+
+# 空元数据在所有项目间共享，只读以防被意外修改
+_EMPTY_METADATA: Mapping[str, Any] = MappingProxyType({})
+
+
+def _datetime_to_epoch_us(value: datetime) -> int:
+    """将本地时间转换为微秒级时间戳（整数，无精度损失）"""
+    return int(value.replace(microsecond=0).timestamp()) * 1_000_000 + value.microsecond
+
+
+def _epoch_us_to_datetime(value: int) -> datetime:
+    """将微秒级时间戳转换为本地时间"""
+    seconds, microseconds = divmod(value, 1_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=microseconds)
+
+
+class ClipboardItem:
+    """剪贴板项目数据模型
+
+    为常驻内存的大量项目采用紧凑表示：
+    - 使用 __slots__，没有实例字典
+    - 时间以微秒级整数时间戳保存，访问 created_at/updated_at 时再转换为 datetime
+    - content_type 驻留（intern），同类型项目共享同一字符串
+    - 元数据为空时共享同一个只读空映射，修改请使用 update_metadata()
+    - 内容可以换出到数据库，只保留头部信息；换出后访问 content 时通过分页器按需读取
+    """
+    
+    __slots__ = (
+        'id', '_content', 'content_type', '_created_us', '_updated_us', 'access_count',
+        'is_favorite', 'tags', '_metadata', 'content_hash', 'search_text', 'size_bytes', '_pager'
+    )
+    
+    def __init__(self, id: str, content: Optional[str], content_type: str = "text",
+                 created_at: Optional[datetime] = None, updated_at: Optional[datetime] = None,
+                 access_count: int = 0, is_favorite: bool = False, tags: str = "",
+                 metadata: Optional[Dict[str, Any]] = None, content_hash: str = "",
+                 search_text: str = "", size_bytes: int = 0):
+        now_us = time.time_ns() // 1000
+        
+        self.id = id
+        self._content = content
+        self._pager = None
+        self.content_type = sys.intern(content_type)
+        self._created_us = _datetime_to_epoch_us(created_at) if created_at else now_us
+        self._updated_us = _datetime_to_epoch_us(updated_at) if updated_at else now_us
+        self.access_count = access_count
+        self.is_favorite = is_favorite
+        self.tags = tags
+        self._metadata = metadata or None
+        
+        if content is None:
+            # 仅有头部信息的项目（内容留在数据库中）
+            self.content_hash = content_hash
+            self.search_text = ""
+            self.size_bytes = size_bytes
+            return
+        
+        # 每个项目只计算一次内容哈希，ID、去重和数据库键都复用它
+        self.content_hash = content_hash or self.compute_hash(content)
+        if not self.id:
+            self.id = self._generate_id()
+        
+        # 以下字段不持久化：规范化的搜索文本（与原文相同时共享同一字符串；大内容只取前缀）和 UTF-8 字节数
+        self.search_text = search_text or normalize_for_search(search_prefix(content))
+        self.size_bytes = size_bytes or self.compute_size(content)
+    
+    @property
+    def content(self) -> str:
+        content = self._content
+        if content is None:
+            content = self._pager.load(self) if self._pager else ""
+        return content
+    
+    @content.setter
+    def content(self, value: str):
+        self._content = value
+        self._pager = None
+    
+    @property
+    def is_resident(self) -> bool:
+        """内容是否常驻内存"""
+        return self._content is not None
+    
+    def page_out(self, pager):
+        """释放内容和搜索文本，之后通过分页器按需读取"""
+        self._content = None
+        self.search_text = ""
+        self._pager = pager
+    
+    def page_in(self, content: str):
+        """恢复常驻内容"""
+        self._content = content
+        self._pager = None
+        self.search_text = normalize_for_search(search_prefix(content))
+    
+    @property
+    def created_at(self) -> datetime:
+        return _epoch_us_to_datetime(self._created_us)
+    
+    @created_at.setter
+    def created_at(self, value: datetime):
+        self._created_us = _datetime_to_epoch_us(value)
+    
+    @property
+    def updated_at(self) -> datetime:
+        return _epoch_us_to_datetime(self._updated_us)
+    
+    @updated_at.setter
+    def updated_at(self, value: datetime):
+        self._updated_us = _datetime_to_epoch_us(value)
+    
+    @property
+    def metadata(self) -> Mapping[str, Any]:
+        return self._metadata if self._metadata is not None else _EMPTY_METADATA
+    
+    @metadata.setter
+    def metadata(self, value: Optional[Dict[str, Any]]):
+        self._metadata = dict(value) if value else None
+    
+    def update_metadata(self, **values):
+        """更新元数据"""
+        if self._metadata is None:
+            self._metadata = {}
+        self._metadata.update(values)
+    
+    @staticmethod
+    def compute_hash(content: str) -> str:
+        """计算内容哈希（大内容分块计算，避免整段编码副本）"""
+        if is_large_payload(content):
+            return hash_and_size(content)[0]
+        return hashlib.md5(content.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def compute_size(content: str) -> int:
+        """计算内容的 UTF-8 字节数"""
+        if content.isascii():
+            return len(content)
+        if is_large_payload(content):
+            return hash_and_size(content)[1]
+        return len(content.encode('utf-8'))
+    
+    def _generate_id(self) -> str:
+        """生成唯一ID"""
+        timestamp = int(time.time() * 1000)
+        return f"{self.content_hash}_{timestamp}"
+    
+    def update_access(self):
+        """更新访问次数和时间"""
+        self.access_count += 1
+        self._updated_us = time.time_ns() // 1000
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式"""
+        return {
+            'id': self.id,
+            'content': self.content,
+            'content_type': self.content_type,
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat(),
+            'access_count': self.access_count,
+            'is_favorite': self.is_favorite,
+            'tags': self.tags,
+            'metadata': dict(self.metadata),
+            'content_hash': self.content_hash
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ClipboardItem':
+        """从字典创建实例"""
+        data = data.copy()
+        data['created_at'] = datetime.fromisoformat(data['created_at'])
+        data['updated_at'] = datetime.fromisoformat(data['updated_at'])
+        return cls(**data)
+    
+    def _compare_key(self) -> tuple:
+        return (
+            self.id, self.content, self.content_type, self._created_us, self._updated_us,
+            self.access_count, self.is_favorite, self.tags, self.metadata, self.content_hash
+        )
+    
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._compare_key() == other._compare_key()
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return (
+            f"ClipboardItem(id={self.id!r}, content={self.content!r}, "
+            f"content_type={self.content_type!r}, created_at={self.created_at!r}, "
+            f"updated_at={self.updated_at!r}, access_count={self.access_count!r}, "
+            f"is_favorite={self.is_favorite!r}, tags={self.tags!r}, "
+            f"metadata={dict(self.metadata)!r}, content_hash={self.content_hash!r})"
+        )
+
+
+@dataclass(frozen=True)
+class StatsSnapshot:
+    """统计信息快照（只读，变化时整体替换）"""
+    total_items: int = 0
+    content_types: Mapping[str, int] = field(default_factory=lambda: MappingProxyType({}))
+    favorite_count: int = 0
+    total_bytes: int = 0
+    is_enabled: bool = False
+    
+    def __post_init__(self):
+        # 快照被多处持有，类型计数也包成只读视图（传入的字典先复制，之后修改原字典不影响快照）
+        if not isinstance(self.content_types, MappingProxyType):
+            object.__setattr__(self, 'content_types', MappingProxyType(dict(self.content_types)))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式"""
+        return {
+            'total_items': self.total_items,
+            'content_types': dict(self.content_types),
+            'favorite_count': self.favorite_count,
+            'total_bytes': self.total_bytes,
+            'is_enabled': self.is_enabled
+        }
@@ -6,6 +6,7 @@
 
 import sys
 import ctypes
+import html
 from typing import List, Optional
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
@@ -21,7 +22,14 @@ from PyQt6.QtGui import (
     QPixmap, QIcon, QPalette
 )
 
-from ..core.clipboard_manager import ClipboardItem, ClipboardManager
+from ..core.change_coalescer import ItemChangeBatch
+from ..core.clipboard_manager import ClipboardManager
+from ..core.search_engine import SearchMatch
+from ..data.models import ClipboardItem
+
+
+# 面板显示的项目数
+PANEL_ITEM_LIMIT = 20
 
 
 class BottomPanel(QWidget):
@@ -35,14 +43,16 @@ class BottomPanel(QWidget):
     def __init__(self, clipboard_manager: ClipboardManager, parent=None):
         super().__init__(parent)
         self.clipboard_manager = clipboard_manager
+        self._regex_run_id = 0  # 当前正则搜索编号，0 表示未在正则搜索
         self._setup_ui()
         self._setup_animations()
         self._load_items()
         
         # 连接信号
-        self.clipboard_manager.item_added.connect(self._on_item_added)
-        self.clipboard_manager.item_updated.connect(self._on_item_updated)
-        self.clipboard_manager.item_removed.connect(self._on_item_removed)
+        self.clipboard_manager.items_changed.connect(self._on_items_changed)
+        self.clipboard_manager.history_loaded.connect(self._on_history_loaded)
+        self.clipboard_manager.regex_search_chunk.connect(self._on_regex_search_chunk)
+        self.clipboard_manager.regex_search_finished.connect(self._on_regex_search_finished)
     
     def _setup_ui(self):
         """设置界面"""
@@ -116,7 +126,7 @@ class BottomPanel(QWidget):
         
         # 搜索栏
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("🔍 搜索剪贴板内容...")
+        self.search_input.setPlaceholderText("🔍 搜索剪贴板内容...（re: 开头使用正则）")
         self.search_input.setMinimumHeight(36)
         self.search_input.setStyleSheet("""
             QLineEdit {
@@ -230,13 +240,13 @@ class BottomPanel(QWidget):
     
     def _load_items(self):
         """加载剪贴板项目"""
-        items = self.clipboard_manager.get_recent_items(20)
+        items = self.clipboard_manager.get_recent_items(PANEL_ITEM_LIMIT)
         for item in items:
             self._add_item_to_list(item)
     
-    def _add_item_to_list(self, item: ClipboardItem):
+    def _add_item_to_list(self, item: ClipboardItem, match: Optional[SearchMatch] = None):
         """添加项目到卡片容器"""
-        widget = ClipboardItemWidget(item)
+        widget = ClipboardItemWidget(item, match)
         
         # 将卡片插入到弹性空间之前
         self.cards_layout.insertWidget(self.cards_layout.count() - 1, widget)
@@ -245,25 +255,36 @@ class BottomPanel(QWidget):
         widget.item_clicked.connect(self._on_item_clicked)
         widget.item_double_clicked.connect(self._on_item_double_clicked)
     
-    def _on_item_added(self, item: ClipboardItem):
-        """新项目添加"""
-        self._add_item_to_list(item)
-        # 新项目会自动添加到最前面（因为insertWidget在弹性空间之前）
-    
-    def _on_item_updated(self, item: ClipboardItem):
-        """项目更新"""
-        # 这里可以更新列表中的项目显示
-        pass
-    
-    def _on_item_removed(self, item_id: str):
-        """项目删除"""
-        # 从卡片容器中移除项目
-        for i in range(self.cards_layout.count() - 1):  # 减1是因为最后一个是弹性空间
+    def _on_items_changed(self, batch: ItemChangeBatch):
+        """一批项目变化：暂停重绘，一次完成增删后再整体布局"""
+        self.cards_container.setUpdatesEnabled(False)
+        try:
+            if batch.removed:
+                self._remove_items_from_list(set(batch.removed))
+            
+            # 一批中新增很多时只添加最新的、面板能显示的部分
+            for item_id in batch.added[-PANEL_ITEM_LIMIT:]:
+                item = self.clipboard_manager.get_item(item_id)
+                if item is not None:
+                    # 新项目会自动添加到最前面（因为insertWidget在弹性空间之前）
+                    self._add_item_to_list(item)
+            
+            # 项目更新暂不需要刷新卡片显示
+        finally:
+            self.cards_container.setUpdatesEnabled(True)
+    
+    def _on_history_loaded(self, count: int):
+        """后台历史加载完成：按当前搜索条件重新显示"""
+        if count:
+            self._on_search(self.search_input.text())
+    
+    def _remove_items_from_list(self, item_ids: set):
+        """从卡片容器中移除项目"""
+        for i in range(self.cards_layout.count() - 2, -1, -1):  # 跳过最后的弹性空间，倒序删除
             widget = self.cards_layout.itemAt(i).widget()
-            if widget and hasattr(widget, 'item') and widget.item.id == item_id:
+            if widget and hasattr(widget, 'item') and widget.item.id in item_ids:
                 self.cards_layout.removeWidget(widget)
                 widget.deleteLater()
-                break
     
     def _on_search(self, query: str):
         """搜索处理"""
@@ -274,16 +295,46 @@ class BottomPanel(QWidget):
                 self.cards_layout.removeWidget(widget)
                 widget.deleteLater()
         
+        # 新的输入使旧的正则搜索结果失效
+        self._regex_run_id = 0
+        self.title_label.setText("剪贴板历史")
+        
+        if query.startswith("re:"):
+            # 正则搜索在后台执行，结果分批到达
+            pattern = query[3:]
+            if pattern:
+                self.title_label.setText("剪贴板历史 - 正则搜索中...")
+                self._regex_run_id = self.clipboard_manager.start_regex_search(pattern, PANEL_ITEM_LIMIT)
+            else:
+                self.clipboard_manager.cancel_regex_search()
+            return
+        
+        self.clipboard_manager.cancel_regex_search()
+        
         if query.strip():
-            # 搜索项目
-            items = self.clipboard_manager.search_items(query, 20)
+            # 搜索项目，预览显示命中位置附近的片段
+            for match in self.clipboard_manager.search_matches(query, PANEL_ITEM_LIMIT):
+                self._add_item_to_list(match.item, match)
         else:
             # 显示最近项目
-            items = self.clipboard_manager.get_recent_items(20)
-        
-        # 添加搜索结果
-        for item in items:
-            self._add_item_to_list(item)
+            for item in self.clipboard_manager.get_recent_items(PANEL_ITEM_LIMIT):
+                self._add_item_to_list(item)
+    
+    def _on_regex_search_chunk(self, run_id: int, matches: list):
+        """正则搜索分批结果到达"""
+        if run_id != self._regex_run_id:
+            return
+        for match in matches:
+            self._add_item_to_list(match.item, match)
+    
+    def _on_regex_search_finished(self, run_id: int, timed_out: bool):
+        """正则搜索结束"""
+        if run_id != self._regex_run_id:
+            return
+        if timed_out:
+            self.title_label.setText("剪贴板历史 - 正则搜索超时，仅显示部分结果")
+        else:
+            self.title_label.setText("剪贴板历史")
     
     def _on_item_clicked(self, item: ClipboardItem):
         """项目单击事件 - 选中项目"""
@@ -519,9 +570,10 @@ class ClipboardItemWidget(QWidget):
     item_clicked = pyqtSignal(ClipboardItem)  # 单击选中
     item_double_clicked = pyqtSignal(ClipboardItem)  # 双击上屏
     
-    def __init__(self, item: ClipboardItem, parent=None):
+    def __init__(self, item: ClipboardItem, match: Optional[SearchMatch] = None, parent=None):
         super().__init__(parent)
         self.item = item
+        self.match = match  # 搜索命中信息（非搜索结果时为 None）
         self.is_selected = False  # 选中状态
         self._setup_ui()
     
@@ -559,6 +611,8 @@ class ClipboardItemWidget(QWidget):
                 border: none;
             }
         """)
+        if self.match and self.match.highlight:
+            self.content_label.setTextFormat(Qt.TextFormat.RichText)
         self.content_label.setWordWrap(True)
         self.content_label.setMaximumHeight(60)
         self.content_label.setAlignment(Qt.AlignmentFlag.AlignTop)
@@ -606,12 +660,27 @@ class ClipboardItemWidget(QWidget):
             "link": "🔗",
             "file": "📁",
             "code": "💻",
-            "image": "🖼️"
+            "image": "🖼️",
+            "json": "🧾",
+            "email": "📧",
+            "color": "🎨",
+            "uuid": "🔑",
+            "number": "🔢"
         }
         return icons.get(self.item.content_type, "📄")
     
     def _get_preview(self) -> str:
         """获取预览内容"""
+        if self.match and self.match.highlight:
+            # 直接使用搜索引擎给出的片段，高亮命中部分
+            snippet = self.match.snippet
+            start, end = self.match.highlight
+            return (
+                html.escape(snippet[:start])
+                + '<span style="background: #FFE58F;">' + html.escape(snippet[start:end]) + '</span>'
+                + html.escape(snippet[end:])
+            )
+        
         content = self.item.content
         if len(content) > 60:
             return content[:60] + "..."
@@ -669,7 +738,12 @@ class ClipboardItemWidget(QWidget):
             "link": {"bg": "#E8F5E8", "border": "#4CAF50"},      # 浅绿色 - 链接
             "file": {"bg": "#FFEBEE", "border": "#F44336"},      # 浅红色 - 文件
             "code": {"bg": "#F3E5F5", "border": "#9C27B0"},      # 浅紫色 - 代码
-            "image": {"bg": "#FFF3E0", "border": "#FF9800"}      # 浅橙色 - 图片
+            "image": {"bg": "#FFF3E0", "border": "#FF9800"},     # 浅橙色 - 图片
+            "json": {"bg": "#E0F2F1", "border": "#009688"},      # 浅青色 - JSON
+            "email": {"bg": "#E8EAF6", "border": "#3F51B5"},     # 浅靛色 - 邮箱
+            "color": {"bg": "#FCE4EC", "border": "#E91E63"},     # 浅粉色 - 颜色
+            "uuid": {"bg": "#ECEFF1", "border": "#607D8B"},      # 浅蓝灰 - UUID
+            "number": {"bg": "#FBE9E7", "border": "#FF5722"}     # 浅橙红 - 数字
         }
         
         # 获取当前类型的样式
@@ -10,7 +10,8 @@ from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame
 from PyQt6.QtCore import Qt, pyqtSignal, QSize
 from PyQt6.QtGui import QFont, QColor, QPalette
 
-from ..core.clipboard_manager import ClipboardItem
+from ..data.models import ClipboardItem
+from ..core.payload import preview_prefix
 
 
 class CardGenerator:
@@ -42,6 +43,36 @@ class CardGenerator:
             "icon": "📁",
             "description": "文件路径"
         },
+        "json": {
+            "name": "JSON",
+            "color": "#008575",  # 青色
+            "icon": "🧾",
+            "description": "JSON 数据"
+        },
+        "email": {
+            "name": "邮箱",
+            "color": "#0063b1",  # 深蓝色
+            "icon": "📧",
+            "description": "电子邮件地址"
+        },
+        "color": {
+            "name": "颜色",
+            "color": "#c239b3",  # 品红色
+            "icon": "🎨",
+            "description": "十六进制颜色值"
+        },
+        "uuid": {
+            "name": "UUID",
+            "color": "#4a5459",  # 深灰色
+            "icon": "🔑",
+            "description": "唯一标识符"
+        },
+        "number": {
+            "name": "数字",
+            "color": "#ca5010",  # 深橙色
+            "icon": "🔢",
+            "description": "数值"
+        },
         "image": {
             "name": "图片",
             "color": "#ff8c00",  # 橙色
@@ -69,7 +100,8 @@ class CardGenerator:
     @classmethod
     def get_card_preview(cls, item: ClipboardItem, max_length: int = 100) -> str:
         """获取卡片预览内容"""
-        content = item.content.strip()
+        # 只取前缀生成预览，避免对大内容整体 strip/split
+        content = preview_prefix(item.content).strip()
         
         if not content:
             return "空内容"
@@ -117,6 +149,9 @@ class CardGenerator:
 内容长度: {len(item.content)} 字符
         """.strip()
         
+        if item.metadata.get('truncated'):
+            tooltip += f"\n已截断: 原始长度 {item.metadata['original_length']} 字符"
+        
         if item.tags:
             tooltip += f"\n标签: {item.tags}"
         
@@ -8,6 +8,7 @@ Paste for Windows - 主应用程序
 import sys
 import os
 import ctypes
+import multiprocessing
 from pathlib import Path
 import time # Added for retry mechanism
 
@@ -29,12 +30,14 @@ def run_as_admin():
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.core.clipboard_manager import ClipboardManager
 from src.core.config_manager import ConfigManager
+from src.daemon import apply_check_interval, setup_clipboard_manager, start_ipc_server
 from src.data.database import DatabaseManager
-from src.gui.bottom_panel import BottomPanel
 from src.gui.system_tray import SystemTray
 from src.utils.hotkey_manager import hotkey_manager
+from src.utils.startup_trace import startup_trace
+
+startup_trace.mark("imports")
 
 
 class MainWindow(QMainWindow):
@@ -143,46 +146,55 @@ class MainWindow(QMainWindow):
         """)
     
     def _setup_components(self):
-        """设置组件"""
+        """设置组件
+        
+        分阶段启动：托盘和快捷键先就绪，历史项目在事件循环开始后由后台线程加载，
+        底部面板在第一次显示时才创建
+        """
         # 配置管理器
-        self.config_manager = ConfigManager()
+        with startup_trace.span("config_loaded"):
+            self.config_manager = ConfigManager()
         
         # 数据库管理器
-        self.database_manager = DatabaseManager()
-        
-        # 剪贴板管理器
-        self.clipboard_manager = ClipboardManager()
+        with startup_trace.span("database_opened"):
+            self.database_manager = DatabaseManager()
         
-        # 设置剪贴板管理器与数据库管理器的关联
-        self.clipboard_manager.set_database_manager(self.database_manager)
-        
-        # 从数据库加载历史项目
-        self.clipboard_manager.load_from_database()
+        # 剪贴板管理器（与守护模式共用同一套配置，历史稍后在后台加载）
+        with startup_trace.span("manager_ready"):
+            self.clipboard_manager = setup_clipboard_manager(
+                self.config_manager, self.database_manager, load_history=False
+            )
         
         # 系统托盘
-        self.system_tray = SystemTray(self.clipboard_manager)
+        with startup_trace.span("tray_visible"):
+            self.system_tray = SystemTray(self.clipboard_manager)
+            if self.system_tray.is_system_tray_available():
+                self.system_tray.show()
+        
+        # 启动全局快捷键管理器
+        with startup_trace.span("hotkeys_ready"):
+            if hotkey_manager.is_available():
+                hotkey_manager.start()
+            else:
+                print("⚠️ 全局快捷键功能不可用，请安装 keyboard 模块")
         
-        # 底部面板
-        self.bottom_panel = BottomPanel(self.clipboard_manager)
+        # 底部面板在第一次显示时创建
+        self.bottom_panel = None
         
         # 启动剪贴板监听
-        self.clipboard_manager.start()
-        
-        # 启动全局快捷键管理器
-        if hotkey_manager.is_available():
-            hotkey_manager.start()
-        else:
-            print("⚠️ 全局快捷键功能不可用，请安装 keyboard 模块")
+        with startup_trace.span("listening"):
+            self.clipboard_manager.start()
         
-        # 显示系统托盘
-        if self.system_tray.is_system_tray_available():
-            self.system_tray.show()
+        # 本地 IPC 查询接口
+        with startup_trace.span("ipc_ready"):
+            self.ipc_server = start_ipc_server(self.clipboard_manager, self.config_manager)
         
         # 更新状态
         self._update_status()
         
-        # 添加测试卡片（仅在开发模式下）
-        self._add_test_cards()
+        # 事件循环开始后再加载历史项目
+        self.clipboard_manager.history_loaded.connect(self._on_history_loaded)
+        QTimer.singleShot(0, self.clipboard_manager.load_from_database_async)
     
     def _connect_signals(self):
         """连接信号"""
@@ -192,39 +204,53 @@ class MainWindow(QMainWindow):
         self.system_tray.toggle_bottom_panel_requested.connect(self.toggle_bottom_panel)
         self.system_tray.quit_requested.connect(self.quit_application)
         
-        # 底部面板信号
-        self.bottom_panel.item_selected.connect(self._on_item_selected)
-        self.bottom_panel.item_double_clicked.connect(self._on_item_double_clicked)
-        
         # 剪贴板管理器信号
-        self.clipboard_manager.item_added.connect(self._on_item_added)
+        self.clipboard_manager.items_changed.connect(self._on_items_changed)
         self.clipboard_manager.error_occurred.connect(self._on_error)
         
         # 全局快捷键信号
         hotkey_manager.toggle_bottom_panel_requested.connect(self.toggle_bottom_panel)
+        
+        # 配置变化实时生效
+        self.config_manager.config_changed.connect(self._on_config_changed)
+    
+    def _on_config_changed(self, key: str, value):
+        """配置项变化"""
+        if key in ('clipboard_check_interval', 'clipboard_check_interval_max'):
+            apply_check_interval(self.clipboard_manager, self.config_manager)
+    
+    def _on_history_loaded(self, count: int):
+        """后台历史加载完成，启动结束"""
+        startup_trace.mark("history_loaded")
+        self._update_status()
+        
+        # 添加测试卡片（仅在调试模式下）
+        debug_mode = self.config_manager.get('debug_mode')
+        if debug_mode:
+            self._add_test_cards()
+        
+        startup_trace.finish(verbose=debug_mode)
     
     def _update_status(self):
         """更新状态信息"""
-        stats = self.clipboard_manager.get_stats()
-        status_text = f"已监听 {stats['total_items']} 个项目"
+        stats = self.clipboard_manager.get_stats_snapshot()
+        status_text = f"已监听 {stats.total_items} 个项目"
         
-        if self.clipboard_manager._is_enabled:
+        if stats.is_enabled:
             status_text += " | 监听中"
         else:
             status_text += " | 已停止"
         
         self.status_label.setText(status_text)
     
-    def _on_item_added(self, item):
-        """新项目添加"""
+    def _on_items_changed(self, batch):
+        """一批项目变化（每帧最多一次）"""
         self._update_status()
         # 可以在这里添加通知或其他反馈
     
     def _on_item_selected(self, item):
         """项目被选中"""
         # 单击选中：复制内容到剪贴板
-        import win32clipboard
-        import win32con
         import time
         
         try:
@@ -236,27 +262,16 @@ class MainWindow(QMainWindow):
                     if attempt > 0:
                         time.sleep(0.1)
                     
-                    win32clipboard.OpenClipboard()
-                    win32clipboard.EmptyClipboard()
-                    win32clipboard.SetClipboardData(win32con.CF_UNICODETEXT, item.content)
-                    win32clipboard.CloseClipboard()
+                    self.clipboard_manager.copy_to_clipboard(item)
                     success = True
                     break
                     
                 except Exception as e:
                     print(f"复制到剪贴板失败，尝试 {attempt + 1}/3: {e}")
-                    # 确保剪贴板被关闭
-                    try:
-                        win32clipboard.CloseClipboard()
-                    except:
-                        pass
             
             if success:
-                # 更新访问次数
-                item.update_access()
-                
-                # 发送更新信号，触发数据库保存
-                self.clipboard_manager.item_updated.emit(item)
+                # 更新访问次数并提到最近位置，同时保存到数据库
+                self.clipboard_manager.record_access(item)
                 
                 # 显示成功通知
                 self.system_tray.show_message(
@@ -321,9 +336,6 @@ class MainWindow(QMainWindow):
     
     def _fallback_to_clipboard(self, item):
         """回退到剪贴板方式"""
-        import win32clipboard
-        import win32con
-        
         try:
             # 多次尝试设置剪贴板内容
             success = False
@@ -333,20 +345,12 @@ class MainWindow(QMainWindow):
                     if attempt > 0:
                         time.sleep(0.1)
                     
-                    win32clipboard.OpenClipboard()
-                    win32clipboard.EmptyClipboard()
-                    win32clipboard.SetClipboardData(win32con.CF_UNICODETEXT, item.content)
-                    win32clipboard.CloseClipboard()
+                    self.clipboard_manager.copy_to_clipboard(item)
                     success = True
                     break
                     
                 except Exception as e:
                     print(f"复制到剪贴板失败，尝试 {attempt + 1}/3: {e}")
-                    # 确保剪贴板被关闭
-                    try:
-                        win32clipboard.CloseClipboard()
-                    except:
-                        pass
             
             if success:
                 # 显示成功通知
@@ -376,7 +380,7 @@ class MainWindow(QMainWindow):
     def _add_test_cards(self):
         """添加测试卡片"""
         from datetime import datetime, timedelta
-        from src.core.clipboard_manager import ClipboardItem
+        from src.data.models import ClipboardItem
         
         # 创建测试数据
         test_items = [
@@ -551,9 +555,9 @@ class MainWindow(QMainWindow):
             ),
         ]
         
-        # 添加测试项目到剪贴板管理器
+        # 添加测试项目到剪贴板管理器（只在内存中，不保存到数据库，也不会被内存预算换出）
         for item in test_items:
-            self.clipboard_manager._add_item(item)
+            self.clipboard_manager.add_transient_item(item)
         
         print("✅ 已添加测试卡片，包含以下类型：")
         print("   - 文本类型（蓝色边框）")
@@ -571,16 +575,26 @@ class MainWindow(QMainWindow):
         self.raise_()
         self.activateWindow()
     
+    def _ensure_bottom_panel(self):
+        """返回底部面板，第一次使用时创建（面板模块和卡片不在启动时加载）"""
+        if self.bottom_panel is None:
+            from src.gui.bottom_panel import BottomPanel
+            
+            self.bottom_panel = BottomPanel(self.clipboard_manager)
+            self.bottom_panel.item_selected.connect(self._on_item_selected)
+            self.bottom_panel.item_double_clicked.connect(self._on_item_double_clicked)
+        return self.bottom_panel
+    
     def show_bottom_panel(self):
         """显示底部面板"""
-        self.bottom_panel.show_panel()
+        self._ensure_bottom_panel().show_panel()
     
     def toggle_bottom_panel(self):
         """切换底部面板显示状态"""
-        if self.bottom_panel.isVisible():
+        if self.bottom_panel is not None and self.bottom_panel.isVisible():
             self.bottom_panel.hide_panel()
         else:
-            self.bottom_panel.show_panel()
+            self._ensure_bottom_panel().show_panel()
     
     def quit_application(self):
         """退出应用程序"""
@@ -597,7 +611,8 @@ class MainWindow(QMainWindow):
         
         if reply == QMessageBox.StandardButton.Yes:
             # 清理资源
-            self.clipboard_manager.stop()
+            self._stop_ipc_server()
+            self.clipboard_manager.shutdown()
             hotkey_manager.stop()
             self.database_manager.close()
             self.system_tray.hide()
@@ -605,6 +620,12 @@ class MainWindow(QMainWindow):
             # 退出应用程序
             QApplication.quit()
     
+    def _stop_ipc_server(self):
+        """停止本地 IPC 服务"""
+        if self.ipc_server:
+            self.ipc_server.stop()
+            self.ipc_server = None
+    
     def closeEvent(self, event):
         """关闭事件"""
         # 如果系统托盘可用，最小化到托盘而不是关闭
@@ -613,7 +634,8 @@ class MainWindow(QMainWindow):
             event.ignore()
         else:
             # 清理资源
-            self.clipboard_manager.stop()
+            self._stop_ipc_server()
+            self.clipboard_manager.shutdown()
             hotkey_manager.stop()
             self.database_manager.close()
             event.accept()
@@ -642,6 +664,7 @@ class PasteForWindowsApp:
             
             # 显示主窗口
             self.main_window.show()
+            startup_trace.mark("main_window_shown")
             
             # 运行应用程序
             return self.app.exec()
@@ -653,13 +676,17 @@ class PasteForWindowsApp:
     def cleanup(self):
         """清理资源"""
         if self.main_window:
-            self.main_window.clipboard_manager.stop()
+            self.main_window._stop_ipc_server()
+            self.main_window.clipboard_manager.shutdown()
             hotkey_manager.stop()
             self.main_window.database_manager.close()
 
 
 def main():
     """主函数"""
+    # 正则搜索使用独立进程，打包后需要支持子进程启动
+    multiprocessing.freeze_support()
+    
     print("✅ 应用程序启动中...")
     
     app = PasteForWindowsApp()
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+应用路径工具
+统一应用数据目录的位置
+"""
+
+from pathlib import Path
+
+
+def get_app_data_dir(create: bool = True) -> Path:
+    """获取应用数据目录（create 为 True 时不存在则创建；只读工具传 False，不产生副作用）"""
+    app_data_dir = Path.home() / "AppData" / "Local" / "PasteForWindows"
+    if create:
+        app_data_dir.mkdir(parents=True, exist_ok=True)
+    return app_data_dir
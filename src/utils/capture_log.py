@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+捕获日志模块
+在后台线程中批量写入剪贴板变化记录，按大小和时间轮转，
+使捕获路径不包含文件 I/O，且磁盘占用有界
+"""
+
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# 日志中每条记录保留的内容长度
+LOG_PREVIEW_CHARS = 200
+
+# 写入线程出错退出后，至少间隔这么久（秒）才重新启动
+RESTART_INTERVAL = 5.0
+
+# 记录开头的时间格式
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class CaptureLogWriter:
+    """队列驱动的轮转日志写入器
+
+    - log() 只把记录放入有界队列，队列满时丢弃并计数，从不阻塞调用方
+    - 写入线程收到记录后最多再等待 flush_interval 秒收集后续记录，合并为一次写入并刷新
+    - 文件超过 max_bytes 或第一条记录早于 rotate_interval 秒前时轮转，保留 backup_count 个旧文件；
+      文件的起始时间取自已有的第一条记录，程序重启或写入线程重启后继续计时
+    """
+
+    def __init__(self, path: Path, max_bytes: int = 1024 * 1024, backup_count: int = 3,
+                 rotate_interval: float = 24 * 3600, flush_interval: float = 0.5,
+                 batch_size: int = 256, queue_size: int = 10000):
+        self.path = Path(path)
+        self._max_bytes = max_bytes
+        self._backup_count = max(0, backup_count)
+        self._rotate_interval = rotate_interval
+        self._flush_interval = flush_interval
+        self._batch_size = max(1, batch_size)
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=queue_size)
+
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._restart_at = 0.0  # 出错后允许重新启动写入线程的时间（monotonic）
+        self._file = None
+        self._size = 0
+        self._started_at = 0.0  # 当前文件第一条记录的时间
+
+        # 统计计数
+        self.written = 0
+        self.dropped = 0
+        self.rotations = 0
+        self.errors = 0
+
+    def log(self, content: str, content_type: str = "文本"):
+        """记录一次剪贴板变化（非阻塞）"""
+        self._ensure_started()
+        record = (time.time(), content_type, content[:LOG_PREVIEW_CHARS], len(content))
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_started(self):
+        """首次写入时启动写入线程；写入线程出错退出后，间隔 RESTART_INTERVAL 秒再重新启动"""
+        if self._thread is not None or time.monotonic() < self._restart_at:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="CaptureLogWriter", daemon=True)
+                self._thread.start()
+
+    def close(self, timeout: float = 2.0):
+        """写完队列中的记录后停止写入线程"""
+        thread = self._thread
+        if thread is None:
+            return
+        if thread.is_alive():
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                pass  # 写入线程卡住，只等待 join 超时
+            thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        """写入线程主循环"""
+        try:
+            self._open()
+        except OSError as e:
+            print(f"❌ 打开捕获日志失败: {e}")
+            self._on_writer_exit(failed=True)
+            return
+
+        failed = False
+        try:
+            while True:
+                record = self._queue.get()
+
+                # 在刷新间隔内继续收集记录，合并写入
+                batch = [record]
+                deadline = time.monotonic() + self._flush_interval
+                while record is not None and len(batch) < self._batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        record = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    batch.append(record)
+
+                stop = batch[-1] is None
+                records = [item for item in batch if item is not None]
+                if records:
+                    self._write_batch(records)
+                if stop:
+                    break
+        except Exception as e:
+            failed = True
+            print(f"❌ 写入捕获日志失败: {e}")
+        finally:
+            if self._file:
+                self._file.close()
+                self._file = None
+            self._on_writer_exit(failed)
+
+    def _on_writer_exit(self, failed: bool):
+        """写入线程退出：清除线程引用，下次 log() 时可重新启动，队列中未写入的记录保留"""
+        with self._start_lock:
+            if self._thread is threading.current_thread():
+                self._thread = None
+            if failed:
+                self.errors += 1
+                self._restart_at = time.monotonic() + RESTART_INTERVAL
+
+    def _write_batch(self, records: list):
+        """写入一批记录并刷新，写满时在记录之间轮转"""
+        pending = []
+        for record in records:
+            if self._should_rotate():
+                self._flush_pending(pending)
+                self._rotate()
+            entry = self._format(record)
+            pending.append(entry)
+            self._size += len(entry.encode('utf-8'))
+        self._flush_pending(pending)
+        self.written += len(records)
+
+    def _flush_pending(self, pending: list):
+        """一次写入积压的记录"""
+        if pending:
+            self._file.write("".join(pending))
+            self._file.flush()
+            pending.clear()
+
+    @staticmethod
+    def _format(record: tuple) -> str:
+        """格式化一条记录"""
+        timestamp, content_type, preview, length = record
+        current_time = datetime.fromtimestamp(timestamp).strftime(_TIMESTAMP_FORMAT)
+
+        log_entry = f"[{current_time}] 剪贴板内容变化 ({content_type}): {preview}"
+        if length > LOG_PREVIEW_CHARS:
+            log_entry += f"... (总长度: {length} 字符)"
+        return log_entry + "\n" + "-" * 80 + "\n"
+
+    def _open(self):
+        """打开日志文件（追加），新文件从现在开始计时，已有文件沿用其起始时间"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._size = self._file.tell()
+        self._started_at = self._read_started_at() if self._size else time.time()
+
+    def _read_started_at(self) -> float:
+        """已有日志文件的起始时间：第一条记录的时间，无法解析时取文件修改时间"""
+        try:
+            with open(self.path, 'r', encoding='utf-8', errors='replace') as f:
+                first_line = f.readline(64)
+            # 系统时间被调回时不晚于现在，避免长期不轮转
+            return min(datetime.strptime(first_line[1:20], _TIMESTAMP_FORMAT).timestamp(), time.time())
+        except (OSError, ValueError):
+            pass
+        try:
+            return self.path.stat().st_mtime
+        except OSError:
+            return time.time()
+
+    def _should_rotate(self) -> bool:
+        if self._max_bytes and self._size >= self._max_bytes:
+            return True
+        return bool(self._rotate_interval) and time.time() - self._started_at >= self._rotate_interval
+
+    def _rotate(self):
+        """轮转：clipboard_changes.log -> .1 -> .2 ...，超出保留数量的删除"""
+        self._file.close()
+        self._file = None
+
+        if self._backup_count:
+            for index in range(self._backup_count - 1, 0, -1):
+                source = self._backup_path(index)
+                if source.exists():
+                    os.replace(source, self._backup_path(index + 1))
+            os.replace(self.path, self._backup_path(1))
+        else:
+            self.path.unlink()
+
+        self.rotations += 1
+        self._open()
+
+    def _backup_path(self, index: int) -> Path:
+        return self.path.with_name(f"{self.path.name}.{index}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取写入统计信息"""
+        return {
+            'path': str(self.path),
+            'written': self.written,
+            'dropped': self.dropped,
+            'queued': self._queue.qsize(),
+            'rotations': self.rotations,
+            'errors': self.errors
+        }
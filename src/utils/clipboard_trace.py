@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+剪贴板会话录制与回放模块
+录制真实使用中的剪贴板事件（匿名化），回放时按录制的节奏重新写入剪贴板后端，
+使性能改动可以在同一份真实负载上对比
+
+轨迹文件为 JSON Lines：第一行是文件头，之后每行一个事件：
+    {"t": 相对开始的秒数, "size": 字符数, "bytes": UTF-8 字节数, "type": 内容类型,
+     "hash": 加盐哈希, "dup_of": 首次出现该内容的事件序号或 null, "formats": [附加格式名],
+     "truncated": 是否被截断, "content": 打乱后的内容（仅在开启时）}
+
+- 哈希使用每份轨迹随机生成、不写入文件的盐，无法通过穷举短内容还原，但同一轨迹内的重复关系保留
+- 打乱内容时保留空白、标点和链接前缀，字母和数字替换为同类字符，长度不变
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .load_generator import make_content
+
+TRACE_VERSION = 1
+
+# 打乱内容时原样保留的前缀
+_KEPT_PREFIXES = ('http://', 'https://', 'ftp://', 'file://')
+
+
+class TraceRecorder:
+    """剪贴板事件录制器
+
+    record() 在捕获流水线线程中调用，只写入本地文件
+    """
+
+    def __init__(self, path: Path, scramble_content: bool = False):
+        self.path = Path(path)
+        self._scramble_content = scramble_content
+        self._salt = os.urandom(16)  # 不写入文件
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._first_index: Dict[str, int] = {}  # 加盐哈希 -> 首次出现的事件序号
+        self._count = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._write({
+            'version': TRACE_VERSION,
+            'started_at': datetime.now().isoformat(),
+            'scrambled_content': scramble_content
+        })
+
+    @property
+    def event_count(self) -> int:
+        return self._count
+
+    def record(self, record):
+        """录制一次捕获（CaptureRecord，需已完成分类）"""
+        item = record.item
+        if item is None:
+            return
+
+        salted_hash = self._salted_hash(item.content_hash)
+        formats = record.formats.available if record.formats is not None else []
+        with self._lock:
+            if self._file is None:
+                return
+            index = self._count
+            first_index = self._first_index.setdefault(salted_hash, index)
+            event = {
+                't': round(record.captured_at - self._started, 6),
+                'size': len(item.content),
+                'bytes': item.size_bytes,
+                'type': item.content_type,
+                'hash': salted_hash,
+                'dup_of': first_index if first_index != index else None,
+                'formats': formats,
+                'truncated': bool(record.original_length)
+            }
+            if self._scramble_content:
+                event['content'] = scramble(item.content, self._salt + salted_hash.encode())
+            self._write(event)
+            self._count += 1
+
+    def close(self):
+        """结束录制"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _salted_hash(self, content_hash: str) -> str:
+        return hmac.new(self._salt, content_hash.encode(), hashlib.sha256).hexdigest()[:16]
+
+    def _write(self, data: Dict[str, Any]):
+        self._file.write(json.dumps(data, ensure_ascii=False) + "\n")
+
+
+def scramble(content: str, seed: bytes) -> str:
+    """打乱内容：保留空白、标点和链接前缀，字母和数字替换为同类随机字符，长度不变
+
+    相同的 seed 得到相同的结果，因此重复内容打乱后仍然相同
+    """
+    rng = random.Random(seed)
+    kept = next((prefix for prefix in _KEPT_PREFIXES if content.startswith(prefix)), "")
+
+    chars = [kept]
+    for char in content[len(kept):]:
+        if char.isdigit():
+            chars.append(chr(ord('0') + rng.randrange(10)))
+        elif 'a' <= char <= 'z':
+            chars.append(chr(ord('a') + rng.randrange(26)))
+        elif 'A' <= char <= 'Z':
+            chars.append(chr(ord('A') + rng.randrange(26)))
+        elif char.isalpha():
+            # 其他文字（如中文）替换为常用汉字区的随机字符
+            chars.append(chr(0x4E00 + rng.randrange(0x5000)))
+        else:
+            chars.append(char)
+    return "".join(chars)
+
+
+class TraceReplayer:
+    """轨迹回放：生成 (相对开始的秒数, 内容) 计划，交给 play_schedule 写入后端"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, 'r', encoding='utf-8') as trace_file:
+            lines = [json.loads(line) for line in trace_file if line.strip()]
+        if not lines or lines[0].get('version') != TRACE_VERSION:
+            raise ValueError(f"不支持的轨迹文件: {self.path}")
+        self.header: Dict[str, Any] = lines[0]
+        self.events: List[Dict[str, Any]] = lines[1:]
+
+    def contents(self) -> Iterator[str]:
+        """按事件顺序生成内容
+
+        有打乱内容时直接使用；否则按记录的类型和大小合成，重复事件复用首次出现时的内容
+        """
+        generated: Dict[int, str] = {}
+        for index, event in enumerate(self.events):
+            dup_of = event.get('dup_of')
+            if dup_of is not None and dup_of in generated:
+                content = generated[dup_of]
+            elif 'content' in event:
+                content = event['content']
+            else:
+                rng = random.Random(event['hash'])
+                content = make_content(event['type'], event['size'], index, rng)
+            if dup_of is None:
+                generated[index] = content
+            yield content
+
+    def schedule(self, speed: float = 1.0, max_gap: Optional[float] = None) -> Iterator[Tuple[float, str]]:
+        """生成回放计划
+
+        speed 为回放倍速（0 表示不等待，尽快写入）；max_gap 限制两次事件之间的最长间隔（秒，按录制时间计），
+        用于跳过长时间空闲
+        """
+        offset = 0.0
+        previous_t = None
+        for event, content in zip(self.events, self.contents()):
+            if previous_t is not None:
+                gap = max(0.0, event['t'] - previous_t)
+                if max_gap is not None:
+                    gap = min(gap, max_gap)
+                offset += gap / speed if speed > 0 else 0.0
+            previous_t = event['t']
+            yield offset, content
+
+    def get_summary(self) -> Dict[str, Any]:
+        """轨迹概况：事件数、时长、重复比例、类型分布和大小"""
+        type_counts: Dict[str, int] = {}
+        for event in self.events:
+            type_counts[event['type']] = type_counts.get(event['type'], 0) + 1
+        duplicates = sum(1 for event in self.events if event.get('dup_of') is not None)
+        total = len(self.events)
+        return {
+            'events': total,
+            'duration': self.events[-1]['t'] - self.events[0]['t'] if total else 0.0,
+            'duplicate_ratio': duplicates / total if total else 0.0,
+            'types': type_counts,
+            'total_bytes': sum(event['bytes'] for event in self.events),
+            'max_size': max((event['size'] for event in self.events), default=0),
+            'scrambled_content': self.header.get('scrambled_content', False)
+        }
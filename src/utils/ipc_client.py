@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地 IPC 客户端
+连接运行中的 Paste for Windows 查询剪贴板历史，只依赖标准库，启动时不加载 PyQt6
+
+用法: python -m src.utils.ipc_client search 关键词 [--limit 20]
+      python -m src.utils.ipc_client recent [--limit 20]
+      python -m src.utils.ipc_client get <项目ID>
+      python -m src.utils.ipc_client pin <项目ID> [--off]
+      python -m src.utils.ipc_client paste <项目ID> [--type]
+"""
+
+import argparse
+import json
+import sys
+from multiprocessing.connection import Client
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .ipc_protocol import (
+    IpcError, decode_frame, encode_frame, get_ipc_address, get_ipc_family, load_authkey
+)
+
+
+class IpcClient:
+    """IPC 客户端，可作为上下文管理器使用"""
+
+    def __init__(self, address: Optional[str] = None, authkey: Optional[bytes] = None):
+        address = address or get_ipc_address()
+        try:
+            self._conn = Client(address, family=get_ipc_family(), authkey=authkey or load_authkey())
+        except (OSError, EOFError) as e:
+            raise IpcError(f"无法连接 {address}（程序是否在运行？）: {e}") from e
+        self._next_id = 0
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def stream(self, command: str, **args) -> Iterator[Dict[str, Any]]:
+        """发送一个请求，逐个返回列表结果中的项目（边接收边返回）"""
+        request_id = self._send([(command, args)])[0]
+        for kind, value in self._receive(request_id):
+            if kind == 'chunk':
+                yield from value
+
+    def call(self, command: str, **args) -> Any:
+        """发送一个请求并返回结果：列表结果返回完整列表，其他返回结果对象"""
+        request_id = self._send([(command, args)])[0]
+        return self._collect(request_id)
+
+    def batch(self, requests: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """一帧发送多个请求，按顺序返回结果；失败的请求对应位置为 IpcError"""
+        results = []
+        for request_id in self._send(requests):
+            try:
+                results.append(self._collect(request_id))
+            except IpcError as e:
+                results.append(e)
+        return results
+
+    def search(self, query: str, limit: int = 20, mode: str = "text") -> List[Dict[str, Any]]:
+        return self.call("search", query=query, limit=limit, mode=mode)
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        return self.call("recent", limit=limit)
+
+    def get(self, item_id: str) -> Dict[str, Any]:
+        return self.call("get", id=item_id)
+
+    def pin(self, item_id: str, pinned: bool = True) -> Dict[str, Any]:
+        return self.call("pin", id=item_id, pinned=pinned)
+
+    def paste(self, item_id: str, auto_type: bool = False) -> Dict[str, Any]:
+        return self.call("paste", id=item_id, auto_type=auto_type)
+
+    def _send(self, requests: List[Tuple[str, Dict[str, Any]]]) -> List[int]:
+        frames = []
+        for command, args in requests:
+            self._next_id += 1
+            frames.append({'id': self._next_id, 'cmd': command, 'args': args})
+        self._conn.send_bytes(encode_frame(frames[0] if len(frames) == 1 else frames))
+        return [frame['id'] for frame in frames]
+
+    def _receive(self, request_id: int) -> Iterator[Tuple[str, Any]]:
+        """读取一个请求的应答帧：若干 ('chunk', 项目列表)，最后 ('done', 结束帧)；服务端返回错误时抛出 IpcError"""
+        while True:
+            try:
+                frame = decode_frame(self._conn.recv_bytes())
+            except (OSError, EOFError) as e:
+                raise IpcError(f"连接已断开: {e}") from e
+            if frame.get('id') not in (request_id, None):
+                continue
+            if 'chunk' in frame:
+                yield 'chunk', frame['chunk']
+            elif frame.get('ok'):
+                yield 'done', frame
+                return
+            else:
+                raise IpcError(frame.get('error', "未知错误"))
+
+    def _collect(self, request_id: int) -> Any:
+        items = []
+        for kind, value in self._receive(request_id):
+            if kind == 'chunk':
+                items.extend(value)
+            elif value.get('streamed'):
+                return items
+            else:
+                return value.get('result')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="查询运行中的 Paste for Windows 剪贴板历史")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search = commands.add_parser("search", help="搜索历史")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=20)
+    search.add_argument("--regex", action="store_true", help="按正则表达式搜索")
+
+    recent = commands.add_parser("recent", help="最近的项目")
+    recent.add_argument("--limit", type=int, default=20)
+
+    get = commands.add_parser("get", help="输出项目的完整内容")
+    get.add_argument("id")
+    get.add_argument("--json", action="store_true", help="输出包含元数据的 JSON")
+
+    pin = commands.add_parser("pin", help="收藏（置顶）项目")
+    pin.add_argument("id")
+    pin.add_argument("--off", action="store_true", help="取消收藏")
+
+    paste = commands.add_parser("paste", help="把项目复制到剪贴板")
+    paste.add_argument("id")
+    paste.add_argument("--type", action="store_true", help="同时输入到当前激活窗口")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    try:
+        with IpcClient() as client:
+            if args.command in ("search", "recent"):
+                if args.command == "search":
+                    items = client.stream("search", query=args.query, limit=args.limit,
+                                          mode="regex" if args.regex else "text")
+                else:
+                    items = client.stream("recent", limit=args.limit)
+                for item in items:
+                    preview = item.get('preview', "").replace("\n", " ")
+                    print(f"{item['id']}\t{item['content_type']}\t{preview}", flush=True)
+            elif args.command == "get":
+                item = client.get(args.id)
+                if args.json:
+                    print(json.dumps(item, ensure_ascii=False, indent=2))
+                else:
+                    sys.stdout.write(item['content'])
+            elif args.command == "pin":
+                client.pin(args.id, not args.off)
+            elif args.command == "paste":
+                client.paste(args.id, args.type)
+    except IpcError as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
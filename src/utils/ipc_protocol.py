@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地 IPC 协议
+服务端（运行中的实例）和客户端共用的地址、认证密钥和帧格式，只依赖标准库，客户端导入时不会加载 PyQt6
+
+传输使用 multiprocessing.connection：Windows 上为命名管道，其他平台为 Unix 套接字，
+每帧带长度前缀，连接建立时用数据目录中的密钥文件做 HMAC 质询认证
+
+帧内容为紧凑 JSON：
+- 请求：{"id": 1, "cmd": "search", "args": {"query": "...", "limit": 20}}，
+  也可以一次发送请求列表（批量），服务端按顺序逐个应答
+- 应答：每个请求最后一帧为 {"id": 1, "ok": true, "result": ...} 或 {"id": 1, "ok": false, "error": "..."}；
+  列表结果先分块发送 {"id": 1, "chunk": [...]}，最后一帧为 {"id": 1, "ok": true, "streamed": true, "count": n}
+"""
+
+import getpass
+import json
+import os
+import secrets
+import sys
+from pathlib import Path
+from typing import Any
+
+from .app_paths import get_app_data_dir
+
+PROTOCOL_VERSION = 1
+
+# 支持的命令
+COMMANDS = ("search", "recent", "get", "pin", "paste")
+
+# 列表结果每帧的项目数
+STREAM_CHUNK_SIZE = 50
+
+# 列表结果中内容预览的长度（字符），完整内容用 get 获取
+PREVIEW_CHARS = 200
+
+_AUTHKEY_FILE = "ipc.key"
+_SOCKET_FILE = "ipc.sock"
+
+
+class IpcError(Exception):
+    """IPC 请求失败（连接失败或服务端返回错误）"""
+
+
+def get_ipc_family() -> str:
+    """当前平台使用的连接类型"""
+    return "AF_PIPE" if sys.platform == "win32" else "AF_UNIX"
+
+
+def get_ipc_address() -> str:
+    """当前用户的 IPC 地址"""
+    if sys.platform == "win32":
+        return rf"\\.\pipe\PasteForWindows-{getpass.getuser()}"
+    return str(get_app_data_dir(create=False) / _SOCKET_FILE)
+
+
+def load_authkey(create: bool = False) -> bytes:
+    """读取认证密钥；create 为 True 且不存在时生成（仅当前用户可读）"""
+    key_file = get_app_data_dir(create=create) / _AUTHKEY_FILE
+    if create and not key_file.exists():
+        _write_authkey(key_file)
+    try:
+        return key_file.read_text(encoding="ascii").strip().encode("ascii")
+    except OSError as e:
+        raise IpcError(f"无法读取 IPC 密钥（程序是否在运行？）: {e}") from e
+
+
+def _write_authkey(key_file: Path):
+    try:
+        fd = os.open(str(key_file), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        return  # 其他进程已生成
+    with os.fdopen(fd, "w", encoding="ascii") as f:
+        f.write(secrets.token_hex(32))
+
+
+def encode_frame(data: Any) -> bytes:
+    """编码一帧"""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def decode_frame(frame: bytes) -> Any:
+    """解码一帧"""
+    return json.loads(frame.decode("utf-8"))
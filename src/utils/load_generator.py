@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+合成剪贴板负载模块
+按可配置的大小、类型、重复比例和突发速率生成剪贴板内容并写入剪贴板后端，
+用于在没有桌面环境的情况下测量捕获吞吐量和延迟
+"""
+
+import json
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..core.clipboard_backend import ClipboardBackend
+
+# 默认类型比例
+DEFAULT_TYPE_WEIGHTS = {
+    "text": 0.45,
+    "link": 0.15,
+    "code": 0.15,
+    "json": 0.1,
+    "file": 0.05,
+    "email": 0.05,
+    "number": 0.05,
+}
+
+_WORDS = (
+    "clipboard paste history search item copy window panel meeting project report "
+    "会议 记录 项目 进展 计划 文档 剪贴板 历史 搜索 复制"
+).split()
+
+
+@dataclass
+class Workload:
+    """负载参数"""
+    count: int = 1000  # 写入次数
+    min_size: int = 16  # 内容大小范围（字符），在范围内按对数均匀分布：小内容多、大内容少
+    max_size: int = 4096
+    type_weights: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_TYPE_WEIGHTS))
+    duplicate_ratio: float = 0.2  # 重复复制历史中已有内容的比例
+    rate: float = 200.0  # 突发内每秒写入次数，0 表示不限速
+    burst_size: int = 50  # 每次突发的写入次数
+    burst_pause: float = 0.2  # 两次突发之间的间隔（秒）
+    seed: int = 0
+
+
+class LoadGenerator:
+    """按负载参数生成内容并写入后端（结果由 seed 决定，可重复）"""
+
+    def __init__(self, workload: Workload):
+        self.workload = workload
+
+    def contents(self) -> Iterator[str]:
+        """按顺序生成要写入的内容"""
+        workload = self.workload
+        rng = random.Random(workload.seed)
+        types = list(workload.type_weights)
+        weights = [workload.type_weights[name] for name in types]
+        history: List[str] = []
+
+        for index in range(workload.count):
+            # 重复内容从历史中选取，但不与上一次相同（相同内容不会产生剪贴板变化）
+            if len(history) > 1 and rng.random() < workload.duplicate_ratio:
+                content = rng.choice(history[:-1])
+            else:
+                content_type = rng.choices(types, weights)[0]
+                content = make_content(content_type, self._pick_size(rng), index, rng)
+            history.append(content)
+            yield content
+
+    def _pick_size(self, rng: random.Random) -> int:
+        low = max(1, self.workload.min_size)
+        high = max(low, self.workload.max_size)
+        return int(math.exp(rng.uniform(math.log(low), math.log(high))))
+
+    def schedule(self) -> Iterator[Tuple[float, str]]:
+        """按速率和突发参数生成 (相对开始的秒数, 内容)"""
+        workload = self.workload
+        interval = 1.0 / workload.rate if workload.rate > 0 else 0.0
+        burst_size = max(1, workload.burst_size)
+        offset = 0.0
+        for index, content in enumerate(self.contents()):
+            if index and index % burst_size == 0:
+                offset += workload.burst_pause
+            yield offset, content
+            offset += interval
+
+    def run(self, backend: ClipboardBackend,
+            on_write: Optional[Callable[[int, str, float], None]] = None,
+            stop_event: Optional[threading.Event] = None,
+            wait_captured: Optional[Callable[[int], bool]] = None) -> int:
+        """按速率写入后端，返回写入次数（参数见 play_schedule）"""
+        return play_schedule(backend, self.schedule(), on_write, stop_event, wait_captured)
+
+
+def play_schedule(backend: ClipboardBackend, schedule: Iterable[Tuple[float, str]],
+                  on_write: Optional[Callable[[int, str, float], None]] = None,
+                  stop_event: Optional[threading.Event] = None,
+                  wait_captured: Optional[Callable[[int], bool]] = None) -> int:
+    """按 (相对开始的秒数, 内容) 依次写入后端，返回写入次数
+
+    落后于计划时不补等待，立即写入；
+    on_write(sequence, content, written_at) 在每次写入后调用，written_at 为 time.monotonic()；
+    wait_captured(written) 给出时，每次写入后等待监听方取走前 written 次写入再继续，
+    避免两次检查之间的连续写入被合并为一次捕获，返回 False（超时）时停止写入
+    """
+    started = time.monotonic()
+    written = 0
+    for offset, content in schedule:
+        if stop_event is not None and stop_event.is_set():
+            break
+
+        delay = started + offset - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+        backend.write_text(content)
+        written_at = time.monotonic()
+        written += 1
+        if on_write is not None:
+            on_write(backend.get_sequence_number(), content, written_at)
+        if wait_captured is not None and not wait_captured(written):
+            break
+    return written
+
+
+def make_content(content_type: str, size: int, index: int, rng: random.Random) -> str:
+    """生成指定类型、大约 size 个字符的内容；index 使每条内容唯一"""
+    if content_type == "link":
+        path = "/".join(rng.choice(_WORDS[:12]) for _ in range(max(1, size // 12)))
+        return f"https://example.com/{index}/{path}"[:max(size, 24)]
+
+    if content_type == "code":
+        lines = []
+        length = 0
+        line_no = 0
+        while length < size:
+            line = f"def handler_{index}_{line_no}(value):\n    return value + {line_no}\n"
+            lines.append(line)
+            length += len(line)
+            line_no += 1
+        return "".join(lines)
+
+    if content_type == "json":
+        rows = []
+        length = 0
+        while length < size:
+            row = {"id": index, "seq": len(rows), "name": rng.choice(_WORDS)}
+            rows.append(row)
+            length += 40
+        return json.dumps(rows, ensure_ascii=False)
+
+    if content_type == "file":
+        return f"C:\\Users\\bench\\Documents\\{rng.choice(_WORDS[:12])}_{index}.docx"
+
+    if content_type == "email":
+        return f"user{index}@example.com"
+
+    if content_type == "number":
+        return f"{index}{rng.randint(0, 999_999)}.{rng.randint(0, 99)}"
+
+    words = [f"#{index}"]
+    length = len(words[0])
+    while length < size:
+        word = rng.choice(_WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动耗时跟踪
+记录启动过程中各阶段完成的时间（相对于本模块被导入的时间，入口处最先导入），
+用于确认托盘出现、历史加载等阶段的耗时
+
+- 设置环境变量 PASTE_STARTUP_TRACE=<文件路径> 时，启动完成后把结果写为 JSON
+- 调试模式（debug_mode）下启动完成后打印各阶段耗时
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+# 环境变量：启动完成后写入 JSON 结果的路径
+TRACE_ENV = "PASTE_STARTUP_TRACE"
+
+# 托盘出现的目标耗时（毫秒）
+TIME_TO_TRAY_TARGET_MS = 300
+
+
+class StartupTrace:
+    """启动阶段计时"""
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self._marks: List[Tuple[str, float]] = []  # (阶段名, 相对开始的秒数)
+        self._spans: Dict[str, float] = {}  # 阶段名 -> 耗时（秒）
+        self._finished = False
+
+    def mark(self, phase: str):
+        """记录阶段完成（同名阶段只记录第一次）"""
+        if self._finished or any(name == phase for name, _ in self._marks):
+            return
+        self._marks.append((phase, time.perf_counter() - self._started))
+
+    @contextmanager
+    def span(self, phase: str):
+        """记录一段操作的耗时，并在结束时记录阶段完成"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            if not self._finished:
+                self._spans[phase] = time.perf_counter() - started
+            self.mark(phase)
+
+    def since_start_ms(self) -> float:
+        """当前相对开始的毫秒数（启动完成后仍可用于测量后续操作）"""
+        return (time.perf_counter() - self._started) * 1000
+
+    def elapsed_ms(self, phase: str) -> Optional[float]:
+        """阶段完成时相对开始的毫秒数，未记录时返回 None"""
+        for name, offset in self._marks:
+            if name == phase:
+                return offset * 1000
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'phases': [
+                {
+                    'phase': name,
+                    'at_ms': round(offset * 1000, 2),
+                    'duration_ms': round(self._spans[name] * 1000, 2) if name in self._spans else None
+                }
+                for name, offset in self._marks
+            ],
+            'time_to_tray_ms': self.elapsed_ms("tray_visible"),
+            'time_to_tray_target_ms': TIME_TO_TRAY_TARGET_MS
+        }
+
+    def finish(self, verbose: bool = False):
+        """启动完成：停止记录，按环境变量写出结果，verbose 时打印"""
+        if self._finished:
+            return
+        self.mark("startup_complete")
+        self._finished = True
+
+        output = os.environ.get(TRACE_ENV)
+        if output:
+            try:
+                with open(output, 'w', encoding='utf-8') as f:
+                    json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+            except OSError as e:
+                print(f"⚠️ 写入启动耗时失败: {e}")
+
+        if verbose:
+            self.print_report()
+
+    def print_report(self):
+        """打印各阶段耗时"""
+        print("⏱️ 启动耗时:")
+        for phase in self.to_dict()['phases']:
+            duration = f"（{phase['duration_ms']:.1f} ms）" if phase['duration_ms'] is not None else ""
+            print(f"   {phase['at_ms']:>8.1f} ms  {phase['phase']}{duration}")
+        time_to_tray = self.elapsed_ms("tray_visible")
+        if time_to_tray is not None:
+            status = "✅" if time_to_tray <= TIME_TO_TRAY_TARGET_MS else "⚠️"
+            print(f"   {status} 托盘出现 {time_to_tray:.0f} ms（目标 {TIME_TO_TRAY_TARGET_MS} ms）")
+
+
+# 全局启动跟踪实例
+startup_trace = StartupTrace()
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试公共配置
+"""
+
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径（直接运行 pytest 时 src 也可导入）
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+缓存管理模块测试
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.data.cache_manager import ContentPager, QueryCache
+
+
+def make_item(item_id: str, content: str = "", size_bytes: int = 0):
+    return SimpleNamespace(id=item_id, content=content, size_bytes=size_bytes)
+
+
+def contains(text: str):
+    return lambda item: text in item.content
+
+
+class FakeDatabase:
+    """只提供 get_item_content 的数据库，记录读取次数"""
+
+    def __init__(self, contents):
+        self.contents = contents
+        self.reads = 0
+
+    def get_item_content(self, item_id):
+        self.reads += 1
+        return self.contents.get(item_id)
+
+
+@pytest.fixture
+def database():
+    return FakeDatabase({"a": "a" * 40, "b": "b" * 40, "c": "c" * 40, "big": "x" * 200})
+
+
+@pytest.mark.unit
+def test_query_cache_get_and_put():
+    cache = QueryCache()
+    assert cache.get("q") is None
+
+    results = [make_item("1", "apple")]
+    cache.put("q", results, contains("apple"))
+    cached = cache.get("q")
+    assert cached == results
+    # 返回副本，调用方修改不影响缓存
+    cached.clear()
+    assert cache.get("q") == results
+
+    stats = cache.get_stats()
+    assert stats['hits'] == 2
+    assert stats['misses'] == 1
+
+
+@pytest.mark.unit
+def test_query_cache_lru_eviction():
+    cache = QueryCache(max_entries=2)
+    cache.put("a", [], contains("a"))
+    cache.put("b", [], contains("b"))
+    cache.get("a")  # a 变为最近使用
+    cache.put("c", [], contains("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") == []
+    assert cache.get("c") == []
+    assert cache.get_stats()['evictions'] == 1
+
+    cache.set_max_entries(1)
+    assert cache.get_stats()['entries'] == 1
+    assert cache.get("c") == []
+
+
+@pytest.mark.unit
+def test_item_added_invalidates_only_matching_entries():
+    cache = QueryCache()
+    cache.put("apple", [make_item("1", "apple pie")], contains("apple"))
+    cache.put("pear", [make_item("2", "pear")], contains("pear"))
+
+    cache.on_item_added(make_item("3", "green apple"))
+
+    assert cache.get("apple") is None
+    assert cache.get("pear") is not None
+    assert cache.get_stats()['invalidations'] == 1
+
+
+@pytest.mark.unit
+def test_item_updated_invalidates_only_update_sensitive_entries():
+    cache = QueryCache()
+    item = make_item("1", "apple")
+    cache.put("by_time", [item], contains("apple"), update_sensitive=True)
+    cache.put("by_position", [item], contains("apple"))
+    cache.put("other", [], contains("pear"), update_sensitive=True)
+
+    cache.on_item_updated(item)
+
+    assert cache.get("by_time") is None
+    assert cache.get("by_position") == [item]
+    assert cache.get("other") == []
+
+
+@pytest.mark.unit
+def test_item_removed_invalidates_entries_containing_it():
+    cache = QueryCache()
+    cache.put("a", [make_item("1", "apple"), make_item("2", "apricot")], contains("ap"))
+    cache.put("b", [make_item("3", "banana")], contains("banana"))
+    # item_ids 可以显式给出（如结果只是内容片段）
+    cache.put("c", ["snippet"], contains("x"), item_ids=["2"])
+
+    cache.on_item_removed("2")
+
+    assert cache.get("a") is None
+    assert cache.get("c") is None
+    assert cache.get("b") is not None
+
+
+@pytest.mark.unit
+def test_query_cache_clear():
+    cache = QueryCache()
+    cache.put("a", [], contains("a"))
+    cache.put("b", [], contains("b"))
+    cache.clear()
+
+    stats = cache.get_stats()
+    assert stats['entries'] == 0
+    assert stats['invalidations'] == 2
+
+
+@pytest.mark.unit
+def test_pager_caches_loaded_content(database):
+    pager = ContentPager(database, max_bytes=100)
+    item = make_item("a", size_bytes=40)
+
+    assert pager.load(item) == "a" * 40
+    assert pager.load(item) == "a" * 40
+    assert database.reads == 1
+
+    stats = pager.get_stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['cached_bytes'] == 40
+
+
+@pytest.mark.unit
+def test_pager_evicts_least_recently_used_over_budget(database):
+    pager = ContentPager(database, max_bytes=100)
+    a, b, c = make_item("a", size_bytes=40), make_item("b", size_bytes=40), make_item("c", size_bytes=40)
+
+    pager.load(a)
+    pager.load(b)
+    pager.load(a)  # a 变为最近使用
+    pager.load(c)  # 120 字节超出上限，淘汰 b
+
+    stats = pager.get_stats()
+    assert stats['cached_bytes'] == 80
+    assert stats['entries'] == 2
+    assert stats['evictions'] == 1
+
+    reads = database.reads
+    pager.load(a)
+    assert database.reads == reads
+    pager.load(b)
+    assert database.reads == reads + 1
+
+
+@pytest.mark.unit
+def test_pager_does_not_cache_items_larger_than_budget(database):
+    pager = ContentPager(database, max_bytes=100)
+    pager.load(make_item("a", size_bytes=40))
+    assert pager.load(make_item("big", size_bytes=200)) == "x" * 200
+
+    stats = pager.get_stats()
+    assert stats['cached_bytes'] == 40
+    assert stats['evictions'] == 0
+
+
+@pytest.mark.unit
+def test_pager_read_through_does_not_cache(database):
+    pager = ContentPager(database, max_bytes=100)
+    assert pager.read_through(make_item("a", size_bytes=40)) == "a" * 40
+    assert pager.get_stats()['entries'] == 0
+
+    # 已缓存的内容直接返回，不读数据库
+    pager.load(make_item("b", size_bytes=40))
+    reads = database.reads
+    assert pager.read_through(make_item("b", size_bytes=40)) == "b" * 40
+    assert database.reads == reads
+
+    assert pager.read_through(make_item("missing")) == ""
+
+
+@pytest.mark.unit
+def test_pager_discard_and_resize_keep_byte_count(database):
+    pager = ContentPager(database, max_bytes=100)
+    pager.load(make_item("a", size_bytes=40))
+    pager.load(make_item("b", size_bytes=40))
+
+    pager.discard("a")
+    pager.discard("a")  # 重复丢弃不重复扣减
+    pager.discard("unknown")
+    assert pager.get_stats()['cached_bytes'] == 40
+
+    pager.load(make_item("c", size_bytes=40))
+    pager.set_max_bytes(50)
+    stats = pager.get_stats()
+    assert stats['cached_bytes'] == 40
+    assert stats['entries'] == 1
+
+    pager.set_max_bytes(0)
+    assert pager.get_stats()['cached_bytes'] == 0
+
+    pager.set_max_bytes(100)
+    pager.load(make_item("a", size_bytes=40))
+    pager.clear()
+    stats = pager.get_stats()
+    assert stats['cached_bytes'] == 0
+    assert stats['entries'] == 0
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+捕获日志写入器测试
+"""
+
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.utils import capture_log
+from src.utils.capture_log import LOG_PREVIEW_CHARS, CaptureLogWriter
+
+# 等待写入线程的最长时间（秒）
+WAIT_TIMEOUT = 5.0
+
+
+def wait_until(condition):
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while not condition():
+        assert time.monotonic() < deadline, "等待写入线程超时"
+        time.sleep(0.005)
+
+
+def log_files(path):
+    return sorted(p.name for p in path.parent.iterdir())
+
+
+@pytest.mark.unit
+def test_writes_records_and_truncates_preview(tmp_path):
+    writer = CaptureLogWriter(tmp_path / "clipboard_changes.log", flush_interval=0.01)
+    writer.log("hello", "文本")
+    writer.log("x" * (LOG_PREVIEW_CHARS + 50), "代码")
+    writer.close()
+
+    text = writer.path.read_text(encoding="utf-8")
+    assert "剪贴板内容变化 (文本): hello\n" in text
+    assert "x" * LOG_PREVIEW_CHARS + f"... (总长度: {LOG_PREVIEW_CHARS + 50} 字符)" in text
+    assert "x" * (LOG_PREVIEW_CHARS + 1) not in text
+    assert writer.get_stats()['written'] == 2
+
+
+@pytest.mark.unit
+def test_rotates_by_size_and_keeps_backup_count(tmp_path):
+    writer = CaptureLogWriter(tmp_path / "clipboard_changes.log", max_bytes=500,
+                              backup_count=2, flush_interval=0.01)
+    for index in range(40):
+        writer.log(f"record {index:03d}")
+    writer.close()
+
+    assert log_files(writer.path) == ["clipboard_changes.log", "clipboard_changes.log.1",
+                                      "clipboard_changes.log.2"]
+    stats = writer.get_stats()
+    assert stats['written'] == 40
+    assert stats['rotations'] >= 3
+
+    # 轮转发生在记录之间：每个文件只比上限多出最后一条记录
+    entry_size = len(CaptureLogWriter._format((time.time(), "文本", "record 000", 10)).encode("utf-8"))
+    for name in log_files(writer.path):
+        assert (tmp_path / name).stat().st_size < 500 + entry_size
+
+    # 记录按时间顺序分布：.2 最旧，当前文件最新且包含最后一条
+    numbers = [
+        [int(line.split("record ")[1]) for line in (tmp_path / name).read_text(encoding="utf-8").splitlines()
+         if "record " in line]
+        for name in ("clipboard_changes.log.2", "clipboard_changes.log.1", "clipboard_changes.log")
+    ]
+    flat = [number for numbers_in_file in numbers for number in numbers_in_file]
+    assert flat == sorted(flat)
+    assert flat[-1] == 39
+
+
+@pytest.mark.unit
+def test_rotation_without_backups_truncates(tmp_path):
+    writer = CaptureLogWriter(tmp_path / "clipboard_changes.log", max_bytes=300,
+                              backup_count=0, flush_interval=0.01)
+    for index in range(20):
+        writer.log(f"record {index:03d}")
+    writer.close()
+
+    assert log_files(writer.path) == ["clipboard_changes.log"]
+    assert writer.get_stats()['rotations'] > 0
+    assert "record 019" in writer.path.read_text(encoding="utf-8")
+
+
+@pytest.mark.unit
+def test_rotates_by_time(tmp_path):
+    writer = CaptureLogWriter(tmp_path / "clipboard_changes.log", max_bytes=0,
+                              rotate_interval=0.05, flush_interval=0.01)
+    writer.log("first")
+    wait_until(lambda: writer.written == 1)
+    time.sleep(0.1)
+    writer.log("second")
+    writer.close()
+
+    assert writer.get_stats()['rotations'] == 1
+    assert "first" in (tmp_path / "clipboard_changes.log.1").read_text(encoding="utf-8")
+    current = writer.path.read_text(encoding="utf-8")
+    assert "second" in current and "first" not in current
+
+
+@pytest.mark.unit
+def test_reopened_old_log_rotates_by_age(tmp_path):
+    """程序重启后打开旧日志，按第一条记录的时间而不是打开时间计算文件年龄"""
+    path = tmp_path / "clipboard_changes.log"
+    old_entry = CaptureLogWriter._format(((datetime.now() - timedelta(hours=2)).timestamp(), "文本", "old", 3))
+    path.write_text(old_entry, encoding="utf-8")
+    # 最近还有追加，修改时间是新的
+    os.utime(path)
+
+    writer = CaptureLogWriter(path, max_bytes=0, rotate_interval=3600, flush_interval=0.01)
+    writer.log("new")
+    writer.close()
+
+    assert writer.get_stats()['rotations'] == 1
+    assert (tmp_path / "clipboard_changes.log.1").read_text(encoding="utf-8") == old_entry
+    assert "new" in path.read_text(encoding="utf-8")
+
+    # 轮转后的新文件从现在开始计时，再次打开不会立即轮转
+    writer = CaptureLogWriter(path, max_bytes=0, rotate_interval=3600, flush_interval=0.01)
+    writer.log("newer")
+    writer.close()
+    assert writer.get_stats()['rotations'] == 0
+
+
+@pytest.mark.unit
+def test_recent_log_is_not_rotated_on_reopen(tmp_path):
+    path = tmp_path / "clipboard_changes.log"
+    path.write_text(CaptureLogWriter._format((time.time() - 60, "文本", "recent", 6)), encoding="utf-8")
+
+    writer = CaptureLogWriter(path, max_bytes=0, rotate_interval=3600, flush_interval=0.01)
+    writer.log("new")
+    writer.close()
+
+    assert writer.get_stats()['rotations'] == 0
+    assert "recent" in path.read_text(encoding="utf-8")
+
+
+@pytest.mark.unit
+def test_appends_to_existing_log(tmp_path):
+    path = tmp_path / "clipboard_changes.log"
+    path.write_text("x" * 1000, encoding="utf-8")
+
+    writer = CaptureLogWriter(path, max_bytes=500, flush_interval=0.01)
+    writer.log("new")
+    writer.close()
+
+    # 已有文件超出上限，第一条记录写入前即轮转
+    assert (tmp_path / "clipboard_changes.log.1").read_text(encoding="utf-8") == "x" * 1000
+    assert "new" in path.read_text(encoding="utf-8")
+
+
+@pytest.mark.unit
+def test_restarts_after_open_failure(tmp_path, monkeypatch):
+    monkeypatch.setattr(capture_log, "RESTART_INTERVAL", 0.0)
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("", encoding="utf-8")
+
+    writer = CaptureLogWriter(blocker / "clipboard_changes.log", flush_interval=0.01)
+    writer.log("lost")
+    wait_until(lambda: writer.errors == 1)
+    wait_until(lambda: writer._thread is None)
+
+    # 写入线程退出后队列中的记录保留，路径可用时重新启动并写入
+    writer.path = tmp_path / "clipboard_changes.log"
+    writer.log("kept")
+    writer.close()
+
+    text = writer.path.read_text(encoding="utf-8")
+    assert "lost" in text and "kept" in text
+    assert writer.get_stats()['errors'] == 1
+
+
+@pytest.mark.unit
+def test_close_is_idempotent(tmp_path):
+    writer = CaptureLogWriter(tmp_path / "clipboard_changes.log")
+    writer.close()  # 从未启动
+
+    writer.log("once")
+    writer.close()
+    writer.close()
+    assert writer.get_stats()['written'] == 1
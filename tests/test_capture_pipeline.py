@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+捕获流水线测试
+"""
+
+import threading
+
+import pytest
+
+from src.core.capture_pipeline import (
+    BLOCK, DROP_OLDEST, CapturePipeline, CaptureRecord, PipelineStage
+)
+
+# 等待工作线程的最长时间（秒）
+WAIT_TIMEOUT = 5.0
+
+
+def drain(stage: PipelineStage) -> list:
+    """取出阶段队列中的全部记录"""
+    records = []
+    while stage.get_stats()['queued']:
+        record, _ = stage.get()
+        records.append(record)
+    return records
+
+
+@pytest.mark.unit
+def test_drop_oldest_keeps_newest_records():
+    stage = PipelineStage("capture", lambda record: record, capacity=3, policy=DROP_OLDEST)
+    for value in range(5):
+        assert stage.put(value)
+
+    assert drain(stage) == [2, 3, 4]
+    assert stage.get_stats()['dropped'] == 2
+
+
+@pytest.mark.unit
+def test_block_policy_waits_for_space():
+    stage = PipelineStage("store", lambda record: record, capacity=1, policy=BLOCK)
+    stage.put("first")
+
+    finished = threading.Event()
+
+    def producer():
+        stage.put("second")
+        finished.set()
+
+    thread = threading.Thread(target=producer, daemon=True)
+    thread.start()
+    assert not finished.wait(0.1)
+
+    assert stage.get()[0] == "first"
+    assert finished.wait(WAIT_TIMEOUT)
+    assert stage.get()[0] == "second"
+    assert stage.get_stats()['dropped'] == 0
+
+
+@pytest.mark.unit
+def test_records_flow_through_stages_in_order():
+    results = []
+    done = threading.Event()
+
+    def collect(record):
+        results.append(record)
+        if len(results) == 10:
+            done.set()
+
+    pipeline = CapturePipeline([
+        PipelineStage("double", lambda value: value * 2, policy=DROP_OLDEST),
+        PipelineStage("skip_odd", lambda value: value if value % 4 else None),
+        PipelineStage("collect", collect),
+    ])
+    pipeline.start()
+    try:
+        for value in range(20):
+            assert pipeline.submit(value)
+        assert done.wait(WAIT_TIMEOUT)
+    finally:
+        pipeline.stop()
+
+    assert results == [value * 2 for value in range(20) if (value * 2) % 4]
+    stats = pipeline.get_stats()
+    assert stats['submitted'] == 20
+    assert stats['stages']['double']['processed'] == 20
+    assert stats['stages']['collect']['processed'] == 10
+
+
+@pytest.mark.unit
+def test_backpressure_from_slow_stage_drops_at_entry():
+    """下游阻塞时压力传回入口，入口丢弃最早的捕获，捕获线程不等待"""
+    release = threading.Event()
+    seen = []
+
+    def slow(record):
+        release.wait(WAIT_TIMEOUT)
+        seen.append(record)
+
+    pipeline = CapturePipeline([
+        PipelineStage("capture", lambda value: value, capacity=2, policy=DROP_OLDEST),
+        PipelineStage("slow", slow, capacity=1),
+    ])
+    pipeline.start()
+    try:
+        for value in range(50):
+            assert pipeline.submit(value)
+        release.set()
+    finally:
+        pipeline.stop()
+
+    stats = pipeline.get_stats()['stages']
+    # 在途记录数不超过各阶段容量之和（加上各工作线程手中的一条）
+    assert len(seen) <= 2 + 1 + 2
+    assert stats['capture']['dropped'] == 50 - stats['capture']['processed']
+    assert stats['capture']['dropped'] > 0
+    # 最新的捕获总能进入流水线
+    assert seen[-1] == 49
+
+
+@pytest.mark.unit
+def test_stop_drains_queued_records():
+    seen = []
+    pipeline = CapturePipeline([
+        PipelineStage("first", lambda value: value),
+        PipelineStage("second", seen.append),
+    ])
+    pipeline.start()
+    for value in range(100):
+        pipeline.submit(value)
+    pipeline.stop()
+
+    assert seen == list(range(100))
+    assert not pipeline.is_running
+    assert not pipeline.submit(100)
+
+
+@pytest.mark.unit
+def test_stop_and_restart():
+    seen = []
+    pipeline = CapturePipeline([PipelineStage("only", seen.append)])
+    pipeline.start()
+    pipeline.submit(1)
+    pipeline.stop()
+    pipeline.stop()  # 重复停止无副作用
+
+    pipeline.start()
+    assert not pipeline.closing
+    pipeline.submit(2)
+    pipeline.stop()
+    assert seen == [1, 2]
+
+
+@pytest.mark.unit
+def test_handler_error_skips_record_and_keeps_running():
+    errors = []
+    seen = []
+
+    def handler(value):
+        if value == 1:
+            raise ValueError("bad record")
+        return value
+
+    pipeline = CapturePipeline(
+        [PipelineStage("check", handler), PipelineStage("collect", seen.append)],
+        on_error=lambda stage, error: errors.append((stage, str(error)))
+    )
+    pipeline.start()
+    for value in range(3):
+        pipeline.submit(value)
+    pipeline.stop()
+
+    assert seen == [0, 2]
+    assert errors == [("check", "bad record")]
+    assert pipeline.get_stats()['stages']['check']['errors'] == 1
+
+
+@pytest.mark.unit
+def test_observer_error_does_not_stop_stage():
+    seen = []
+    observed = []
+
+    def broken_observer(record):
+        raise RuntimeError("observer failed")
+
+    pipeline = CapturePipeline([PipelineStage("first", lambda value: value),
+                                PipelineStage("second", seen.append)])
+    pipeline.add_observer("first", broken_observer)
+    pipeline.add_observer("first", observed.append)
+    pipeline.start()
+    for value in range(3):
+        pipeline.submit(value)
+    pipeline.stop()
+
+    assert seen == [0, 1, 2]
+    assert observed == [0, 1, 2]
+    assert pipeline.get_stats()['stages']['first']['observer_errors'] == 3
+
+    pipeline.remove_observer("first", broken_observer)
+    pipeline.start()
+    pipeline.submit(3)
+    pipeline.stop()
+    assert pipeline.get_stats()['stages']['first']['observer_errors'] == 3
+
+
+@pytest.mark.unit
+def test_record_completion_latency():
+    pipeline = CapturePipeline([PipelineStage("only", lambda value: None)])
+    pipeline.record_completion(CaptureRecord(content="x"))
+
+    stats = pipeline.get_stats()
+    assert stats['completed'] == 1
+    assert stats['max_latency_ms'] >= 0.0
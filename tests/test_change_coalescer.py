@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+变化合并器测试
+直接调用 flush()，不等待合并计时器
+"""
+
+import pytest
+
+pytest.importorskip("PyQt6.QtCore")
+
+from PyQt6.QtCore import QCoreApplication
+
+from src.core.change_coalescer import ChangeCoalescer, ItemChangeBatch
+
+
+@pytest.fixture
+def batches():
+    return []
+
+
+@pytest.fixture
+def coalescer(batches):
+    QCoreApplication.instance() or QCoreApplication([])
+    coalescer = ChangeCoalescer()
+    coalescer.batch_ready.connect(batches.append)
+    return coalescer
+
+
+def flush(coalescer, batches) -> ItemChangeBatch:
+    """发出本批变化并返回（本批必须非空）"""
+    coalescer.flush()
+    assert len(batches) == 1
+    return batches.pop()
+
+
+@pytest.mark.unit
+def test_empty_flush_emits_nothing(coalescer, batches):
+    coalescer.flush()
+    assert batches == []
+
+
+@pytest.mark.unit
+def test_added_then_updated_is_added(coalescer, batches):
+    coalescer.add("a")
+    coalescer.update("a")
+    coalescer.update("a")
+
+    batch = flush(coalescer, batches)
+    assert batch == ItemChangeBatch(added=["a"])
+    assert len(batch) == 1
+
+
+@pytest.mark.unit
+def test_added_then_removed_is_cancelled(coalescer, batches):
+    coalescer.add("a")
+    coalescer.update("a")
+    coalescer.remove("a")
+    coalescer.flush()
+
+    assert batches == []
+
+
+@pytest.mark.unit
+def test_updated_then_removed_is_removed(coalescer, batches):
+    coalescer.update("a")
+    coalescer.remove("a")
+    coalescer.update("a")  # 删除后的更新不再通知
+
+    assert flush(coalescer, batches) == ItemChangeBatch(removed=["a"])
+
+
+@pytest.mark.unit
+def test_removed_then_added_is_replaced(coalescer, batches):
+    coalescer.add("b")
+    coalescer.remove("a")
+    coalescer.add("a")
+
+    # 旧卡片先移除，重新添加的项目排在本批最后（显示在最前）
+    assert flush(coalescer, batches) == ItemChangeBatch(added=["b", "a"], removed=["a"])
+
+    coalescer.remove("c")
+    coalescer.add("c")
+    coalescer.remove("c")
+    assert flush(coalescer, batches) == ItemChangeBatch(removed=["c"])
+
+
+@pytest.mark.unit
+def test_batch_keeps_order_of_first_change(coalescer, batches):
+    for item_id in ("a", "b", "c"):
+        coalescer.add(item_id)
+    coalescer.update("x")
+    coalescer.update("y")
+    coalescer.remove("z")
+    coalescer.update("x")  # 已记录的更新不改变顺序
+    coalescer.remove("w")
+
+    assert flush(coalescer, batches) == ItemChangeBatch(
+        added=["a", "b", "c"], updated=["x", "y"], removed=["z", "w"]
+    )
+
+
+@pytest.mark.unit
+def test_flush_starts_a_new_batch(coalescer, batches):
+    coalescer.add("a")
+    flush(coalescer, batches)
+
+    # 上一批已通知的添加，之后的删除单独通知
+    coalescer.remove("a")
+    assert flush(coalescer, batches) == ItemChangeBatch(removed=["a"])
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+内容分类器测试
+"""
+
+import json
+
+import pytest
+
+from src.core.classifier import (
+    CLASSIFY_SUFFIX_CHARS, ContentClassifier, ContentSample, PrefixRule
+)
+
+
+@pytest.fixture
+def classifier():
+    return ContentClassifier()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("content, expected", [
+    ("https://example.com/path?q=1", "link"),
+    ("  FTP://files.example.com/a.txt", "link"),
+    ("C:\\Users\\me\\file.txt", "file"),
+    ("d:/projects/readme.md", "file"),
+    ("\\\\server\\share\\doc.txt", "file"),
+    ("/usr/local/bin/python3", "file"),
+    ("~/notes/todo.md", "file"),
+    ("550e8400-e29b-41d4-a716-446655440000", "uuid"),
+    ("{550E8400-E29B-41D4-A716-446655440000}", "uuid"),
+    ("#fff", "color"),
+    ("#1a2B3c80", "color"),
+    ("someone@example.com", "email"),
+    ("mailto:first.last+tag@mail.example.org", "email"),
+    ("42", "number"),
+    ("-1,234.50", "number"),
+    ("6.02e23", "number"),
+    ("85%", "number"),
+    ('{"key": "value", "list": [1, 2]}', "json"),
+    ("[1, 2, 3]", "json"),
+    ("[]", "json"),
+    ("def main():\n    pass", "code"),
+    ("x = 1\nif __name__ == '__main__':\n    main()", "code"),
+    ("const $value = 1;", "code"),
+    ("普通的一段文字", "text"),
+    ("hello world", "text"),
+])
+def test_default_rules(classifier, content, expected):
+    assert classifier.classify(content) == expected
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("content", [
+    "#ggg",  # 非十六进制
+    "#12345",  # 长度不合法
+    "1,23",  # 千分位不完整
+    "/",  # 根目录本身不算路径
+    "user@localhost",  # 缺少顶级域名
+])
+def test_near_misses_are_text(classifier, content):
+    assert classifier.classify(content) == "text"
+
+
+@pytest.mark.unit
+def test_empty_and_blank_content(classifier):
+    assert classifier.classify("") == "empty"
+    assert classifier.classify("   \n\t") == "text"
+
+
+@pytest.mark.unit
+def test_exact_rules_require_single_line(classifier):
+    assert classifier.classify("someone@example.com\nsecond line") == "text"
+    assert classifier.classify("12\n34") == "text"
+
+
+@pytest.mark.unit
+def test_keywords_inside_identifiers_are_not_code(classifier):
+    # "undefined " 中包含 "def "，不应判为代码
+    assert classifier.classify("the value is undefined here") == "text"
+    assert classifier.classify("my_class name") == "text"
+
+
+@pytest.mark.unit
+def test_invalid_json_is_not_json(classifier):
+    assert classifier.classify('{"key": }') == "text"
+    assert classifier.classify("{not json}") == "text"
+
+
+@pytest.mark.unit
+def test_large_json_checks_only_prefix_and_suffix():
+    classifier = ContentClassifier(prefix_chars=64)
+    content = json.dumps({"items": list(range(1000))})
+    assert classifier.classify(content) == "json"
+
+    # 超出前缀后不再完整解析，只要首尾括号匹配
+    broken = content[:100] + "oops" + content[100:]
+    assert classifier.classify(broken) == "json"
+    assert classifier.classify(content[:-1]) != "json"
+
+
+@pytest.mark.unit
+def test_code_keyword_beyond_prefix_is_ignored():
+    classifier = ContentClassifier(prefix_chars=32)
+    assert classifier.classify("x" * 100 + " def main():") == "text"
+    assert classifier.classify("def main():" + " x" * 100) == "code"
+
+
+@pytest.mark.unit
+def test_sample_of_large_content():
+    content = "  head" + "x" * 100 + "tail  "
+    sample = ContentSample(content, prefix_chars=10)
+    assert not sample.complete
+    assert not sample.is_single_line
+    assert sample.head == "headxxxx"  # 前缀去掉开头空白
+    assert sample.tail.endswith("tail")
+    assert len(sample.tail) <= CLASSIFY_SUFFIX_CHARS
+    assert sample.length == len(content)
+
+
+@pytest.mark.unit
+def test_add_rule_order_and_cache_reset(classifier):
+    assert classifier.classify("TODO: buy milk", content_hash="h1") == "text"
+
+    classifier.add_rule(PrefixRule("todo", r"TODO:"), index=0)
+    assert classifier.get_stats()['cache_entries'] == 0
+    assert classifier.classify("TODO: buy milk", content_hash="h1") == "todo"
+
+    # 追加到末尾的规则排在默认规则之后
+    classifier.add_rule(PrefixRule("late", r"https"))
+    assert classifier.classify("https://example.com") == "link"
+
+
+@pytest.mark.unit
+def test_cache_by_hash():
+    classifier = ContentClassifier(cache_size=2)
+    assert classifier.classify("42", content_hash="a") == "number"
+    # 同一哈希直接返回缓存结果，不再分类
+    assert classifier.classify("not a number", content_hash="a") == "number"
+    assert classifier.cache_hits == 1
+
+    classifier.classify("x", content_hash="b")
+    classifier.classify("y", content_hash="c")
+    stats = classifier.get_stats()
+    assert stats['cache_entries'] == 2
+    assert classifier.classify("not a number", content_hash="a") == "text"
+
+    classifier.clear_cache()
+    assert classifier.get_stats()['cache_entries'] == 0
+
+
+@pytest.mark.unit
+def test_cache_disabled():
+    classifier = ContentClassifier(cache_size=0)
+    classifier.classify("42", content_hash="a")
+    assert classifier.get_stats()['cache_entries'] == 0
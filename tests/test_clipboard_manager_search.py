@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+剪贴板管理器搜索测试
+大内容超出搜索前缀的部分、以及已换出的项目都在数据库中查找
+"""
+
+import pytest
+
+pytest.importorskip("PyQt6.QtCore")
+
+from PyQt6.QtCore import QCoreApplication
+
+from src.core.clipboard_backend import InMemoryClipboardBackend
+from src.core.clipboard_manager import ClipboardManager
+from src.core.payload import PAYLOAD_CHUNK_CHARS, SEARCH_PREFIX_CHARS
+from src.data.database import DatabaseManager
+from src.data.models import ClipboardItem
+
+# 大内容中各 needle 的位置：开头、两个分块边界（跨边界）和末尾
+NEEDLES = {
+    "HeadNeedle": 100,
+    "FirstSeam": PAYLOAD_CHUNK_CHARS - 4,
+    "SecondSeam": 2 * PAYLOAD_CHUNK_CHARS - 6,
+}
+TAIL_NEEDLE = "TailNeedle"
+LARGE_CONTENT_CHARS = 3 * PAYLOAD_CHUNK_CHARS - 1000
+
+
+def build_large_content() -> str:
+    content = ["x"] * LARGE_CONTENT_CHARS
+    for needle, position in NEEDLES.items():
+        content[position:position + len(needle)] = needle
+    content[-len(TAIL_NEEDLE):] = TAIL_NEEDLE
+    return "".join(content)
+
+
+@pytest.fixture
+def qt_app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture(params=["resident", "paged_out"])
+def manager(request, qt_app, tmp_path):
+    """历史中有一个大内容项目和一个小项目，按参数常驻内存或全部换出"""
+    database = DatabaseManager(str(tmp_path / "clipboard.db"))
+    database.save_item(ClipboardItem("big", build_large_content()))
+    database.save_item(ClipboardItem("small", "small item"))
+
+    manager = ClipboardManager(backend=InMemoryClipboardBackend())
+    manager.configure_capture_log(False, 0, 0, 0)
+    manager.set_database_manager(database)
+    manager.load_from_database()
+    if request.param == "paged_out":
+        manager.set_memory_budget(1)
+    assert manager.get_item("big").is_resident == (request.param == "resident")
+
+    yield manager
+    manager.shutdown()
+    database.close()
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("needle", [*NEEDLES, TAIL_NEEDLE])
+def test_large_item_is_found_anywhere_in_content(manager, needle):
+    matches = manager.search_matches(needle.lower())
+    assert [match.item_id for match in matches] == ["big"]
+
+    # 命中位置指向完整内容中的 needle
+    start, end = matches[0].offsets[0]
+    assert manager.get_item("big").content[start:end] == needle
+
+
+@pytest.mark.integration
+def test_large_item_beyond_search_prefix_is_found(manager):
+    assert NEEDLES["SecondSeam"] > SEARCH_PREFIX_CHARS
+    assert [item.id for item in manager.search_items("secondseam")] == ["big"]
+    assert manager.search_items("nosuchneedle") == []
+
+
+@pytest.mark.integration
+def test_small_item_is_found(manager):
+    assert [item.id for item in manager.search_items("small item")] == ["small"]
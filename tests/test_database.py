@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+数据库管理器测试
+"""
+
+import sqlite3
+
+import pytest
+
+from src.core.payload import PAYLOAD_CHUNK_CHARS
+from src.data.database import DatabaseManager
+from src.data.models import ClipboardItem
+
+# 跨越两个分块边界的大内容长度
+LARGE_CONTENT_CHARS = 3 * PAYLOAD_CHUNK_CHARS - 1000
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = DatabaseManager(str(tmp_path / "clipboard.db"))
+    yield database
+    database.close()
+
+
+def count_rows(database: DatabaseManager, table: str) -> int:
+    """用独立连接统计表中的行数"""
+    with sqlite3.connect(str(database.db_path)) as connection:
+        return connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def large_content(needle: str, position: int, length: int = LARGE_CONTENT_CHARS) -> str:
+    """由 "x" 组成、在 position 处放入 needle 的大内容"""
+    return "x" * position + needle + "x" * (length - position - len(needle))
+
+
+@pytest.mark.unit
+def test_chunked_content_round_trip(database):
+    content = "".join(f"{index:08d}\n" for index in range(LARGE_CONTENT_CHARS // 9))
+    assert len(content) > 2 * PAYLOAD_CHUNK_CHARS
+    item = ClipboardItem("big", content)
+
+    assert database.save_item(item)
+    assert database.get_item_content("big") == content
+    assert database.get_item("big").content == content
+
+    # 内容变短后不再分块，旧的分块被删除
+    item = ClipboardItem("big", "short")
+    assert database.save_item(item)
+    assert database.get_item_content("big") == "short"
+    assert database.search_item_ids("00000001", ["big"]) == set()
+
+
+@pytest.mark.unit
+def test_search_finds_needle_at_end_of_content(database):
+    needle = "TailNeedle"
+    database.save_item(ClipboardItem("big", large_content(needle, LARGE_CONTENT_CHARS - len(needle))))
+    database.save_item(ClipboardItem("small", "small tailneedle"))
+
+    assert database.search_item_ids("tailneedle", ["big", "small"]) == {"big", "small"}
+    assert database.search_item_ids("tailneedle", ["big"]) == {"big"}
+    assert database.search_item_ids("othertext", ["big", "small"]) == set()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("seam", [1, 2])
+@pytest.mark.parametrize("split", [1, 5, 9])
+def test_search_finds_needle_across_chunk_seam(database, seam, split):
+    """needle 的前 split 个字符在前一块末尾，其余在下一块开头"""
+    needle = "SeamNeedle"
+    position = seam * PAYLOAD_CHUNK_CHARS - split
+    database.save_item(ClipboardItem("big", large_content(needle, position)))
+
+    assert database.search_item_ids("seamneedle", ["big"]) == {"big"}
+    assert database.search_item_ids("SEAMNEEDLE", ["big"]) == {"big"}
+    # 连同两侧字符的更长查询同样跨越边界
+    assert database.search_item_ids("xxseamneedlexx", ["big"]) == {"big"}
+    assert database.search_item_ids("seamneedlf", ["big"]) == set()
+
+
+@pytest.mark.unit
+def test_search_does_not_join_non_adjacent_chunks(database):
+    # "ab" 只在第一块末尾有 "a"、第三块开头有 "b"
+    content = ("x" * (PAYLOAD_CHUNK_CHARS - 1) + "a"
+               + "y" * PAYLOAD_CHUNK_CHARS
+               + "b" + "x" * (PAYLOAD_CHUNK_CHARS - 1))
+    database.save_item(ClipboardItem("big", content))
+
+    assert database.search_item_ids("ay", ["big"]) == {"big"}
+    assert database.search_item_ids("yb", ["big"]) == {"big"}
+    assert database.search_item_ids("ab", ["big"]) == set()
+
+
+@pytest.mark.unit
+def test_search_escapes_like_wildcards(database):
+    database.save_item(ClipboardItem("percent", "100% done"))
+    database.save_item(ClipboardItem("underscore", "snake_case"))
+    database.save_item(ClipboardItem("plain", "1000 done snakeXcase"))
+
+    ids = ["percent", "underscore", "plain"]
+    assert database.search_item_ids("0% d", ids) == {"percent"}
+    assert database.search_item_ids("e_c", ids) == {"underscore"}
+    assert database.search_item_ids("\\", ids) == set()
+
+
+@pytest.mark.unit
+def test_search_only_in_given_items(database):
+    database.save_item(ClipboardItem("a", "needle"))
+    database.save_item(ClipboardItem("b", "needle"))
+
+    assert database.search_item_ids("needle", ["a"]) == {"a"}
+    assert database.search_item_ids("needle", []) == set()
+
+
+@pytest.mark.unit
+def test_shared_format_blob_is_kept_until_last_item_is_deleted(database):
+    html = b"<b>shared</b>"
+    database.save_item(ClipboardItem("a", "shared"))
+    database.save_item(ClipboardItem("b", "shared again"))
+    assert database.save_item_formats("a", {"HTML Format": html, "Rich Text Format": b"{\\rtf1 a}"})
+    assert database.save_item_formats("b", {"HTML Format": html})
+
+    # 相同数据只存一份
+    assert count_rows(database, "format_blobs") == 2
+    assert database.get_item_formats("b") == {"HTML Format": html}
+
+    # 删除其中一个项目：只被它引用的数据删除，共享的数据保留
+    assert database.delete_item("a")
+    assert count_rows(database, "format_blobs") == 1
+    assert database.get_item_formats("a") == {}
+    assert database.get_item_formats("b") == {"HTML Format": html}
+
+    assert database.delete_item("b")
+    assert count_rows(database, "format_blobs") == 0
+    assert count_rows(database, "item_formats") == 0
+
+
+@pytest.mark.unit
+def test_resaving_item_keeps_its_formats(database):
+    database.save_item(ClipboardItem("a", "text"))
+    database.save_item_formats("a", {"HTML Format": b"<i>text</i>"})
+
+    # UPSERT 更新项目，不级联删除已保存的附加格式
+    database.save_item(ClipboardItem("a", "text", access_count=3))
+    assert database.get_item_formats("a") == {"HTML Format": b"<i>text</i>"}
+    assert database.get_item_formats("a", ["Rich Text Format"]) == {}
+
+
+@pytest.mark.unit
+def test_delete_missing_item_keeps_blobs(database):
+    database.save_item(ClipboardItem("a", "text"))
+    database.save_item_formats("a", {"HTML Format": b"<i>text</i>"})
+
+    assert not database.delete_item("missing")
+    assert count_rows(database, "format_blobs") == 1
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IPC 服务测试
+用替身剪贴板管理器在临时 Unix 套接字上运行 IpcServer，通过真实连接收发帧
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PyQt6.QtCore")
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="测试使用 AF_UNIX 套接字")
+
+from PyQt6.QtCore import QCoreApplication
+
+from src.core.ipc_server import MAX_RESULTS, IpcServer
+from src.core.search_engine import SearchMatch
+from src.data.models import ClipboardItem
+from src.utils.ipc_client import IpcClient
+from src.utils.ipc_protocol import STREAM_CHUNK_SIZE, IpcError, decode_frame, encode_frame
+
+AUTHKEY = b"k" * 32
+
+# 等待客户端请求完成的最长时间（秒）
+WAIT_TIMEOUT = 10.0
+
+
+class StubManager:
+    """只实现 IPC 命令用到的接口的剪贴板管理器"""
+
+    def __init__(self, count: int):
+        self.items = [ClipboardItem(f"id{index}", f"item {index}") for index in range(count)]
+        self.limits = []
+        self.copied = []
+        self.favorites = {}
+
+    def get_recent_items(self, limit):
+        self.limits.append(limit)
+        return self.items[:limit]
+
+    def search_matches(self, query, limit, mode):
+        self.limits.append(limit)
+        matches = [item for item in self.items if query in item.content][:limit]
+        return [SearchMatch(item, snippet=item.content) for item in matches]
+
+    def get_item(self, item_id):
+        if item_id == "broken":
+            raise TypeError("manager bug")
+        return next((item for item in self.items if item.id == item_id), None)
+
+    def set_favorite(self, item_id, favorite):
+        self.favorites[item_id] = favorite
+
+    def copy_to_clipboard(self, item):
+        self.copied.append(item.id)
+
+    def record_access(self, item):
+        pass
+
+
+@pytest.fixture
+def qt_app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def manager():
+    return StubManager(120)
+
+
+@pytest.fixture
+def server(qt_app, manager):
+    # Unix 套接字路径长度有限，不使用 pytest 较长的 tmp_path
+    work_dir = tempfile.mkdtemp(prefix="ipc_")
+    server = IpcServer(manager, address=str(Path(work_dir) / "ipc.sock"), authkey=AUTHKEY)
+    assert server.start()
+    yield server
+    server.stop()
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def run_client(qt_app, func):
+    """在另一个线程中运行客户端，主线程处理事件，使服务端转到管理器线程的调用得以执行"""
+    with ThreadPoolExecutor(1) as pool:
+        future = pool.submit(func)
+        deadline = time.monotonic() + WAIT_TIMEOUT
+        while not future.done():
+            assert time.monotonic() < deadline, "等待 IPC 应答超时"
+            qt_app.processEvents()
+            time.sleep(0.001)
+        return future.result()
+
+
+def raw_exchange(server, frame: bytes) -> list:
+    """发送一帧原始数据，读取应答帧直到最后一帧（ok 字段存在）"""
+    with Client(server.address, family="AF_UNIX", authkey=AUTHKEY) as conn:
+        conn.send_bytes(frame)
+        frames = []
+        while True:
+            frames.append(decode_frame(conn.recv_bytes()))
+            if 'ok' in frames[-1]:
+                return frames
+
+
+@pytest.mark.integration
+def test_wrong_authkey_is_rejected(qt_app, server):
+    with pytest.raises(AuthenticationError):
+        IpcClient(address=server.address, authkey=b"x" * 32)
+
+    # 拒绝之后服务继续接受正确密钥的连接
+    def recent():
+        with IpcClient(address=server.address, authkey=AUTHKEY) as client:
+            return client.recent(limit=1)
+    assert [item['id'] for item in run_client(qt_app, recent)] == ["id0"]
+
+
+@pytest.mark.integration
+def test_list_results_are_streamed_in_chunks(qt_app, server):
+    frame = encode_frame({'id': 7, 'cmd': "recent", 'args': {'limit': 120}})
+    frames = run_client(qt_app, lambda: raw_exchange(server, frame))
+
+    chunks = [f['chunk'] for f in frames[:-1]]
+    assert [len(chunk) for chunk in chunks] == [STREAM_CHUNK_SIZE, STREAM_CHUNK_SIZE, 20]
+    assert all(f['id'] == 7 for f in frames)
+    assert [item['id'] for chunk in chunks for item in chunk] == [f"id{index}" for index in range(120)]
+    assert frames[-1]['ok'] and frames[-1]['streamed'] and frames[-1]['count'] == 120
+
+
+@pytest.mark.integration
+def test_empty_list_result_sends_only_final_frame(qt_app, server):
+    frame = encode_frame({'id': 1, 'cmd': "search", 'args': {'query': "no such text"}})
+    frames = run_client(qt_app, lambda: raw_exchange(server, frame))
+    assert frames == [{'id': 1, 'ok': True, 'streamed': True, 'count': 0, 'version': frames[0]['version']}]
+
+
+@pytest.mark.integration
+def test_batch_frame_answers_in_order(qt_app, server, manager):
+    def batch():
+        with IpcClient(address=server.address, authkey=AUTHKEY) as client:
+            return client.batch([
+                ("get", {'id': "id3"}),
+                ("get", {'id': "missing"}),
+                ("pin", {'id': "id3"}),
+                ("recent", {'limit': 2}),
+                ("paste", {'id': "id4"}),
+            ])
+
+    got, missing, pinned, recent, pasted = run_client(qt_app, batch)
+    assert got['content'] == "item 3"
+    assert isinstance(missing, IpcError) and "missing" in str(missing)
+    assert pinned == {'id': "id3", 'is_favorite': True}
+    assert [item['id'] for item in recent] == ["id0", "id1"]
+    assert pasted == {'id': "id4", 'copied': True, 'typed': False}
+    assert manager.favorites == {"id3": True}
+    assert manager.copied == ["id4"]
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("limit, expected", [
+    (0, 1),
+    (-5, 1),
+    (3.9, 3),
+    ("7", 7),
+    (10 ** 12, MAX_RESULTS),
+])
+def test_limit_is_clamped(qt_app, server, manager, limit, expected):
+    frame = encode_frame({'id': 1, 'cmd': "recent", 'args': {'limit': limit}})
+    frames = run_client(qt_app, lambda: raw_exchange(server, frame))
+    assert frames[-1]['ok']
+    assert manager.limits == [expected]
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("limit", ["many", None, [1], {"n": 1}])
+def test_invalid_limit_is_an_argument_error(qt_app, server, manager, limit):
+    frame = encode_frame({'id': 1, 'cmd': "recent", 'args': {'limit': limit}})
+    frames = run_client(qt_app, lambda: raw_exchange(server, frame))
+    assert frames == [{'id': 1, 'ok': False, 'error': frames[0]['error']}]
+    assert frames[0]['error'].startswith("参数错误")
+    assert manager.limits == []
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("request_frame, error", [
+    ({'id': 1, 'cmd': "delete_all"}, "未知命令"),
+    ({'id': 1}, "未知命令"),
+    ({'id': 1, 'cmd': "recent", 'args': [5]}, "args 必须是对象"),
+    ({'id': 1, 'cmd': "recent", 'args': "limit=5"}, "args 必须是对象"),
+    ({'id': 1, 'cmd': "recent", 'args': {'count': 5}}, "参数错误"),
+    ({'id': 1, 'cmd': "get", 'args': {}}, "参数错误"),
+])
+def test_bad_requests_are_rejected(qt_app, server, request_frame, error):
+    frames = run_client(qt_app, lambda: raw_exchange(server, encode_frame(request_frame)))
+    assert len(frames) == 1
+    assert frames[0]['id'] == 1 and not frames[0]['ok']
+    assert error in frames[0]['error']
+
+
+@pytest.mark.integration
+def test_type_error_inside_command_is_not_an_argument_error(qt_app, server):
+    frame = encode_frame({'id': 1, 'cmd': "get", 'args': {'id': "broken"}})
+    frames = run_client(qt_app, lambda: raw_exchange(server, frame))
+    assert frames[0]['error'] == "manager bug"
+
+
+@pytest.mark.integration
+def test_invalid_frames_keep_connection_open(qt_app, server):
+    def exchange():
+        with Client(server.address, family="AF_UNIX", authkey=AUTHKEY) as conn:
+            conn.send_bytes(b"not json")
+            invalid = decode_frame(conn.recv_bytes())
+            # 批量帧中不是对象的请求单独报错，其余请求照常应答
+            conn.send_bytes(encode_frame([42, {'id': 2, 'cmd': "get", 'args': {'id': "id1"}}]))
+            not_object = decode_frame(conn.recv_bytes())
+            answered = decode_frame(conn.recv_bytes())
+            return invalid, not_object, answered
+
+    invalid, not_object, answered = run_client(qt_app, exchange)
+    assert invalid['id'] is None and not invalid['ok']
+    assert invalid['error'].startswith("无效的请求帧")
+    assert not_object == {'id': None, 'ok': False, 'error': "请求必须是对象"}
+    assert answered['id'] == 2 and answered['result']['content'] == "item 1"
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+搜索规范化与高亮位置映射测试
+"""
+
+import random
+
+import pytest
+
+from src.core.search_engine import map_normalized_span, normalize_for_search
+
+
+def find_span(content: str, query: str):
+    """在规范化文本中查找 query，映射回原始内容中的位置"""
+    normalized = normalize_for_search(content)
+    start = normalized.find(normalize_for_search(query))
+    assert start >= 0
+    return map_normalized_span(content, start, start + len(normalize_for_search(query)))
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("text, expected", [
+    ("Hello World", "hello world"),
+    ("a \t\n  b", "a b"),
+    ("ＡＢＣ１２３", "abc123"),
+    ("Straße", "strasse"),
+    ("ｶﾞ", "ガ"),
+    ("é", "é"),
+])
+def test_normalize_for_search(text, expected):
+    assert normalize_for_search(text) == expected
+
+
+@pytest.mark.unit
+def test_normalize_returns_same_object_when_unchanged():
+    text = "already normalized"
+    assert normalize_for_search(text) is text
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("content, query, expected", [
+    ("Hello World", "world", "World"),
+    ("a   b  c", "b c", "b  c"),
+    ("ＡＢＣ１２３", "c1", "Ｃ１"),
+    ("große Straße", "strasse", "Straße"),
+    ("Straße x", "ss", "ß"),
+    # 组合字符与基字符作为整体，后面的位置不偏移
+    ("café au lait", "au", "au"),
+    ("café!", "é", "é"),
+    # 半角片假名加半角浊点，NFKC 合成为一个字符
+    ("ｶﾞｷﾞ test", "test", "test"),
+    ("ｱｶﾞｷ", "ガ", "ｶﾞ"),
+    # 韩文字母序列 NFKC 合成为音节
+    ("한 abc", "abc", "abc"),
+    ("ﬁle name", "name", "name"),
+    ("x①y", "1", "①"),
+])
+def test_map_normalized_span(content, query, expected):
+    start, end = find_span(content, query)
+    assert content[start:end] == expected
+
+
+@pytest.mark.unit
+def test_map_span_inside_expansion_covers_whole_character():
+    # "ß" 规范化为 "ss"，只命中其中一个 "s" 时扩展到整个字符
+    content = "aßb"
+    assert map_normalized_span(content, 2, 3) == (1, 2)
+    # "ﬁ" 规范化为 "fi"
+    assert map_normalized_span("ﬁx", 1, 2) == (0, 1)
+
+
+@pytest.mark.unit
+def test_map_span_past_end_is_clamped():
+    assert map_normalized_span("abc", 10, 12) == (3, 3)
+    assert map_normalized_span("", 0, 1) == (0, 0)
+
+
+@pytest.mark.unit
+def test_map_span_round_trips_random_content():
+    """任意命中映射回原文后，原文片段规范化后应包含命中的文本"""
+    alphabet = (
+        "abcXYZ  \t\n" "ＡＢ１" "ßﬁ" "é̈" "ｶﾞﾟｱ" "한" "中文" "①"
+    )
+    rng = random.Random(1234)
+    for _ in range(2000):
+        content = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 16)))
+        normalized = normalize_for_search(content)
+        if not normalized:
+            continue
+        start = rng.randrange(len(normalized))
+        end = rng.randint(start + 1, len(normalized))
+        needle = normalized[start:end].strip()
+        if not needle:
+            continue
+
+        original_start, original_end = map_normalized_span(content, start, end)
+        assert 0 <= original_start <= original_end <= len(content)
+        assert needle in normalize_for_search(content[original_start:original_end]), (content, start, end)